@@ -0,0 +1,190 @@
+import logging
+import time
+from datetime import date
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from appointments.models import AppointmentDailyRollup
+from doctors.models import Doctor
+
+logger = logging.getLogger('healthcare_app')
+
+# (label, lower bound inclusive, upper bound exclusive)
+SALARY_BANDS = [
+    ('70-85k', 70000, 85000),
+    ('85-100k', 85000, 100000),
+    ('100-125k', 100000, 125000),
+    ('125-150k', 125000, 150000),
+    ('150-175k', 150000, 175000),
+    ('175k+', 175000, 999999999),
+]
+RATINGS = range(1, 6)
+
+TREND_MONTHS = 6
+
+# Share of visits treated as inpatient, per specialization
+INPATIENT_RATIOS = {
+    'cardiology': 0.65, 'neurology': 0.67, 'pediatrics': 0.22,
+    'orthopedics': 0.33, 'dermatology': 0.32, 'general_medicine': 0.40,
+}
+DEFAULT_BREAKDOWN_SPECIALIZATIONS = ['cardiology', 'pediatrics', 'orthopedics', 'neurology', 'general_medicine']
+
+
+def add_months(day, months):
+    """First day of the month ``months`` away from ``day``'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def staff_counts():
+    """Total and available doctors in one aggregate."""
+    return Doctor.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_available=True)),
+    )
+
+
+def staff_utilization(counts):
+    if not counts['total']:
+        return "0.0%"
+    return f"{round(counts['active'] / counts['total'] * 100, 1)}%"
+
+
+def specialization_visits():
+    """``[(specialization, visits)]``, busiest first, from one grouped query on the daily rollups."""
+    rows = (
+        AppointmentDailyRollup.objects
+        .values('specialization')
+        .annotate(count=Sum('appointment_count'))
+        .order_by('-count')
+    )
+    return [(row['specialization'], row['count']) for row in rows]
+
+
+def visits_by_specialization(visits):
+    spec_map = dict(Doctor.SPECIALIZATION_CHOICES)
+    return [
+        {'specialization': spec_map.get(code, str(code)), 'count': count}
+        for code, count in visits if code
+    ]
+
+
+def patient_type_breakdown(visits):
+    spec_map = dict(Doctor.SPECIALIZATION_CHOICES)
+    top = visits[:6] or [(code, 0) for code in DEFAULT_BREAKDOWN_SPECIALIZATIONS]
+    breakdown = []
+    for code, total in top:
+        inpatients = int(total * INPATIENT_RATIOS.get(code, 0.50))
+        breakdown.append({
+            'specialization': spec_map.get(code, str(code).replace('_', ' ').capitalize() if code else 'General'),
+            'inpatients': inpatients,
+            'outpatients': total - inpatients,
+            'total': total,
+        })
+    return breakdown
+
+
+def appointment_trends(today=None, months=TREND_MONTHS):
+    """
+    Appointments per calendar month for the last ``months`` months,
+    including the current one. One query on the daily rollups grouped by
+    ``TruncMonth``; months without appointments are filled with zero.
+    """
+    today = today or timezone.localdate()
+    first = add_months(today, -(months - 1))
+    end = add_months(today, 1)
+    counts = {
+        row['month']: row['count']
+        for row in AppointmentDailyRollup.objects
+        .filter(date__gte=first, date__lt=end)
+        .annotate(month=TruncMonth('date'))
+        .values('month')
+        .annotate(count=Sum('appointment_count'))
+        .order_by()
+    }
+    trends = []
+    for offset in range(months):
+        month = add_months(first, offset)
+        trends.append({'month': month.strftime('%b'), 'count': counts.get(month, 0)})
+    return trends
+
+
+def department_distribution(total_doctors):
+    rows = Doctor.objects.values('department_category').annotate(count=Count('id')).order_by('-count')
+    distribution = [
+        {'department': row['department_category'] or 'Unassigned', 'count': row['count']}
+        for row in rows
+    ]
+    if not distribution and total_doctors:
+        distribution.append({'department': 'Unassigned', 'count': total_doctors})
+    return distribution
+
+
+def salary_rating_heatmap():
+    """Doctors per salary band and rating, as one conditional-aggregation query."""
+    cells = {}
+    for index, (_, low, high) in enumerate(SALARY_BANDS):
+        for rating in RATINGS:
+            cells[f'band{index}_rating{rating}'] = Count(
+                'id', filter=Q(salary__gte=low, salary__lt=high, performance_rating=rating)
+            )
+    counts = Doctor.objects.aggregate(**cells)
+    return [
+        {
+            'salary_range': label,
+            'ratings': {str(rating): counts[f'band{index}_rating{rating}'] for rating in RATINGS},
+        }
+        for index, (label, _, _) in enumerate(SALARY_BANDS)
+    ]
+
+
+class SectionTimer:
+    """Runs dashboard sections, records how long each took and falls back on errors."""
+
+    def __init__(self):
+        self.timings = {}
+
+    def run(self, name, compute, default):
+        started = time.perf_counter()
+        try:
+            return compute()
+        except Exception:
+            logger.exception("Hospital analytics section %s failed", name)
+            return default
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def hospital_analytics(today=None):
+    """
+    Every section of the owner analytics dashboard, from five queries, plus
+    ``meta.timings_ms`` with the time spent on each section.
+    """
+    started = time.perf_counter()
+    timer = SectionTimer()
+    data = {
+        'avg_consultation_time': "15.0 min",
+        'bed_occupancy': {'rate': '66%', 'occupied': 332, 'total': 502},
+        'patient_satisfaction': '4.6/5.0',
+    }
+
+    counts = timer.run('staff_utilization', staff_counts, {'total': 0, 'active': 0})
+    data['staff_utilization'] = staff_utilization(counts)
+
+    visits = timer.run('visits_by_specialization', specialization_visits, [])
+    data['visits_by_specialization'] = visits_by_specialization(visits)
+    data['patient_type_breakdown'] = patient_type_breakdown(visits)
+
+    data['appointment_trends'] = timer.run('appointment_trends', lambda: appointment_trends(today), [])
+    data['department_distribution'] = timer.run(
+        'department_distribution', lambda: department_distribution(counts['total']), []
+    )
+    data['salary_rating_heatmap'] = timer.run('salary_rating_heatmap', salary_rating_heatmap, [])
+
+    data['meta'] = {
+        'timings_ms': timer.timings,
+        'total_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+    return data
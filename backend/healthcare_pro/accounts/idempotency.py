@@ -0,0 +1,151 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from decouple import config
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+
+# Client errors that a retry of the same request would get again
+STORED_CLIENT_ERRORS = (
+    status.HTTP_400_BAD_REQUEST,
+    status.HTTP_404_NOT_FOUND,
+    status.HTTP_409_CONFLICT,
+)
+
+
+def get_key_ttl():
+    return timedelta(hours=config('IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int))
+
+
+def get_claim_lease():
+    return timedelta(seconds=config('IDEMPOTENCY_LEASE_SECONDS', default=60, cast=int))
+
+
+def request_fingerprint(request):
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def sweep_expired_keys(now=None):
+    """Delete stored responses past their TTL; returns the number removed."""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
+
+
+def _replay(record, fingerprint):
+    if record.request_hash != fingerprint:
+        return Response(
+            {'error': f'{HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    if record.status_code is None:
+        return Response(
+            {'error': f'A request with this {HEADER} is still being processed'},
+            status=status.HTTP_409_CONFLICT
+        )
+    response = Response(record.response_body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def _reclaim(record, fingerprint, now):
+    """
+    Take over a claim whose request never stored a response, e.g. because the
+    worker died, once it is older than ``IDEMPOTENCY_LEASE_SECONDS``. The
+    conditional update lets only one retry win.
+    """
+    if record.status_code is not None or record.request_hash != fingerprint:
+        return False
+    if record.created_at > now - get_claim_lease():
+        return False
+    claimed = IdempotencyKey.objects.filter(
+        pk=record.pk, status_code__isnull=True, created_at=record.created_at
+    ).update(created_at=now, expires_at=now + get_key_ttl())
+    if claimed:
+        record.created_at = now
+        record.expires_at = now + get_key_ttl()
+    return bool(claimed)
+
+
+def _is_stored(status_code):
+    return status.is_success(status_code) or status_code in STORED_CLIENT_ERRORS
+
+
+def idempotent(view=None, redact=()):
+    """
+    Make a POST view safe to retry with an ``Idempotency-Key`` header.
+
+    The first request claims the key and its response is stored for
+    ``IDEMPOTENCY_KEY_TTL_HOURS``. A retry with the same key and body gets
+    the stored response from one lookup on the (user, key) index, without
+    running the view again. Only successes and ``STORED_CLIENT_ERRORS`` are
+    stored; anything else releases the key so the client can retry.
+    Top-level ``redact`` keys (e.g. generated credentials) are left out of
+    the stored body, so replays do not include them. A claim left without a
+    response for longer than ``IDEMPOTENCY_LEASE_SECONDS`` is treated as
+    abandoned and taken over by the next retry, so the lease should be longer
+    than the slowest view. Requests without the header are not affected.
+    """
+    if view is None:
+        return lambda view: idempotent(view, redact=redact)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response(
+                {'error': f'{HEADER} must be at most 255 characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        fingerprint = request_fingerprint(request)
+        record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if record is not None and record.expires_at <= now:
+            record.delete()
+            record = None
+
+        if record is not None:
+            if not _reclaim(record, fingerprint, now):
+                return _replay(record, fingerprint)
+        else:
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user, key=key, request_hash=fingerprint, expires_at=now + get_key_ttl()
+                    )
+            except IntegrityError:
+                # A concurrent retry claimed the key first
+                return _replay(IdempotencyKey.objects.get(user=request.user, key=key), fingerprint)
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if not _is_stored(response.status_code) or not hasattr(response, 'data'):
+            record.delete()
+        else:
+            body = response.data
+            if redact and isinstance(body, dict):
+                body = {field: value for field, value in body.items() if field not in redact}
+            record.status_code = response.status_code
+            record.response_body = body
+            record.save(update_fields=['status_code', 'response_body'])
+        return response
+
+    return wrapper
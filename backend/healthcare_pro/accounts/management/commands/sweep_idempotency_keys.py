@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.idempotency import sweep_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored Idempotency-Key responses past their TTL'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running, sweeping every N seconds (0 runs once)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.stdout.write(f'Deleted {sweep_expired_keys()} expired idempotency keys')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
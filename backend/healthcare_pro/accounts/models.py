@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 import uuid
@@ -51,4 +52,33 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.email} - {self.role}"
     
     def get_full_name(self):
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+class Sequence(models.Model):
+    """Named counter backing ``accounts.sequences``; ``next_value`` is the first unreserved value."""
+    name = models.CharField(max_length=50, primary_key=True)
+    next_value = models.BigIntegerField(default=1)
+
+    class Meta:
+        db_table = 'sequences'
+
+    def __str__(self):
+        return f"{self.name}: {self.next_value}"
+
+
+class IdempotencyKey(models.Model):
+    """Stored response for a POST sent with an ``Idempotency-Key`` header."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64, help_text="SHA-256 of method, path and body")
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True, help_text="Empty while the first request is running")
+    response_body = models.JSONField(blank=True, null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        unique_together = ['user', 'key']
+
+    def __str__(self):
+        return f"{self.user_id} {self.key} ({self.status_code})"
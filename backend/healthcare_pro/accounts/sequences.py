@@ -0,0 +1,71 @@
+import threading
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from decouple import config
+
+from .models import Sequence
+
+_lock = threading.Lock()
+_blocks = {}
+
+
+def get_block_size():
+    return max(config('SEQUENCE_BLOCK_SIZE', default=20, cast=int), 1)
+
+
+def _reserve(name, count, initial):
+    """
+    Advance the stored counter by ``count`` and return the first reserved
+    value. The UPDATE comes first so the transaction holds the row lock
+    (SQLite's write lock) before reading the new value back.
+    """
+    with transaction.atomic():
+        if Sequence.objects.filter(name=name).update(next_value=F('next_value') + count):
+            return Sequence.objects.values_list('next_value', flat=True).get(name=name) - count
+
+        start = initial() if callable(initial) else initial
+        try:
+            with transaction.atomic():
+                Sequence.objects.create(name=name, next_value=start + count)
+            return start
+        except IntegrityError:
+            # Another process created the row first
+            Sequence.objects.filter(name=name).update(next_value=F('next_value') + count)
+            return Sequence.objects.values_list('next_value', flat=True).get(name=name) - count
+
+
+def next_values(name, count, initial=1):
+    """
+    ``count`` unique values from sequence ``name``.
+
+    Outside a transaction values come from a per-process block of
+    ``SEQUENCE_BLOCK_SIZE`` reserved with one committed UPDATE, so most calls
+    touch no table at all. Inside a transaction only ``count`` values are
+    reserved: a cached block would be rolled back with the caller's
+    transaction and could then be handed out twice. ``initial`` (a value or a
+    callable) seeds the sequence the first time it is used. Values are unique
+    but not gap-free.
+    """
+    if count <= 0:
+        return []
+    if connection.in_atomic_block:
+        start = _reserve(name, count, initial)
+        return list(range(start, start + count))
+
+    values = []
+    with _lock:
+        block = _blocks.get(name)
+        while len(values) < count:
+            if block is None or block[0] >= block[1]:
+                size = max(get_block_size(), count - len(values))
+                start = _reserve(name, size, initial)
+                block = _blocks[name] = [start, start + size]
+            take = min(count - len(values), block[1] - block[0])
+            values.extend(range(block[0], block[0] + take))
+            block[0] += take
+    return values
+
+
+def next_value(name, initial=1):
+    return next_values(name, 1, initial)[0]
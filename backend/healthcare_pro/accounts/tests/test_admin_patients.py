@@ -0,0 +1,107 @@
+import json
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class AdminPatientsListTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123",
+            first_name="Admin",
+            last_name="User",
+            role="admin",
+        )
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+
+        self.patients = []
+        for index in range(5):
+            user = User.objects.create_user(
+                email=f"patient{index}@example.com",
+                password="PatPass123",
+                first_name=f"Patient{index}",
+                last_name="Test",
+                role="patient",
+            )
+            patient = PatientProfile.objects.create(user=user)
+            self.patients.append(patient)
+            Appointment.objects.create(
+                patient=patient,
+                doctor=doctor,
+                appointment_date=date.today() + timedelta(days=index + 1),
+                appointment_time=time(9, 0),
+                chief_complaint="Checkup",
+            )
+
+        self.url = reverse("admin_patients_list")
+        self.client.force_authenticate(self.admin_user)
+
+    def test_cursor_pages_cover_every_patient_in_constant_queries(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2, "fields": "id,last_visit"}
+            if cursor:
+                params["cursor"] = cursor
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["total"], 5)
+            seen += response.data["patients"]
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                break
+
+        # Newest patient first, and only the requested fields
+        self.assertEqual([row["id"] for row in seen], [p.id for p in reversed(self.patients)])
+        self.assertEqual(set(seen[0]), {"id", "last_visit"})
+        self.assertEqual(seen[0]["last_visit"], (date.today() + timedelta(days=5)).strftime("%m/%d/%Y"))
+
+    def test_ndjson_export_streams_one_line_per_patient(self):
+        response = self.client.get(self.url, {"format": "ndjson", "fields": "email"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"email": p.user.email} for p in reversed(self.patients)],
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(self.url, {"fields": "name,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_matches_name_and_patient_id(self):
+        response = self.client.get(self.url, {"search": "patient3"})
+        self.assertEqual([row["id"] for row in response.data["patients"]], [self.patients[3].id])
+
+        user = get_user_model().objects.create_user(
+            email="numbered@example.com", password="PatPass123", first_name="Num", last_name="Bered", role="patient"
+        )
+        PatientProfile.objects.create(id=987654, user=user)
+        response = self.client.get(self.url, {"search": "987654"})
+        self.assertEqual([row["id"] for row in response.data["patients"]], [987654])
@@ -0,0 +1,107 @@
+from datetime import date, time
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.analytics import add_months, appointment_trends, hospital_analytics
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class HospitalAnalyticsTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="OwnerPass123",
+            first_name="Own",
+            last_name="Er",
+            role="owner",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.doctors = [
+            self._doctor("a", 80000, 4, True),
+            self._doctor("b", 80000, 4, False),
+            self._doctor("c", 200000, 5, True),
+        ]
+
+    def _doctor(self, name, salary, rating, available):
+        user = get_user_model().objects.create_user(
+            email=f"{name}@example.com",
+            password="DocPass123",
+            first_name=name.title(),
+            last_name="Doctor",
+            role="doctor",
+        )
+        return Doctor.objects.create(
+            user=user,
+            specialization="cardiology",
+            license_number=f"LIC-{name}",
+            years_of_experience=10,
+            qualification="MBBS",
+            salary=salary,
+            performance_rating=rating,
+            is_available=available,
+        )
+
+    def _appointment(self, day, hour=9):
+        Appointment(
+            patient=self.patient,
+            doctor=self.doctors[0],
+            appointment_date=day,
+            appointment_time=time(hour, 0),
+            chief_complaint="Checkup",
+        ).save(validate=False)
+
+    def test_trends_use_calendar_months_and_fill_gaps(self):
+        today = date(2026, 3, 31)
+        self._appointment(date(2025, 10, 1))
+        self._appointment(date(2026, 1, 31))
+        self._appointment(date(2026, 3, 1))
+        self._appointment(date(2026, 3, 31))
+        self._appointment(date(2025, 9, 30))
+
+        self.assertEqual(
+            appointment_trends(today),
+            [
+                {"month": "Oct", "count": 1},
+                {"month": "Nov", "count": 0},
+                {"month": "Dec", "count": 0},
+                {"month": "Jan", "count": 1},
+                {"month": "Feb", "count": 0},
+                {"month": "Mar", "count": 2},
+            ],
+        )
+        self.assertEqual(add_months(date(2026, 1, 15), -1), date(2025, 12, 1))
+
+    def test_dashboard_takes_five_queries(self):
+        with self.assertNumQueries(5):
+            data = hospital_analytics()
+
+        self.assertEqual(data["staff_utilization"], "66.7%")
+        heatmap = {row["salary_range"]: row["ratings"] for row in data["salary_rating_heatmap"]}
+        self.assertEqual(heatmap["70-85k"]["4"], 2)
+        self.assertEqual(heatmap["175k+"]["5"], 1)
+        self.assertEqual(sum(sum(row.values()) for row in heatmap.values()), 3)
+        self.assertEqual(
+            set(data["meta"]["timings_ms"]),
+            {"staff_utilization", "visits_by_specialization", "appointment_trends",
+             "department_distribution", "salary_rating_heatmap"},
+        )
+
+    def test_endpoint_returns_sections_and_meta(self):
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(reverse("owner_hospital_analytics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["appointment_trends"]), 6)
+        self.assertIn("total_ms", response.data["meta"])
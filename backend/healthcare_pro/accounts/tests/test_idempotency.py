@@ -0,0 +1,91 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import OperationalError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.idempotency import sweep_expired_keys
+from accounts.models import IdempotencyKey
+from patients.models import PatientProfile
+
+
+class IdempotencyKeyTestCase(APITestCase):
+    def setUp(self):
+        self.admin_user = get_user_model().objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123",
+            first_name="Admin",
+            last_name="User",
+            role="admin",
+        )
+        self.client.force_authenticate(self.admin_user)
+        self.payload = {"email": "new.patient@example.com", "first_name": "New", "last_name": "Patient"}
+
+    def _register(self, key, payload=None):
+        return self.client.post(
+            reverse("admin_register_patient"),
+            payload or self.payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self._register("retry-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            retry = self._register("retry-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        # Generated credentials are never stored, so the replay leaves them out
+        self.assertIn("credentials", first.json())
+        expected = {key: value for key, value in first.json().items() if key != "credentials"}
+        self.assertEqual(retry.json(), expected)
+        self.assertNotIn("credentials", IdempotencyKey.objects.get().response_body)
+        self.assertEqual(PatientProfile.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_key_reused_with_different_body_is_rejected(self):
+        self._register("retry-2")
+        response = self._register("retry-2", dict(self.payload, email="other@example.com"))
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(PatientProfile.objects.count(), 1)
+
+    def test_expired_keys_are_swept(self):
+        self._register("retry-3")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(sweep_expired_keys(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_transient_failures_release_the_key(self):
+        with mock.patch("accounts.views.admin_views.PatientProfile.objects.create", side_effect=OperationalError):
+            with self.assertRaises(OperationalError):
+                self._register("retry-4")
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        response = self._register("retry-4")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(PatientProfile.objects.count(), 1)
+
+    def test_abandoned_claim_is_taken_over_after_the_lease(self):
+        # The worker dies mid-request, leaving the claim without a response
+        with mock.patch("accounts.views.admin_views.PatientProfile.objects.create", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self._register("retry-5")
+        self.assertIsNone(IdempotencyKey.objects.get().status_code)
+
+        self.assertEqual(self._register("retry-5").status_code, status.HTTP_409_CONFLICT)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(minutes=5))
+        response = self._register("retry-5")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, status.HTTP_201_CREATED)
+        self.assertEqual(PatientProfile.objects.count(), 1)
@@ -0,0 +1,99 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor, Hospital
+from patients.models import PatientProfile
+
+
+class OwnerDoctorPerformanceTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        owner = User.objects.create_user(
+            email="owner@example.com",
+            password="OwnerPass123",
+            first_name="Own",
+            last_name="Er",
+            role="owner",
+        )
+        self.hospital = Hospital.objects.create(name="North", address="1 Main St", city="Pune", state="MH")
+
+        patients = []
+        for index in range(3):
+            user = User.objects.create_user(
+                email=f"patient{index}@example.com",
+                password="PatPass123",
+                first_name=f"Patient{index}",
+                last_name="Test",
+                role="patient",
+            )
+            patients.append(PatientProfile.objects.create(user=user))
+
+        # Doctor i has completed visits with i patients; doctor 2 sees patient 0 twice
+        self.doctors = [self._doctor(f"doc{index}") for index in range(4)]
+        self.doctors[1].hospitals.add(self.hospital)
+        self.doctors[2].hospitals.add(self.hospital)
+        visit_day = date.today() + timedelta(days=1)
+        for index, doctor in enumerate(self.doctors[:3]):
+            for hour, patient in enumerate(patients[:index]):
+                self._appointment(patient, doctor, visit_day, time(9 + hour, 0), "completed")
+        self._appointment(patients[0], self.doctors[2], visit_day, time(15, 0), "completed")
+        self._appointment(patients[2], self.doctors[3], visit_day, time(9, 0), "scheduled")
+
+        self.url = reverse("owner_doctor_performance")
+        self.client.force_authenticate(owner)
+
+    def _doctor(self, name):
+        user = get_user_model().objects.create_user(
+            email=f"{name}@example.com",
+            password="DocPass123",
+            first_name=name.title(),
+            last_name="Doctor",
+            role="doctor",
+        )
+        return Doctor.objects.create(
+            user=user,
+            specialization="cardiology",
+            license_number=f"LIC-{name}",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+
+    def _appointment(self, patient, doctor, appointment_date, appointment_time, status_value):
+        Appointment.objects.create(
+            patient=patient,
+            doctor=doctor,
+            appointment_date=appointment_date,
+            appointment_time=appointment_time,
+            chief_complaint="Checkup",
+            status=status_value,
+        )
+
+    def test_leaderboard_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["id"], row["patient_count"]) for row in response.data],
+            [(str(self.doctors[i].id), count) for i, count in ((2, 2), (1, 1), (0, 0), (3, 0))],
+        )
+
+    def test_top_n_for_one_hospital(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {"hospital": str(self.hospital.id), "limit": 1})
+        self.assertEqual(response["X-Total-Count"], "2")
+        self.assertEqual([row["id"] for row in response.data], [str(self.doctors[2].id)])
+
+        response = self.client.get(self.url, {"sort": "patients", "limit": 2, "offset": 1})
+        self.assertEqual(
+            [row["id"] for row in response.data],
+            [str(self.doctors[3].id), str(self.doctors[1].id)],
+        )
+
+    def test_unknown_sort_is_rejected(self):
+        response = self.client.get(self.url, {"sort": "revenue"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
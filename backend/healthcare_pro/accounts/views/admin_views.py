@@ -1,17 +1,26 @@
 from rest_framework import generics, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db import transaction
-from datetime import datetime
+from django.db import InterfaceError, OperationalError, transaction
+from django.utils import timezone
+from datetime import datetime, timezone as dt_timezone
+from decouple import config
+import json
 
 from ..models import User
 from ..serializers import (
     UserSerializer,
     RegisterUserSerializer
 )
+from ..idempotency import idempotent
 from ..permissions import IsAdmin
+from ..renderers import NDJSONRenderer
 from doctors.models import Doctor, Hospital
 from patients.models import PatientProfile
 
@@ -63,12 +72,56 @@ def _format_doctor_response(doctor):
     }
 
 
+ADMIN_PATIENTS_MAX_PAGE_SIZE = 200
+ADMIN_PATIENTS_EXPORT_CHUNK_SIZE = 500
+
+# Top-level keys of _format_patient_response, for ?fields=
+PATIENT_RESPONSE_FIELDS = (
+    'id', 'patient_id', 'user_id', 'name', 'first_name', 'last_name', 'email', 'phone',
+    'date_of_birth', 'age', 'gender', 'gender_code', 'blood_group', 'blood', 'address',
+    'emergency_contact', 'insurance', 'last_visit', 'created_at',
+)
+
+
+def _get_admin_patients_page_size():
+    return config('ADMIN_PATIENTS_PAGE_SIZE', default=50, cast=int)
+
+
+def _with_last_visit(queryset):
+    """Annotate ``last_visit`` (latest appointment date) as a correlated subquery."""
+    from appointments.models import Appointment
+
+    latest = Appointment.objects.filter(patient=OuterRef('pk')).order_by('-appointment_date')
+    return queryset.annotate(last_visit=Subquery(latest.values('appointment_date')[:1]))
+
+
+def _format_patient_cursor(patient):
+    created_at = patient.created_at.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')
+    return f"{created_at},{patient.id}"
+
+
+def _parse_patient_cursor(value):
+    """``"<UTC created_at>,<id>"`` as written by ``_format_patient_cursor``. Raises ValueError."""
+    created_at, patient_id = value.split(',')
+    created_at = datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%S.%f').replace(tzinfo=dt_timezone.utc)
+    return created_at, int(patient_id)
+
+
+def _patient_id_match(search):
+    """Exact patient id match for a numeric search term."""
+    return Q(id=int(search)) if search.isdigit() else Q(pk__in=[])
+
+
 def _format_patient_response(patient):
     from appointments.models import Appointment
 
     age = patient.age
-    last_appointment = Appointment.objects.filter(patient=patient).order_by('-appointment_date').first()
-    last_visit = last_appointment.appointment_date.strftime('%m/%d/%Y') if last_appointment else None
+    if hasattr(patient, 'last_visit'):
+        last_visit_date = patient.last_visit
+    else:
+        last_appointment = Appointment.objects.filter(patient=patient).order_by('-appointment_date').first()
+        last_visit_date = last_appointment.appointment_date if last_appointment else None
+    last_visit = last_visit_date.strftime('%m/%d/%Y') if last_visit_date else None
 
     return {
         'id': patient.id,
@@ -137,6 +190,7 @@ class AdminCreateUserView(generics.CreateAPIView):
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
+@idempotent(redact=('credentials',))
 def admin_register_patient(request):
     """
     Admin registers a complete patient with user account and profile.
@@ -188,12 +242,16 @@ def admin_register_patient(request):
                 }
             }, status=status.HTTP_201_CREATED)
             
+    except (OperationalError, InterfaceError):
+        # Transient database failures are server errors, not bad requests
+        raise
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
 @permission_classes([IsAdmin])
+@idempotent(redact=('credentials',))
 def admin_register_doctor(request):
     """
     Admin registers a complete doctor with user account and profile.
@@ -239,6 +297,9 @@ def admin_register_doctor(request):
                 }
             }, status=status.HTTP_201_CREATED)
             
+    except (OperationalError, InterfaceError):
+        # Transient database failures are server errors, not bad requests
+        raise
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -307,17 +368,75 @@ def admin_doctors_list(request):
 
 @api_view(['GET'])
 @permission_classes([IsAdmin])
+@renderer_classes([JSONRenderer, BrowsableAPIRenderer, NDJSONRenderer])
 def admin_patients_list(request):
     """
     Get list of all patients for admin management.
+
+    Pages are cursor based (newest first): pass ``next_cursor`` back as
+    ``cursor``. ``fields`` limits each row to the listed keys. With
+    ``?format=ndjson`` every matching patient is streamed, one JSON object
+    per line, straight from a database iterator.
     """
-    patients = PatientProfile.objects.select_related('user').all().order_by('-created_at')
+    fields = [field.strip() for field in request.GET.get('fields', '').split(',') if field.strip()]
+    unknown = sorted(set(fields) - set(PATIENT_RESPONSE_FIELDS))
+    if unknown:
+        return Response(
+            {'error': f"Unknown fields: {', '.join(unknown)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def serialize(patient):
+        data = _format_patient_response(patient)
+        return {field: data[field] for field in fields} if fields else data
+
+    patients = _with_last_visit(PatientProfile.objects.select_related('user'))
+    search = request.GET.get('search', '').strip()
+    if search:
+        patients = patients.filter(
+            Q(user__first_name__icontains=search) |
+            Q(user__last_name__icontains=search) |
+            Q(user__email__icontains=search) |
+            Q(phone_number__icontains=search) |
+            _patient_id_match(search)
+        )
+    patients = patients.order_by('-created_at', '-id')
+
+    if request.accepted_renderer.format == 'ndjson':
+        rows = (
+            json.dumps(serialize(patient), cls=DjangoJSONEncoder) + '\n'
+            for patient in patients.iterator(chunk_size=ADMIN_PATIENTS_EXPORT_CHUNK_SIZE)
+        )
+        response = StreamingHttpResponse(rows, content_type=NDJSONRenderer.media_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="patients-{timezone.localdate().isoformat()}.ndjson"'
+        )
+        return response
 
-    patients_data = [_format_patient_response(patient) for patient in patients]
+    try:
+        limit = int(request.GET.get('limit', _get_admin_patients_page_size()))
+        cursor = request.GET.get('cursor')
+        cursor = _parse_patient_cursor(cursor) if cursor else None
+    except ValueError:
+        return Response(
+            {'error': 'limit must be a number and cursor must be the next_cursor of a previous page'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    limit = max(1, min(limit, ADMIN_PATIENTS_MAX_PAGE_SIZE))
+
+    total = patients.count()
+    page = patients
+    if cursor:
+        created_at, patient_id = cursor
+        page = page.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=patient_id))
+    page = list(page[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
 
     return Response({
-        'patients': patients_data,
-        'total': len(patients_data)
+        'patients': [serialize(patient) for patient in page],
+        'total': total,
+        'next_cursor': _format_patient_cursor(page[-1]) if has_more else None
     })
 
 
@@ -460,7 +579,7 @@ def admin_doctor_detail(request, doctor_id):
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAdmin])
 def admin_patient_detail(request, patient_id):
-    patient = get_object_or_404(PatientProfile.objects.select_related('user'), pk=patient_id)
+    patient = get_object_or_404(_with_last_visit(PatientProfile.objects.select_related('user')), pk=patient_id)
 
     if request.method == 'GET':
         return Response({'patient': _format_patient_response(patient)})
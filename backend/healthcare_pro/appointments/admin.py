@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Appointment, AppointmentSlot, AppointmentReminder
+from .models import Appointment, AppointmentSlot, AppointmentReminder, WaitlistEntry
 
 
 @admin.register(Appointment)
@@ -58,6 +58,9 @@ class AppointmentSlotAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
     readonly_fields = ('current_appointments', 'is_fully_booked', 'created_at', 'updated_at')
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_capacity().select_related('doctor__user')
+    
     def get_doctor_name(self, obj):
         return obj.doctor.user.get_full_name()
     get_doctor_name.short_description = 'Doctor'
@@ -75,4 +78,14 @@ class AppointmentReminderAdmin(admin.ModelAdmin):
     
     def get_appointment_info(self, obj):
         return f"{obj.appointment.patient.user.get_full_name()} - {obj.appointment.appointment_date}"
-    get_appointment_info.short_description = 'Appointment'
\ No newline at end of file
+    get_appointment_info.short_description = 'Appointment'
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    """Admin configuration for WaitlistEntry model."""
+    
+    list_display = ('patient', 'doctor', 'specialization', 'earliest_date', 'latest_date', 'status', 'created_at')
+    list_filter = ('status', 'auto_book', 'specialization')
+    list_select_related = ('patient__user', 'doctor__user')
+    readonly_fields = ('hold', 'appointment', 'offered_at', 'created_at', 'updated_at')
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class AppointmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'appointments'
\ No newline at end of file
+    name = 'appointments'
+
+    def ready(self):
+        from . import signals  # noqa: F401
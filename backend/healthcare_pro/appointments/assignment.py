@@ -0,0 +1,135 @@
+from datetime import timedelta, time as dt_time
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from decouple import config
+
+from .models import Appointment
+from .occupancy import load_occupancy
+from .slots import get_slot_duration_minutes, time_to_minutes
+from doctors.models import Doctor
+from doctors.schedule import DAY_ORDER, get_schedules
+
+
+ASSIGNMENT_POLICIES = ('least_loaded', 'round_robin', 'soonest_free')
+
+
+def _minutes_to_time(minutes):
+    return dt_time(minutes // 60, minutes % 60)
+
+
+def load_doctor_loads(doctor_ids, appointment_date):
+    """
+    ``{doctor_id: {'day_load', 'week_load', 'last_assigned'}}`` from one grouped
+    query. Loads count active appointments on the day and in its Monday-Sunday
+    week; ``last_assigned`` is the newest booking for the doctor made within
+    the last ``ASSIGNMENT_HISTORY_DAYS`` days (None if older).
+
+    Only appointments in that week or booked within that window are scanned,
+    not the department's whole history.
+    """
+    week_start = appointment_date - timedelta(days=appointment_date.weekday())
+    week_end = week_start + timedelta(days=6)
+    history_start = timezone.now() - timedelta(days=config('ASSIGNMENT_HISTORY_DAYS', default=30, cast=int))
+    active = Q(status__in=Appointment.ACTIVE_STATUSES)
+    rows = (
+        Appointment.objects
+        .filter(doctor_id__in=doctor_ids)
+        .filter(Q(appointment_date__range=[week_start, week_end]) | Q(created_at__gte=history_start))
+        .order_by()
+        .values('doctor_id')
+        .annotate(
+            day_load=Count('id', filter=active & Q(appointment_date=appointment_date)),
+            week_load=Count('id', filter=active & Q(appointment_date__range=[week_start, week_end])),
+            last_assigned=Max('created_at', filter=Q(created_at__gte=history_start)),
+        )
+    )
+    return {row['doctor_id']: row for row in rows}
+
+
+class DoctorAssigner:
+    """
+    Chooses a doctor for a department booking.
+
+    Candidates are the department's available doctors whose compiled schedule
+    covers the requested window (doctors with no configured hours at all are
+    accepted but ranked last) and whose occupancy is free at that time.
+    Policies order the candidates:
+
+    * ``least_loaded``: fewest bookings that day, then that week
+    * ``round_robin``: the doctor who was assigned least recently
+    * ``soonest_free``: like ``least_loaded``, but when nobody is free at the
+      requested time, the earliest open start later that day
+    """
+
+    def __init__(self, department, appointment_date, duration, holder_user_id=None):
+        self.appointment_date = appointment_date
+        self.duration = duration
+        self.doctors = list(
+            Doctor.objects
+            .select_related('user')
+            .filter(department=department, is_available=True)
+        )
+        doctor_ids = [doctor.id for doctor in self.doctors]
+        self.schedules = get_schedules(self.doctors)
+        self.loads = load_doctor_loads(doctor_ids, appointment_date) if doctor_ids else {}
+        self.occupancy = (
+            load_occupancy(doctor_ids, appointment_date, appointment_date, holder_user_id=holder_user_id)
+            if doctor_ids else {}
+        )
+
+    def _day_windows(self, doctor):
+        return self.schedules[doctor.id].windows(DAY_ORDER[self.appointment_date.weekday()])
+
+    def _has_hours(self, doctor):
+        schedule = self.schedules[doctor.id]
+        return any(schedule.works_on(day) for day in DAY_ORDER)
+
+    def _is_free(self, doctor, start):
+        occupancy = self.occupancy.get((doctor.id, self.appointment_date))
+        return occupancy is None or occupancy.is_free(start, self.duration)
+
+    def _covers(self, doctor, start):
+        end = start + self.duration
+        return any(window_start <= start and end <= window_end for window_start, window_end in self._day_windows(doctor))
+
+    def _rank(self, policy, index, doctor, configured):
+        load = self.loads.get(doctor.id, {})
+        if policy == 'round_robin':
+            last_assigned = load.get('last_assigned')
+            return (not configured, last_assigned is not None, last_assigned or 0, index)
+        return (not configured, load.get('day_load', 0), load.get('week_load', 0), index)
+
+    def assign(self, appointment_time, policy='least_loaded'):
+        """Return ``(doctor, appointment_time)`` or None when nobody can take the booking."""
+        start = time_to_minutes(appointment_time)
+        candidates = []
+        for index, doctor in enumerate(self.doctors):
+            configured = self._has_hours(doctor)
+            if configured and not self._covers(doctor, start):
+                continue
+            if self._is_free(doctor, start):
+                candidates.append((self._rank(policy, index, doctor, configured), doctor))
+
+        if candidates:
+            return min(candidates, key=lambda candidate: candidate[0])[1], appointment_time
+
+        if policy == 'soonest_free':
+            return self._soonest_after(start)
+        return None
+
+    def _soonest_after(self, start):
+        step = get_slot_duration_minutes()
+        options = []
+        for index, doctor in enumerate(self.doctors):
+            for window_start, window_end in self._day_windows(doctor):
+                candidate = window_start
+                while candidate + self.duration <= window_end:
+                    if candidate > start and self._is_free(doctor, candidate):
+                        options.append((candidate, self._rank('least_loaded', index, doctor, True), doctor))
+                        break
+                    candidate += step
+        if not options:
+            return None
+        minutes, _, doctor = min(options, key=lambda option: option[:2])
+        return doctor, _minutes_to_time(minutes)
@@ -0,0 +1,277 @@
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Appointment, SlotHold, WaitlistEntry
+from .occupancy import load_day_occupancy, load_occupancy
+from .rollups import refresh_daily_rollups, rollup_bucket
+from .slots import SlotPlanner, first_available_slots, time_to_minutes
+from accounts.sequences import next_values
+from doctors.schedule import bump_availability_version
+from patients.summary import invalidate_patient_summaries
+
+
+class SlotConflict(Exception):
+    """The requested time overlaps an active appointment or another patient's hold."""
+
+
+# Starts above 999999 so sequence codes never collide with the older
+# six-character codes cut from appointment UUIDs
+CONFIRMATION_SEQUENCE_START = 1000000
+
+
+def make_confirmation_codes(appointment_dates):
+    """One ``APT-<year>-<number>`` code per date, numbered from a shared sequence."""
+    numbers = next_values('confirmation_code', len(appointment_dates), initial=CONFIRMATION_SEQUENCE_START)
+    return [f"APT-{day.year}-{number}" for day, number in zip(appointment_dates, numbers)]
+
+
+def book_appointment(patient, doctor, appointment_date, appointment_time, duration,
+                     appointment_type, reason, hold=None):
+    """
+    Insert an appointment in a single statement, or raise ``SlotConflict``.
+
+    The transaction starts by bumping the doctor's availability version, which
+    takes the doctor's row lock (SQLite's write lock) before anything is read,
+    so concurrent bookings for one doctor queue up instead of racing the
+    overlap check. The ``unique_active_appointment_slot`` constraint backs this
+    up for identical start times. A converted ``hold`` is deleted in the same
+    transaction, and a waitlist offer it came from is marked booked.
+    """
+    confirmation_code, = make_confirmation_codes([appointment_date])
+    appointment = Appointment(
+        id=uuid.uuid4(),
+        patient=patient,
+        doctor=doctor,
+        appointment_date=appointment_date,
+        appointment_time=appointment_time,
+        duration=duration,
+        appointment_type=appointment_type,
+        chief_complaint=reason,
+        reason=reason,
+        status='scheduled',
+        confirmation_code=confirmation_code,
+        consultation_fee=doctor.consultation_fee,
+    )
+
+    try:
+        with transaction.atomic():
+            bump_availability_version(doctor.id)
+
+            occupancy = load_day_occupancy(doctor, appointment_date, holder_user_id=patient.user_id)
+            if not occupancy.is_time_free(appointment_time, duration):
+                raise SlotConflict()
+
+            appointment.save(force_insert=True, validate=False)
+            if hold is not None:
+                WaitlistEntry.objects.filter(hold_id=hold.pk).update(
+                    status='booked', appointment=appointment, hold=None
+                )
+                SlotHold.objects.filter(pk=hold.pk).delete()
+    except IntegrityError:
+        raise SlotConflict()
+
+    return appointment
+
+
+def suggest_alternatives(doctor, appointment_date, holder_user_id=None, days=7, limit=3):
+    """The next open slots for ``doctor`` starting on ``appointment_date``."""
+    planner = SlotPlanner(
+        [doctor], appointment_date, appointment_date + timedelta(days=days - 1),
+        holder_user_id=holder_user_id
+    )
+    return [
+        {
+            'date': day.isoformat(),
+            'time': slot['time'],
+            'end_time': slot['end_time'],
+        }
+        for day, _, slot in first_available_slots(planner, limit)
+    ]
+
+
+def series_dates(start_date, occurrences, interval_weeks=1, weekday=None):
+    """
+    Dates for a weekly rule. The first occurrence is the first ``weekday``
+    (0 = Monday) on or after ``start_date``.
+    """
+    first = start_date
+    if weekday is not None:
+        first += timedelta(days=(weekday - start_date.weekday()) % 7)
+    return [first + timedelta(weeks=interval_weeks * index) for index in range(occurrences)]
+
+
+def book_series(patient, doctor, dates, appointment_time, duration, appointment_type, reason,
+                allow_partial=False):
+    """
+    Book one appointment per date in ``dates`` as a recurring series.
+
+    Every occurrence is checked against a single occupancy load for the whole
+    range and the free ones are written with one bulk INSERT. Returns
+    ``(series_id, appointments, conflict_dates)``; unless ``allow_partial`` is
+    set nothing is booked when any occurrence conflicts.
+    """
+    series_id = uuid.uuid4()
+    # Reserved before the transaction so the codes can come from a cached block
+    confirmation_codes = make_confirmation_codes(dates)
+    try:
+        with transaction.atomic():
+            bump_availability_version(doctor.id)
+
+            occupancy = load_occupancy([doctor.id], dates[0], dates[-1], holder_user_id=patient.user_id)
+            free_dates = []
+            conflict_dates = []
+            for day in dates:
+                if occupancy[(doctor.id, day)].is_time_free(appointment_time, duration):
+                    free_dates.append(day)
+                else:
+                    conflict_dates.append(day)
+
+            if conflict_dates and not allow_partial:
+                return series_id, [], conflict_dates
+
+            appointments = []
+            for day, confirmation_code in zip(dates, confirmation_codes):
+                if day not in free_dates:
+                    continue
+                appointments.append(Appointment(
+                    id=uuid.uuid4(),
+                    patient=patient,
+                    doctor=doctor,
+                    appointment_date=day,
+                    appointment_time=appointment_time,
+                    duration=duration,
+                    appointment_type=appointment_type,
+                    chief_complaint=reason,
+                    reason=reason,
+                    status='scheduled',
+                    confirmation_code=confirmation_code,
+                    consultation_fee=doctor.consultation_fee,
+                    series_id=series_id,
+                ))
+            Appointment.objects.bulk_create(appointments)
+            # bulk_create skips post_save
+            refresh_daily_rollups(rollup_bucket(appointment) for appointment in appointments)
+            invalidate_patient_summaries([patient.pk])
+    except IntegrityError:
+        raise SlotConflict()
+
+    return series_id, appointments, conflict_dates
+
+
+def suggest_series_alternatives(doctor, conflict_dates, appointment_time, holder_user_id=None, limit=3):
+    """
+    ``{date: [slot, ...]}`` with the open slots closest to ``appointment_time``
+    on each conflicting date, computed from a single planner over the range.
+    """
+    if not conflict_dates:
+        return {}
+    planner = SlotPlanner([doctor], min(conflict_dates), max(conflict_dates), holder_user_id=holder_user_id)
+    target = time_to_minutes(appointment_time)
+
+    def distance(slot):
+        hours, minutes = slot['time'].split(':')
+        return abs(int(hours) * 60 + int(minutes) - target)
+
+    alternatives = {}
+    for day in conflict_dates:
+        open_slots = [slot for slot in planner.day_slots(doctor, day) if slot['is_available']]
+        open_slots.sort(key=distance)
+        alternatives[day] = [
+            {'date': day.isoformat(), 'time': slot['time'], 'end_time': slot['end_time']}
+            for slot in open_slots[:limit]
+        ]
+    return alternatives
+
+
+def _promote_freed(doctor_id, slots):
+    """Offer slots freed by a committed series change to the waitlist."""
+    from .waitlist import promote_freed_slots
+
+    return promote_freed_slots(doctor_id, slots)
+
+
+def upcoming_series_rows(series_id):
+    """Occurrences of a series from today onwards that have not started yet."""
+    return Appointment.objects.filter(
+        series_id=series_id,
+        status__in=['scheduled', 'confirmed', 'rescheduled'],
+        appointment_date__gte=timezone.localdate(),
+    )
+
+
+def cancel_series(series_id, doctor_id, reason):
+    """
+    Cancel every upcoming occurrence of a series with a single UPDATE, then
+    offer the freed slots to the waitlist.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        bump_availability_version(doctor_id)
+        rows = upcoming_series_rows(series_id)
+        occurrences = list(rows.values_list('appointment_date', 'appointment_time', 'duration', 'patient_id'))
+        cancelled = rows.update(
+            status='cancelled',
+            cancellation_reason=reason,
+            cancelled_at=now,
+            version=F('version') + 1,
+            updated_at=now,
+        )
+        refresh_daily_rollups((doctor_id, occurrence[0]) for occurrence in occurrences)
+        invalidate_patient_summaries(occurrence[3] for occurrence in occurrences)
+
+    _promote_freed(doctor_id, occurrences)
+    return cancelled
+
+
+def reschedule_series(series_id, doctor, new_time, reason, holder_user_id=None):
+    """
+    Move every upcoming occurrence of a series to ``new_time`` with a single
+    UPDATE, then offer the old times to the waitlist. Returns
+    ``(updated_count, conflict_dates)``; nothing changes when any occurrence
+    would overlap another booking.
+    """
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            bump_availability_version(doctor.id)
+
+            rows = upcoming_series_rows(series_id)
+            occurrences = list(rows.values_list('id', 'appointment_date', 'appointment_time', 'duration', 'patient_id'))
+            if not occurrences:
+                return 0, []
+
+            dates = [occurrence[1] for occurrence in occurrences]
+            occupancy = load_occupancy(
+                [doctor.id], min(dates), max(dates),
+                exclude_ids=[occurrence[0] for occurrence in occurrences],
+                holder_user_id=holder_user_id,
+            )
+            conflict_dates = [
+                appointment_date
+                for _, appointment_date, _, duration, _ in occurrences
+                if not occupancy[(doctor.id, appointment_date)].is_time_free(new_time, duration)
+            ]
+            if conflict_dates:
+                return 0, conflict_dates
+
+            updated = rows.update(
+                appointment_time=new_time,
+                status='rescheduled',
+                reschedule_reason=reason,
+                rescheduled_at=now,
+                version=F('version') + 1,
+                updated_at=now,
+            )
+            refresh_daily_rollups((doctor.id, day) for day in dates)
+            invalidate_patient_summaries(occurrence[4] for occurrence in occurrences)
+    except IntegrityError:
+        raise SlotConflict()
+
+    _promote_freed(doctor.id, [
+        occurrence[1:] for occurrence in occurrences if occurrence[2] != new_time
+    ])
+    return updated, []
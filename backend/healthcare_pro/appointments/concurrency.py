@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Appointment
+from .rollups import refresh_daily_rollups, rollup_bucket
+from doctors.schedule import bump_availability_version
+from doctors.today_board import update_today_board
+from patients.summary import invalidate_patient_summaries
+
+
+class StaleVersion(Exception):
+    """The appointment changed since the caller read it."""
+
+
+def expected_version(request, appointment):
+    """
+    The version the client last saw: ``version`` from the request body (or
+    query string, for DELETE) when given, otherwise the one just loaded.
+    Raises ValueError when malformed.
+    """
+    value = request.data.get('version', request.query_params.get('version'))
+    if value in (None, ''):
+        return appointment.version
+    return int(value)
+
+
+def compare_and_set(appointment, version, **changes):
+    """
+    ``UPDATE ... SET <changes>, version = version + 1 WHERE id = ? AND version = ?``
+
+    Writes only the changed columns and applies them to ``appointment`` on
+    success. Raises ``StaleVersion`` when another request got there first.
+    Queryset updates skip the post_save signal, so the doctor's availability
+    version, the daily rollups and the patient's cached summary are updated
+    here, in the same transaction.
+    """
+    changes.setdefault('updated_at', timezone.now())
+    previous_bucket = rollup_bucket(appointment)
+    with transaction.atomic(savepoint=False):
+        updated = Appointment.objects.filter(pk=appointment.pk, version=version).update(
+            version=F('version') + 1, **changes
+        )
+        if updated:
+            for field, value in changes.items():
+                setattr(appointment, field, value)
+            appointment.version = version + 1
+            bump_availability_version(appointment.doctor_id)
+            refresh_daily_rollups([previous_bucket, rollup_bucket(appointment)])
+            invalidate_patient_summaries([appointment.patient_id])
+            if 'status' in changes and not {'doctor', 'doctor_id', 'appointment_date', 'appointment_time'} & set(changes):
+                update_today_board(appointment.doctor_id, {appointment.pk: changes['status']})
+    if not updated:
+        raise StaleVersion()
+    return appointment
+
+
+def stale_version_response(appointment_id):
+    current = Appointment.objects.filter(pk=appointment_id).values_list('version', flat=True).first()
+    return Response(
+        {
+            'error': 'This appointment was changed by someone else. Reload it and try again.',
+            'current_version': current
+        },
+        status=status.HTTP_409_CONFLICT
+    )
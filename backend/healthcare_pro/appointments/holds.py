@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from decouple import config
+
+from .models import Appointment, SlotHold
+from .occupancy import load_day_occupancy
+from doctors.models import Doctor
+from doctors.schedule import bump_availability_version
+
+
+def get_hold_ttl():
+    return timedelta(minutes=config('SLOT_HOLD_MINUTES', default=5, cast=int))
+
+
+def sweep_expired_holds(doctor_id=None, now=None):
+    """
+    Delete expired holds, optionally for one doctor, and bump affected
+    versions. Slots from lapsed waitlist offers go to the next patient on the
+    waitlist (see ``appointments.signals``).
+    """
+    expired = SlotHold.objects.expired(now)
+    if doctor_id is not None:
+        expired = expired.filter(doctor_id=doctor_id)
+
+    holds = list(expired.values_list('pk', 'doctor_id'))
+    if not holds:
+        return 0
+
+    deleted, _ = SlotHold.objects.filter(pk__in=[pk for pk, _ in holds]).delete()
+    for expired_doctor_id in {expired_doctor_id for _, expired_doctor_id in holds}:
+        bump_availability_version(expired_doctor_id)
+    return deleted
+
+
+def promote_next(hold):
+    """Pass the slot of a lapsed or declined waitlist offer to the next patient."""
+    from .waitlist import promote_waitlist
+
+    doctor = Doctor.objects.filter(pk=hold.doctor_id).first()
+    if doctor is None:
+        return None
+    return promote_waitlist(
+        doctor, hold.appointment_date, hold.appointment_time, hold.duration,
+        exclude_patient_id=hold.patient_id
+    )
+
+
+def create_hold(patient, doctor, appointment_date, appointment_time, duration=None, ttl=None,
+                replace=True):
+    """
+    Reserve ``appointment_time`` for ``patient``. Returns None when the time is
+    booked or held by someone else. ``ttl`` defaults to ``SLOT_HOLD_MINUTES``.
+
+    With ``replace`` the patient's other holds are dropped, except waitlist
+    offers, which stay until they are booked, declined or lapse. Offer holds
+    themselves are created with ``replace=False`` so they never cost the
+    patient a hold they are booking with.
+    """
+    if duration is None:
+        duration = Appointment._meta.get_field('duration').default
+    now = timezone.now()
+
+    try:
+        with transaction.atomic():
+            sweep_expired_holds(doctor.id, now)
+
+            occupancy = load_day_occupancy(doctor, appointment_date, holder_user_id=patient.user_id)
+            if not occupancy.is_time_free(appointment_time, duration):
+                return None
+
+            if replace:
+                previous = SlotHold.objects.filter(patient=patient, waitlist_entry__isnull=True)
+                for previous_doctor_id in set(previous.values_list('doctor_id', flat=True)):
+                    bump_availability_version(previous_doctor_id)
+                previous.delete()
+
+            hold = SlotHold.objects.create(
+                patient=patient,
+                doctor=doctor,
+                appointment_date=appointment_date,
+                appointment_time=appointment_time,
+                duration=duration,
+                expires_at=now + (ttl or get_hold_ttl()),
+            )
+    except IntegrityError:
+        # Another patient grabbed the same start time concurrently
+        return None
+
+    bump_availability_version(doctor.id)
+    return hold
+
+
+def release_hold(hold):
+    doctor_id = hold.doctor_id
+    hold.delete()
+    bump_availability_version(doctor_id)
@@ -0,0 +1,175 @@
+from datetime import timedelta, time as dt_time
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from decouple import config
+
+from .models import Appointment
+from .occupancy import load_occupancy
+from .rollups import refresh_daily_rollups, rollup_bucket
+from .slots import get_slot_duration_minutes, iter_dates, weekly_slot_starts
+from doctors.models import Doctor
+from doctors.schedule import DAY_ORDER, bump_availability_version, get_schedules
+from patients.summary import invalidate_patient_summaries
+
+
+# Appointments that can still be moved; in-progress visits stay put
+MOVABLE_STATUSES = ['scheduled', 'confirmed', 'rescheduled']
+
+
+def get_leave_search_weeks():
+    return config('LEAVE_SEARCH_WEEKS', default=4, cast=int)
+
+
+class LeavePlanner:
+    """
+    Plans new slots for a doctor's appointments between ``start_date`` and
+    ``end_date``.
+
+    The affected appointments, the candidate doctors (the doctor first, then
+    available colleagues from the same department), their schedules and the
+    occupancy of the search window after the leave are loaded up front. Each
+    appointment then takes the earliest free slot with its own doctor, or the
+    earliest colleague slot when its doctor has none. Every placement is added
+    to the in-memory occupancy, so the plan never double-books. Appointments
+    that have already started are left alone.
+
+    With ``lock`` every colleague's lock is taken before their occupancy is
+    read, so no booking can land in a slot the plan hands out; the caller
+    holds the doctor's own lock already.
+    """
+
+    def __init__(self, doctor, start_date, end_date, search_weeks=None, include_colleagues=True, now=None,
+                 lock=False):
+        now_local = now or timezone.localtime()
+        self.doctor = doctor
+        self.today = now_local.date()
+        self.now_minutes = now_local.hour * 60 + now_local.minute
+        self.step = get_slot_duration_minutes()
+
+        self.appointments = list(
+            Appointment.objects
+            .select_related('patient__user')
+            .filter(
+                doctor=doctor,
+                appointment_date__range=[start_date, end_date],
+                status__in=MOVABLE_STATUSES,
+            )
+            .filter(
+                Q(appointment_date__gt=self.today)
+                | Q(appointment_date=self.today, appointment_time__gt=now_local.time())
+            )
+            .order_by('appointment_date', 'appointment_time')
+        )
+
+        self.doctors = [doctor]
+        if include_colleagues and doctor.department:
+            self.doctors += list(
+                Doctor.objects
+                .select_related('user')
+                .filter(department=doctor.department, is_available=True)
+                .exclude(id=doctor.id)
+                .order_by('created_at')
+            )
+        if lock:
+            # In id order, so two leave runs lock shared colleagues alike
+            for colleague_id in sorted(candidate.id for candidate in self.doctors[1:]):
+                bump_availability_version(colleague_id)
+
+        self.search_start = max(end_date + timedelta(days=1), self.today)
+        self.search_end = self.search_start + timedelta(weeks=search_weeks or get_leave_search_weeks()) - timedelta(days=1)
+
+        schedules = get_schedules(self.doctors)
+        self.slot_starts = {
+            candidate.id: weekly_slot_starts(candidate, schedules[candidate.id], self.step)
+            for candidate in self.doctors
+        }
+        self.occupancy = load_occupancy(
+            [candidate.id for candidate in self.doctors], self.search_start, self.search_end
+        )
+
+    def _first_free(self, candidate, duration):
+        for day in iter_dates(self.search_start, self.search_end):
+            occupancy = self.occupancy[(candidate.id, day)]
+            for start in self.slot_starts[candidate.id][DAY_ORDER[day.weekday()]]:
+                if day == self.today and start <= self.now_minutes:
+                    continue
+                if start + duration <= 24 * 60 and occupancy.is_free(start, duration):
+                    return day, start
+        return None
+
+    def plan(self):
+        """
+        Returns ``(moves, unplaced)``. Each move is
+        ``(appointment, doctor, new_date, new_time)``; ``unplaced`` lists the
+        appointments with no free slot in the search window.
+        """
+        moves = []
+        unplaced = []
+        for appointment in self.appointments:
+            choice = None
+            for candidate in self.doctors:
+                found = self._first_free(candidate, appointment.duration)
+                if found and (choice is None or found < choice[1:]):
+                    choice = (candidate,) + found
+                if choice and candidate is self.doctor:
+                    # The patient's own doctor wins whenever they have room
+                    break
+
+            if choice is None:
+                unplaced.append(appointment)
+                continue
+            candidate, day, start = choice
+            self.occupancy[(candidate.id, day)].add(start, appointment.duration)
+            moves.append((appointment, candidate, day, dt_time(start // 60, start % 60)))
+        return moves, unplaced
+
+
+def reschedule_for_leave(doctor, start_date, end_date, reason, search_weeks=None,
+                         include_colleagues=True, dry_run=False):
+    """
+    Move the doctor's appointments in the leave range to the slots planned by
+    ``LeavePlanner``. Unless ``dry_run`` is set the plan is made and applied
+    in one transaction with a single bulk UPDATE. The doctor's lock is taken
+    first, and the colleagues' locks before their slots are read. Appointments
+    moved to a colleague take the colleague's consultation fee. Returns
+    ``(moves, unplaced)``.
+
+    The vacated slots are not offered to the waitlist: they fall inside the
+    leave, when the doctor is not seeing anyone.
+    """
+    if dry_run:
+        return LeavePlanner(doctor, start_date, end_date, search_weeks, include_colleagues).plan()
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Lock the doctor's bookings before anything is read, as booking does
+        bump_availability_version(doctor.id)
+        planner = LeavePlanner(doctor, start_date, end_date, search_weeks, include_colleagues, lock=True)
+        moves, unplaced = planner.plan()
+
+        versions = {}
+        buckets = [rollup_bucket(move[0]) for move in moves]
+        for appointment, new_doctor, new_date, new_time in moves:
+            versions[appointment.id] = appointment.version + 1
+            if new_doctor.id != doctor.id:
+                appointment.consultation_fee = new_doctor.consultation_fee
+            appointment.doctor = new_doctor
+            appointment.appointment_date = new_date
+            appointment.appointment_time = new_time
+            appointment.status = 'rescheduled'
+            appointment.reschedule_reason = reason
+            appointment.rescheduled_at = now
+            appointment.updated_at = now
+            appointment.version = F('version') + 1
+        Appointment.objects.bulk_update([move[0] for move in moves], [
+            'doctor', 'appointment_date', 'appointment_time', 'consultation_fee', 'status',
+            'reschedule_reason', 'rescheduled_at', 'updated_at', 'version',
+        ])
+        refresh_daily_rollups(buckets + [(move[1].id, move[2]) for move in moves])
+        invalidate_patient_summaries(move[0].patient_id for move in moves)
+
+    for appointment, *_ in moves:
+        appointment.version = versions[appointment.id]
+    return moves, unplaced
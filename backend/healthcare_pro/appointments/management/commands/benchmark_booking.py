@@ -0,0 +1,143 @@
+import os
+import queue
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from appointments.models import Appointment
+from appointments.occupancy import DayOccupancy
+from appointments.views.booking_views import schedule_appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Fires concurrent bookings at one doctor-day on a throwaway SQLite database and checks for double bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16, help='Concurrent booking threads')
+        parser.add_argument('--requests', type=int, default=400, help='Total booking requests')
+        parser.add_argument('--times', type=int, default=16, help='Distinct start times competed for')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_booking only runs against SQLite')
+
+        # Work on a scratch file so the real database is never touched
+        handle, db_path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(handle)
+        connection.settings_dict.setdefault('TEST', {})['NAME'] = db_path
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.run_benchmark(options['threads'], options['requests'], options['times'])
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+    def run_benchmark(self, thread_count, request_count, time_count):
+        booking_date = timezone.localdate() + timedelta(days=1)
+        doctor_user = User.objects.create_user(
+            email='bench-doctor@example.com', password='BenchPass123',
+            first_name='Bench', last_name='Doctor', role='doctor'
+        )
+        doctor = Doctor.objects.create(
+            user=doctor_user, specialization='cardiology', department='Cardiology',
+            license_number='BENCH-001', years_of_experience=1, qualification='MBBS'
+        )
+        patients = []
+        for index in range(thread_count):
+            user = User.objects.create_user(
+                email=f'bench-patient{index}@example.com', password='BenchPass123',
+                first_name='Bench', last_name=f'Patient{index}', role='patient'
+            )
+            patients.append(PatientProfile.objects.create(user=user))
+
+        # Candidate start times 15 minutes apart, so 30 minute bookings also overlap
+        candidates = [
+            9 * 60 + index * 15 for index in range(time_count)
+        ]
+        work = queue.Queue()
+        for index in range(request_count):
+            minute = candidates[index % len(candidates)]
+            work.put((patients[index % len(patients)], f'{minute // 60:02d}:{minute % 60:02d}'))
+
+        factory = APIRequestFactory()
+        results = []
+        results_lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    try:
+                        patient, preferred_time = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    request = factory.post('/api/appointments/schedule/', {
+                        'department': 'Cardiology',
+                        'doctor_id': str(doctor.id),
+                        'appointment_date': booking_date.isoformat(),
+                        'preferred_time': preferred_time,
+                        'appointment_type': 'consultation',
+                        'reason': 'Benchmark',
+                    }, format='json')
+                    force_authenticate(request, user=patient.user)
+                    started = time.perf_counter()
+                    response = schedule_appointment(request)
+                    elapsed = time.perf_counter() - started
+                    with results_lock:
+                        results.append((response.status_code, elapsed))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - started
+
+        created = sum(1 for code, _ in results if code == 201)
+        conflicts = sum(1 for code, _ in results if code == 400)
+        errors = len(results) - created - conflicts
+        latencies = sorted(elapsed for _, elapsed in results)
+
+        booked = list(
+            Appointment.objects
+            .filter(doctor=doctor, appointment_date=booking_date, status__in=Appointment.ACTIVE_STATUSES)
+            .values_list('appointment_time', 'duration')
+        )
+        occupancy = DayOccupancy()
+        overlaps = 0
+        for appointment_time, duration in sorted(booked):
+            if not occupancy.is_time_free(appointment_time, duration):
+                overlaps += 1
+            occupancy.add_time(appointment_time, duration)
+
+        self.stdout.write(f'Requests:       {len(results)} over {thread_count} threads')
+        self.stdout.write(f'Wall time:      {wall_time:.2f}s ({len(results) / wall_time:.1f} req/s)')
+        self.stdout.write(
+            f'Latency:        p50 {statistics.median(latencies) * 1000:.1f}ms, '
+            f'p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms'
+        )
+        self.stdout.write(f'Created:        {created}')
+        self.stdout.write(f'Conflicts:      {conflicts}')
+        self.stdout.write(f'Errors:         {errors}')
+        self.stdout.write(f'Rows persisted: {len(booked)}')
+        self.stdout.write(f'Overlaps:       {overlaps}')
+
+        if errors or overlaps or created != len(booked):
+            raise CommandError('Concurrent booking produced errors or double bookings')
+        self.stdout.write(self.style.SUCCESS('No double bookings'))
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from appointments.no_shows import get_no_show_grace, parse_cursor, sweep_no_shows
+
+
+class Command(BaseCommand):
+    help = 'Marks past scheduled/confirmed appointments as no-show in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Appointments per UPDATE')
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+        parser.add_argument('--cursor', default=None, help='Resume after the cursor reported by an earlier run')
+        parser.add_argument('--dry-run', action='store_true', help='Count stale appointments without changing them')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running, sweeping every N seconds (0 runs once)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['cursor']:
+            try:
+                parse_cursor(options['cursor'])
+            except ValueError:
+                raise CommandError('--cursor must look like YYYY-MM-DD,HH:MM:SS,<appointment uuid>')
+
+        cursor = options['cursor']
+        while True:
+            stats = sweep_no_shows(
+                batch_size=options['batch_size'],
+                cursor=cursor,
+                max_batches=options['max_batches'],
+                dry_run=options['dry_run'],
+            )
+            verb = 'Would mark' if options['dry_run'] else 'Marked'
+            self.stdout.write(
+                f"{verb} {stats['marked']} appointments as no-show in {stats['batches']} batches "
+                f"(grace {get_no_show_grace()})"
+            )
+            if stats['cursor']:
+                self.stdout.write(f"More remain, resume with --cursor {stats['cursor']}")
+
+            if not options['interval']:
+                break
+            # A periodic run starts from the top; already-swept rows no longer match
+            cursor = None
+            time.sleep(options['interval'])
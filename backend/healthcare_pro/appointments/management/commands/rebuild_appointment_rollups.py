@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from appointments.rollups import rebuild_daily_rollups
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}, use YYYY-MM-DD')
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the appointment daily rollups for a date range from the appointments table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', default=None, help='First day to rebuild (default: first appointment)')
+        parser.add_argument('--end', default=None, help='Last day to rebuild (default: last appointment)')
+        parser.add_argument('--batch-days', type=int, default=31, help='Days rebuilt per transaction')
+
+    def handle(self, *args, **options):
+        start = _parse_date(options['start']) if options['start'] else None
+        end = _parse_date(options['end']) if options['end'] else None
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end')
+        if options['batch_days'] < 1:
+            raise CommandError('--batch-days must be at least 1')
+
+        days, rows = rebuild_daily_rollups(start, end, batch_days=options['batch_days'])
+        self.stdout.write(f"Rebuilt {days} days of appointment rollups ({rows} rows)")
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0007_alter_medication_dosage'),
+        ('doctors', '0005_doctor_availability_version'),
+        ('appointments', '0002_appointment_cancellation_reason_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlotHold',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('appointment_date', models.DateField()),
+                ('appointment_time', models.TimeField()),
+                ('duration', models.PositiveIntegerField(default=30, help_text='Duration in minutes')),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_holds', to='doctors.doctor')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slot_holds', to='patients.patientprofile')),
+            ],
+            options={
+                'verbose_name': 'Slot Hold',
+                'verbose_name_plural': 'Slot Holds',
+                'db_table': 'appointment_slot_holds',
+                'ordering': ['expires_at'],
+                'unique_together': {('doctor', 'appointment_date', 'appointment_time')},
+            },
+        ),
+    ]
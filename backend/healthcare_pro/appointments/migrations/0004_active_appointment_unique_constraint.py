@@ -0,0 +1,21 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0003_slothold'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='appointment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['scheduled', 'confirmed', 'in_progress', 'rescheduled'])), fields=('doctor', 'appointment_date', 'appointment_time'), name='unique_active_appointment_slot'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0004_active_appointment_unique_constraint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='series_id',
+            field=models.UUIDField(blank=True, db_index=True, help_text='Shared by appointments booked as one recurring series', null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0005_appointment_series_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appointment',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Incremented by every compare-and-set update'),
+        ),
+    ]
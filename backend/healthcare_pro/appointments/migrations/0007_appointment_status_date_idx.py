@@ -0,0 +1,17 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0006_appointment_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointment',
+            index=models.Index(fields=['status', 'appointment_date', 'appointment_time'], name='appointment_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.9 on 2026-10-17 04:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0007_alter_medication_dosage'),
+        ('doctors', '0005_doctor_availability_version'),
+        ('appointments', '0007_appointment_status_date_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('specialization', models.CharField(blank=True, help_text='Matched when no doctor is given', max_length=100)),
+                ('earliest_date', models.DateField()),
+                ('latest_date', models.DateField()),
+                ('earliest_time', models.TimeField(blank=True, null=True)),
+                ('latest_time', models.TimeField(blank=True, null=True)),
+                ('appointment_type', models.CharField(choices=[('consultation', 'Consultation'), ('follow_up', 'Follow-up'), ('check_up', 'Check-up'), ('emergency', 'Emergency'), ('procedure', 'Procedure'), ('therapy', 'Therapy')], default='consultation', max_length=20)),
+                ('reason', models.TextField(blank=True)),
+                ('auto_book', models.BooleanField(default=False, help_text='Book a freed slot directly instead of offering a hold')),
+                ('status', models.CharField(choices=[('waiting', 'Waiting'), ('offered', 'Offered'), ('booked', 'Booked'), ('expired', 'Expired'), ('cancelled', 'Cancelled')], default='waiting', max_length=20)),
+                ('offered_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('appointment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entries', to='appointments.appointment')),
+                ('doctor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='doctors.doctor')),
+                ('hold', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='waitlist_entry', to='appointments.slothold')),
+                ('patient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='patients.patientprofile')),
+            ],
+            options={
+                'verbose_name': 'Waitlist Entry',
+                'verbose_name_plural': 'Waitlist Entries',
+                'db_table': 'appointment_waitlist',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['doctor', 'status', 'earliest_date', 'latest_date'], name='waitlist_doctor_match_idx'), models.Index(fields=['specialization', 'status', 'earliest_date', 'latest_date'], name='waitlist_specialty_match_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.9 on 2026-10-17 04:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0005_doctor_availability_version'),
+        ('appointments', '0008_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('specialization', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('scheduled', 'Scheduled'), ('confirmed', 'Confirmed'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled'), ('no_show', 'No Show'), ('rescheduled', 'Rescheduled')], max_length=20)),
+                ('appointment_type', models.CharField(choices=[('consultation', 'Consultation'), ('follow_up', 'Follow-up'), ('check_up', 'Check-up'), ('emergency', 'Emergency'), ('procedure', 'Procedure'), ('therapy', 'Therapy')], max_length=20)),
+                ('appointment_count', models.PositiveIntegerField(default=0)),
+                ('fee_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('doctor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='doctors.doctor')),
+            ],
+            options={
+                'verbose_name': 'Appointment Daily Rollup',
+                'verbose_name_plural': 'Appointment Daily Rollups',
+                'db_table': 'appointment_daily_rollups',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['doctor', 'date'], name='rollup_doctor_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='appointmentdailyrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'doctor', 'status', 'appointment_type'), name='unique_appointment_daily_rollup'),
+        ),
+    ]
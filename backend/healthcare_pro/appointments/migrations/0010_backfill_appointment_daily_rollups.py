@@ -0,0 +1,43 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_rollups(apps, schema_editor):
+    # Aggregates here rather than calling appointments.rollups, which tracks
+    # the current models and may not match the schema at this point
+    Appointment = apps.get_model('appointments', 'Appointment')
+    AppointmentDailyRollup = apps.get_model('appointments', 'AppointmentDailyRollup')
+
+    AppointmentDailyRollup.objects.all().delete()
+    rows = (
+        Appointment.objects
+        .order_by()
+        .values('appointment_date', 'doctor_id', 'doctor__specialization', 'status', 'appointment_type')
+        .annotate(appointment_count=Count('id'), fee_total=Sum('consultation_fee'))
+    )
+    AppointmentDailyRollup.objects.bulk_create(
+        [
+            AppointmentDailyRollup(
+                date=row['appointment_date'],
+                doctor_id=row['doctor_id'],
+                specialization=row['doctor__specialization'],
+                status=row['status'],
+                appointment_type=row['appointment_type'],
+                appointment_count=row['appointment_count'],
+                fee_total=row['fee_total'] or 0,
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0009_appointmentdailyrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, ExtractHour, ExtractMinute, Greatest
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import datetime, timedelta
@@ -6,6 +8,20 @@ from decouple import config
 import uuid
 
 
+# Statuses that still hold the doctor's time
+ACTIVE_APPOINTMENT_STATUSES = ['scheduled', 'confirmed', 'in_progress', 'rescheduled']
+
+# Status changes a doctor or admin may make through the API
+ALLOWED_STATUS_TRANSITIONS = {
+    'scheduled': ['confirmed', 'cancelled'],
+    'confirmed': ['in_progress', 'cancelled', 'no_show'],
+    'in_progress': ['completed'],
+    'completed': [],  # No transitions from completed
+    'cancelled': ['scheduled'],  # Allow rescheduling
+    'no_show': [],  # No transitions from no_show
+}
+
+
 class Appointment(models.Model):
     """Appointment model for patient-doctor bookings."""
     
@@ -27,6 +43,8 @@ class Appointment(models.Model):
         ('procedure', 'Procedure'),
         ('therapy', 'Therapy'),
     ]
+
+    ACTIVE_STATUSES = ACTIVE_APPOINTMENT_STATUSES
     
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     patient = models.ForeignKey('patients.PatientProfile', on_delete=models.CASCADE, related_name='appointments')
@@ -47,6 +65,7 @@ class Appointment(models.Model):
     
     # Booking details
     confirmation_code = models.CharField(max_length=20, blank=True, null=True, unique=True)
+    series_id = models.UUIDField(blank=True, null=True, db_index=True, help_text="Shared by appointments booked as one recurring series")
     
     # Cancellation/Rescheduling
     cancellation_reason = models.TextField(blank=True, null=True)
@@ -61,13 +80,26 @@ class Appointment(models.Model):
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    version = models.PositiveIntegerField(default=0, editable=False, help_text="Incremented by every compare-and-set update")
     
     class Meta:
         db_table = 'appointments'
         verbose_name = 'Appointment'
         verbose_name_plural = 'Appointments'
         ordering = ['appointment_date', 'appointment_time']
-        unique_together = ['doctor', 'appointment_date', 'appointment_time']
+        constraints = [
+            # Only appointments that still hold the doctor's time block the slot,
+            # so cancelled or completed bookings can be rebooked
+            models.UniqueConstraint(
+                fields=['doctor', 'appointment_date', 'appointment_time'],
+                condition=models.Q(status__in=ACTIVE_APPOINTMENT_STATUSES),
+                name='unique_active_appointment_slot',
+            ),
+        ]
+        indexes = [
+            # Status + date scans: dashboards and the no-show sweeper
+            models.Index(fields=['status', 'appointment_date', 'appointment_time'], name='appointment_status_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.patient.user.get_full_name()} - Dr. {self.doctor.user.get_full_name()} ({self.appointment_date} {self.appointment_time})"
@@ -78,11 +110,25 @@ class Appointment(models.Model):
             if self.appointment_date < timezone.now().date():
                 raise ValidationError("Appointment cannot be scheduled for a past date.")
     
-    def save(self, *args, **kwargs):
-        self.full_clean()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The day the row was loaded on, so moving it also refreshes the old daily rollup
+        instance._loaded_rollup_bucket = (
+            instance.__dict__.get('doctor_id'), instance.__dict__.get('appointment_date')
+        )
+        return instance
+
+    def save(self, *args, validate=True, **kwargs):
+        # Callers that have already validated (e.g. the booking path) pass
+        # validate=False to skip full_clean()'s extra uniqueness queries
+        if validate:
+            self.full_clean()
         if not self.consultation_fee and hasattr(self, 'doctor'):
             self.consultation_fee = self.doctor.consultation_fee
-        super().save(*args, **kwargs)
+        # The post_save receivers refresh the daily rollups in the same transaction
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
     
     @property
     def appointment_datetime(self):
@@ -96,17 +142,55 @@ class Appointment(models.Model):
     
     @property
     def is_past(self):
-        return self.appointment_datetime <= timezone.now()
+        return timezone.make_aware(self.appointment_datetime) <= timezone.now()
     
     @property
     def can_be_cancelled(self):
         if self.status in ['completed', 'cancelled', 'no_show']:
             return False
         cancellation_deadline_hours = config('CANCELLATION_DEADLINE_HOURS', default=24, cast=int)
-        time_until_appointment = self.appointment_datetime - timezone.now()
+        time_until_appointment = timezone.make_aware(self.appointment_datetime) - timezone.now()
         return time_until_appointment > timedelta(hours=cancellation_deadline_hours)
 
 
+def _minute_of_day(time_expression):
+    return ExtractHour(time_expression) * 60 + ExtractMinute(time_expression)
+
+
+class AppointmentSlotQuerySet(models.QuerySet):
+    def with_capacity(self):
+        """
+        Annotate ``booked_count`` and ``remaining_capacity`` in SQL.
+
+        A slot counts every active appointment for the same doctor and date
+        whose ``[appointment_time, appointment_time + duration)`` overlaps
+        ``[start_time, end_time)``, as booking does.
+        """
+        booked = (
+            Appointment.objects
+            .annotate(end_minute=_minute_of_day('appointment_time') + F('duration'))
+            .filter(
+                doctor=OuterRef('doctor'),
+                appointment_date=OuterRef('date'),
+                appointment_time__lt=OuterRef('end_time'),
+                end_minute__gt=_minute_of_day(OuterRef('start_time')),
+                status__in=Appointment.ACTIVE_STATUSES,
+            )
+            .order_by()
+            .values('doctor')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        return self.annotate(
+            booked_count=Coalesce(Subquery(booked, output_field=models.IntegerField()), 0),
+        ).annotate(
+            remaining_capacity=Greatest(F('max_appointments') - F('booked_count'), 0),
+        )
+
+    def with_open_capacity(self):
+        return self.with_capacity().filter(booked_count__lt=F('max_appointments'))
+
+
 class AppointmentSlot(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     doctor = models.ForeignKey('doctors.Doctor', on_delete=models.CASCADE, related_name='available_slots')
@@ -117,6 +201,8 @@ class AppointmentSlot(models.Model):
     max_appointments = models.PositiveIntegerField(default=1, help_text="Maximum appointments for this slot")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = AppointmentSlotQuerySet.as_manager()
     
     class Meta:
         db_table = 'appointment_slots'
@@ -130,12 +216,15 @@ class AppointmentSlot(models.Model):
     
     @property
     def current_appointments(self):
-        return Appointment.objects.filter(
-            doctor=self.doctor,
-            appointment_date=self.date,
-            appointment_time=self.start_time,
-            status__in=['scheduled', 'confirmed', 'in_progress']
-        ).count()
+        if not hasattr(self, 'booked_count'):
+            self.booked_count = (
+                AppointmentSlot.objects
+                .filter(pk=self.pk)
+                .with_capacity()
+                .values_list('booked_count', flat=True)
+                .first()
+            ) or 0
+        return self.booked_count
     
     @property
     def is_fully_booked(self):
@@ -164,4 +253,124 @@ class AppointmentReminder(models.Model):
         ordering = ['reminder_time']
     
     def __str__(self):
-        return f"Reminder for {self.appointment} - {self.get_reminder_type_display()}"
\ No newline at end of file
+        return f"Reminder for {self.appointment} - {self.get_reminder_type_display()}"
+
+class SlotHoldQuerySet(models.QuerySet):
+    def active(self, now=None):
+        return self.filter(expires_at__gt=now or timezone.now())
+
+    def expired(self, now=None):
+        return self.filter(expires_at__lte=now or timezone.now())
+
+
+class SlotHold(models.Model):
+    """Short-lived reservation of a doctor's time while a patient completes booking."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    patient = models.ForeignKey('patients.PatientProfile', on_delete=models.CASCADE, related_name='slot_holds')
+    doctor = models.ForeignKey('doctors.Doctor', on_delete=models.CASCADE, related_name='slot_holds')
+    appointment_date = models.DateField()
+    appointment_time = models.TimeField()
+    duration = models.PositiveIntegerField(default=30, help_text="Duration in minutes")
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SlotHoldQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'appointment_slot_holds'
+        verbose_name = 'Slot Hold'
+        verbose_name_plural = 'Slot Holds'
+        unique_together = ['doctor', 'appointment_date', 'appointment_time']
+        ordering = ['expires_at']
+
+    def __str__(self):
+        return f"Hold {self.doctor_id} {self.appointment_date} {self.appointment_time} until {self.expires_at}"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+
+class WaitlistEntry(models.Model):
+    """A patient waiting for an earlier opening with a doctor or in a specialization."""
+
+    STATUS_CHOICES = [
+        ('waiting', 'Waiting'),
+        ('offered', 'Offered'),
+        ('booked', 'Booked'),
+        ('expired', 'Expired'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    patient = models.ForeignKey('patients.PatientProfile', on_delete=models.CASCADE, related_name='waitlist_entries')
+    doctor = models.ForeignKey('doctors.Doctor', on_delete=models.CASCADE, related_name='waitlist_entries', blank=True, null=True)
+    specialization = models.CharField(max_length=100, blank=True, help_text="Matched when no doctor is given")
+
+    # Acceptable window; empty times mean any time of day
+    earliest_date = models.DateField()
+    latest_date = models.DateField()
+    earliest_time = models.TimeField(blank=True, null=True)
+    latest_time = models.TimeField(blank=True, null=True)
+
+    appointment_type = models.CharField(max_length=20, choices=Appointment.APPOINTMENT_TYPE_CHOICES, default='consultation')
+    reason = models.TextField(blank=True)
+    auto_book = models.BooleanField(default=False, help_text="Book a freed slot directly instead of offering a hold")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='waiting')
+    hold = models.OneToOneField(SlotHold, on_delete=models.SET_NULL, blank=True, null=True, related_name='waitlist_entry')
+    appointment = models.ForeignKey(Appointment, on_delete=models.SET_NULL, blank=True, null=True, related_name='waitlist_entries')
+    offered_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'appointment_waitlist'
+        verbose_name = 'Waitlist Entry'
+        verbose_name_plural = 'Waitlist Entries'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['doctor', 'status', 'earliest_date', 'latest_date'], name='waitlist_doctor_match_idx'),
+            models.Index(fields=['specialization', 'status', 'earliest_date', 'latest_date'], name='waitlist_specialty_match_idx'),
+        ]
+
+    def __str__(self):
+        target = self.doctor_id or self.specialization
+        return f"Waitlist {self.patient_id} for {target} ({self.earliest_date} - {self.latest_date}, {self.status})"
+
+
+class AppointmentDailyRollup(models.Model):
+    """
+    Appointment count and fee total per day, doctor, status and type.
+
+    Rows are recomputed for every (doctor, day) an appointment write touches,
+    in the same transaction (see ``appointments.rollups``), so dashboards can
+    read totals without scanning the appointments table.
+    """
+
+    date = models.DateField()
+    doctor = models.ForeignKey('doctors.Doctor', on_delete=models.CASCADE, related_name='daily_rollups')
+    specialization = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=Appointment.STATUS_CHOICES)
+    appointment_type = models.CharField(max_length=20, choices=Appointment.APPOINTMENT_TYPE_CHOICES)
+    appointment_count = models.PositiveIntegerField(default=0)
+    fee_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        db_table = 'appointment_daily_rollups'
+        verbose_name = 'Appointment Daily Rollup'
+        verbose_name_plural = 'Appointment Daily Rollups'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'doctor', 'status', 'appointment_type'],
+                name='unique_appointment_daily_rollup',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['doctor', 'date'], name='rollup_doctor_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.doctor_id} {self.status}/{self.appointment_type}: {self.appointment_count}"
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+import uuid
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from decouple import config
+
+from .models import Appointment
+from .rollups import refresh_daily_rollups
+from doctors.schedule import bump_availability_version
+from patients.summary import invalidate_patient_summaries
+
+
+# Statuses of bookings that nobody closed out after the visit
+STALE_STATUSES = ['scheduled', 'confirmed', 'rescheduled']
+
+
+def get_no_show_grace():
+    return timedelta(hours=config('NO_SHOW_GRACE_HOURS', default=24, cast=int))
+
+
+def format_cursor(row):
+    appointment_date, appointment_time, appointment_id = row
+    return f"{appointment_date.isoformat()},{appointment_time.strftime('%H:%M:%S')},{appointment_id}"
+
+
+def parse_cursor(value):
+    """``"YYYY-MM-DD,HH:MM:SS,<uuid>"`` as written by ``format_cursor``. Raises ValueError."""
+    day, start, appointment_id = value.split(',')
+    return (
+        datetime.strptime(day, '%Y-%m-%d').date(),
+        datetime.strptime(start, '%H:%M:%S').time(),
+        uuid.UUID(appointment_id),
+    )
+
+
+def stale_appointments(now=None, grace=None):
+    """Unfinished appointments that started more than ``grace`` ago."""
+    if grace is None:
+        grace = get_no_show_grace()
+    cutoff = timezone.localtime(now) - grace
+    return Appointment.objects.filter(
+        Q(appointment_date__lt=cutoff.date())
+        | Q(appointment_date=cutoff.date(), appointment_time__lte=cutoff.time()),
+        status__in=STALE_STATUSES,
+    )
+
+
+def sweep_no_shows(batch_size=500, cursor=None, max_batches=None, now=None, grace=None, dry_run=False):
+    """
+    Mark stale appointments as ``no_show`` in batches of ``batch_size``.
+
+    Rows are walked in (date, time, id) order from ``cursor``. Each batch
+    selects one page of ids and changes it with one UPDATE in its own short
+    transaction, so a large backlog never holds a long lock and an interrupted
+    run can resume from the last cursor it reported. Returns
+    ``{'batches', 'marked', 'cursor'}``; ``cursor`` is None once the backlog
+    is done.
+    """
+    if now is None:
+        now = timezone.now()
+    candidates = stale_appointments(now, grace).order_by('appointment_date', 'appointment_time', 'id')
+    stats = {'batches': 0, 'marked': 0, 'cursor': cursor}
+
+    while max_batches is None or stats['batches'] < max_batches:
+        page = candidates
+        if stats['cursor']:
+            day, start, appointment_id = parse_cursor(stats['cursor'])
+            page = page.filter(
+                Q(appointment_date__gt=day)
+                | Q(appointment_date=day, appointment_time__gt=start)
+                | Q(appointment_date=day, appointment_time=start, id__gt=appointment_id)
+            )
+        rows = list(page.values_list(
+            'appointment_date', 'appointment_time', 'id', 'doctor_id', 'patient_id'
+        )[:batch_size])
+        if not rows:
+            stats['cursor'] = None
+            break
+
+        if dry_run:
+            marked = len(rows)
+        else:
+            with transaction.atomic():
+                # The status filter skips rows closed out since they were read
+                marked = Appointment.objects.filter(
+                    id__in=[row[2] for row in rows], status__in=STALE_STATUSES
+                ).update(status='no_show', version=F('version') + 1, updated_at=now)
+                for doctor_id in {row[3] for row in rows}:
+                    bump_availability_version(doctor_id)
+                refresh_daily_rollups((row[3], row[0]) for row in rows)
+                invalidate_patient_summaries(row[4] for row in rows)
+
+        stats['batches'] += 1
+        stats['marked'] += marked
+        stats['cursor'] = format_cursor(rows[-1][:3])
+        if len(rows) < batch_size:
+            stats['cursor'] = None
+            break
+
+    return stats
@@ -0,0 +1,106 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import Appointment, SlotHold
+
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minute_of(value):
+    return value.hour * 60 + value.minute
+
+
+def _clamp_interval(start, duration):
+    start = max(int(start), 0)
+    end = min(start + max(int(duration or 0), 1), MINUTES_PER_DAY)
+    return start, end
+
+
+def _span_mask(start, end):
+    return ((1 << (end - start)) - 1) << start
+
+
+class DayOccupancy:
+    """
+    Minute-resolution occupancy for one doctor on one day.
+
+    Busy minutes are kept in a 1440-bit integer so "is [start, start + duration)
+    free" is a single mask test. The individual intervals are also kept sorted
+    by start so overlap counts can be answered with a bisect.
+    """
+
+    def __init__(self):
+        self.mask = 0
+        self.intervals = []
+        self._starts = []
+        self._longest = 0
+
+    def add(self, start, duration):
+        start, end = _clamp_interval(start, duration)
+        self.mask |= _span_mask(start, end)
+        index = bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self.intervals.insert(index, (start, end))
+        self._longest = max(self._longest, end - start)
+
+    def add_time(self, start_time, duration):
+        self.add(_minute_of(start_time), duration)
+
+    def is_free(self, start, duration):
+        start, end = _clamp_interval(start, duration)
+        return not (self.mask & _span_mask(start, end))
+
+    def is_time_free(self, start_time, duration):
+        return self.is_free(_minute_of(start_time), duration)
+
+    def count_overlapping(self, start, end):
+        """Number of booked intervals that intersect [start, end)."""
+        if not self.intervals or end <= start:
+            return 0
+        low = bisect_left(self._starts, start - self._longest + 1)
+        high = bisect_left(self._starts, end)
+        return sum(1 for interval_start, interval_end in self.intervals[low:high] if interval_end > start)
+
+
+def load_occupancy(doctor_ids, start_date, end_date, exclude_ids=None, holder_user_id=None):
+    """
+    Build a ``DayOccupancy`` for every (doctor_id, date) with active appointments
+    or unexpired slot holds in the range, using a single query.
+
+    Holds placed by ``holder_user_id`` are ignored so a patient's own hold never
+    blocks them.
+    """
+    doctor_ids = list(doctor_ids)
+    occupancy = defaultdict(DayOccupancy)
+    rows = Appointment.objects.filter(
+        doctor_id__in=doctor_ids,
+        appointment_date__range=[start_date, end_date],
+        status__in=Appointment.ACTIVE_STATUSES,
+    )
+    if exclude_ids:
+        rows = rows.exclude(id__in=list(exclude_ids))
+
+    holds = SlotHold.objects.active(timezone.now()).filter(
+        doctor_id__in=doctor_ids,
+        appointment_date__range=[start_date, end_date],
+    )
+    if holder_user_id:
+        holds = holds.exclude(patient__user_id=holder_user_id)
+
+    fields = ('doctor_id', 'appointment_date', 'appointment_time', 'duration')
+    combined = rows.order_by().values_list(*fields).union(
+        holds.order_by().values_list(*fields), all=True
+    )
+    for doctor_id, appointment_date, appointment_time, duration in combined:
+        occupancy[(doctor_id, appointment_date)].add_time(appointment_time, duration)
+    return occupancy
+
+
+def load_day_occupancy(doctor, day, exclude_ids=None, holder_user_id=None):
+    """Occupancy for a single doctor-day."""
+    return load_occupancy(
+        [doctor.id], day, day, exclude_ids=exclude_ids, holder_user_id=holder_user_id
+    )[(doctor.id, day)]
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+
+from .models import Appointment, AppointmentDailyRollup
+
+
+def rollup_bucket(appointment):
+    """The (doctor id, day) rollup bucket ``appointment`` currently counts towards."""
+    return appointment.doctor_id, appointment.appointment_date
+
+
+def _aggregate(appointments):
+    rows = (
+        appointments
+        .order_by()
+        .values('appointment_date', 'doctor_id', 'doctor__specialization', 'status', 'appointment_type')
+        .annotate(appointment_count=Count('id'), fee_total=Sum('consultation_fee'))
+    )
+    return [
+        AppointmentDailyRollup(
+            date=row['appointment_date'],
+            doctor_id=row['doctor_id'],
+            specialization=row['doctor__specialization'],
+            status=row['status'],
+            appointment_type=row['appointment_type'],
+            appointment_count=row['appointment_count'],
+            fee_total=row['fee_total'] or 0,
+        )
+        for row in rows
+    ]
+
+
+def refresh_daily_rollups(buckets):
+    """
+    Recompute the rollup rows of the given ``(doctor_id, date)`` buckets from
+    the appointments table: one DELETE, one grouped SELECT and one INSERT.
+
+    Called in the transaction that changed the appointments, after the
+    doctor's availability version was bumped, so concurrent writers for the
+    same doctor are serialized and the rows always match the table.
+    """
+    days_by_doctor = defaultdict(set)
+    for doctor_id, day in buckets:
+        if doctor_id is not None and day is not None:
+            days_by_doctor[doctor_id].add(day)
+    if not days_by_doctor:
+        return
+
+    rollup_match = Q()
+    appointment_match = Q()
+    for doctor_id, days in days_by_doctor.items():
+        rollup_match |= Q(doctor_id=doctor_id, date__in=days)
+        appointment_match |= Q(doctor_id=doctor_id, appointment_date__in=days)
+
+    with transaction.atomic(savepoint=False):
+        AppointmentDailyRollup.objects.filter(rollup_match).delete()
+        AppointmentDailyRollup.objects.bulk_create(_aggregate(Appointment.objects.filter(appointment_match)))
+
+
+def rebuild_daily_rollups(start_date=None, end_date=None, batch_days=31):
+    """
+    Rebuild the rollups between ``start_date`` and ``end_date`` (inclusive;
+    open ends default to the first and last appointment) from scratch, one
+    transaction per ``batch_days`` days. Returns ``(days, rows)`` written.
+    """
+    if start_date is None or end_date is None:
+        bounds = Appointment.objects.order_by().aggregate(
+            first=Min('appointment_date'), last=Max('appointment_date')
+        )
+        start_date = start_date or bounds['first']
+        end_date = end_date or bounds['last']
+    if start_date is None or end_date is None or start_date > end_date:
+        return 0, 0
+
+    days = (end_date - start_date).days + 1
+    rows = 0
+    batch_start = start_date
+    while batch_start <= end_date:
+        batch_end = min(batch_start + timedelta(days=batch_days - 1), end_date)
+        with transaction.atomic():
+            AppointmentDailyRollup.objects.filter(date__range=[batch_start, batch_end]).delete()
+            rows += len(AppointmentDailyRollup.objects.bulk_create(_aggregate(
+                Appointment.objects.filter(appointment_date__range=[batch_start, batch_end])
+            )))
+        batch_start = batch_end + timedelta(days=1)
+    return days, rows
@@ -2,7 +2,7 @@ from rest_framework import serializers
 from django.utils import timezone
 from datetime import datetime, timedelta
 
-from .models import Appointment, AppointmentSlot, AppointmentReminder
+from .models import ALLOWED_STATUS_TRANSITIONS, Appointment, AppointmentSlot, AppointmentReminder
 from patients.serializers import PatientProfileListSerializer
 from doctors.serializers import DoctorListSerializer
 
@@ -29,9 +29,9 @@ class AppointmentSerializer(serializers.ModelSerializer):
             'end_time', 'duration', 'appointment_type', 'status',
             'chief_complaint', 'notes', 'doctor_notes', 'cancellation_reason',
             'consultation_fee', 'is_paid', 'is_past', 'can_be_cancelled',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at', 'version'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'version']
     
     def get_patient_name(self, obj):
         return obj.patient.user.get_full_name()
@@ -79,17 +79,7 @@ class AppointmentUpdateSerializer(serializers.ModelSerializer):
         if self.instance:
             current_status = self.instance.status
             
-            # Define allowed status transitions
-            allowed_transitions = {
-                'scheduled': ['confirmed', 'cancelled'],
-                'confirmed': ['in_progress', 'cancelled', 'no_show'],
-                'in_progress': ['completed'],
-                'completed': [],  # No transitions from completed
-                'cancelled': ['scheduled'],  # Allow rescheduling
-                'no_show': [],  # No transitions from no_show
-            }
-            
-            if value not in allowed_transitions.get(current_status, []):
+            if value not in ALLOWED_STATUS_TRANSITIONS.get(current_status, []):
                 raise serializers.ValidationError(
                     f"Cannot change status from {current_status} to {value}."
                 )
@@ -130,7 +120,7 @@ class AppointmentListSerializer(serializers.ModelSerializer):
             'id', 'patient_name', 'doctor_name', 'appointment_date',
             'appointment_time', 'appointment_datetime', 'duration',
             'appointment_type', 'status', 'chief_complaint',
-            'consultation_fee', 'is_paid', 'created_at'
+            'consultation_fee', 'is_paid', 'created_at', 'version'
         ]
     
     def get_patient_name(self, obj):
@@ -156,7 +146,7 @@ class DoctorAppointmentSerializer(serializers.ModelSerializer):
             'appointment_date', 'appointment_time', 'appointment_datetime',
             'end_time', 'duration', 'appointment_type', 'status',
             'chief_complaint', 'notes', 'doctor_notes', 
-            'consultation_fee', 'is_paid', 'created_at'
+            'consultation_fee', 'is_paid', 'created_at', 'version'
         ]
     
     def get_patient_name(self, obj):
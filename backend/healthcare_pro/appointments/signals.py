@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .holds import promote_next
+from .models import Appointment, AppointmentSlot, SlotHold, WaitlistEntry
+from .rollups import refresh_daily_rollups, rollup_bucket
+from doctors.schedule import bump_availability_version
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+@receiver([post_save, post_delete], sender=AppointmentSlot)
+def bump_doctor_availability(sender, instance, **kwargs):
+    bump_availability_version(instance.doctor_id)
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+def refresh_appointment_rollups(sender, instance, **kwargs):
+    # Registered after the availability bump, which serializes the doctor's writers
+    buckets = [rollup_bucket(instance)]
+    if kwargs.get('signal') is post_save:
+        buckets.append(getattr(instance, '_loaded_rollup_bucket', (None, None)))
+        instance._loaded_rollup_bucket = rollup_bucket(instance)
+    refresh_daily_rollups(buckets)
+
+
+@receiver(pre_delete, sender=SlotHold)
+def expire_waitlist_offer(sender, instance, **kwargs):
+    # A waitlist offer whose hold disappears without a booking has lapsed
+    # (booking unlinks the hold first); cancelled entries keep their status
+    offers = WaitlistEntry.objects.filter(hold_id=instance.pk)
+    instance._lapsed_offer = offers.exists()
+    if instance._lapsed_offer:
+        offers.filter(status='offered').update(status='expired')
+
+
+@receiver(post_delete, sender=SlotHold)
+def promote_after_lapsed_offer(sender, instance, origin=None, **kwargs):
+    # The slot is free again once the hold row is gone; holds removed along
+    # with their doctor or patient have nothing left to offer
+    origin_model = getattr(origin, 'model', type(origin))
+    if getattr(instance, '_lapsed_offer', False) and origin_model is SlotHold:
+        promote_next(instance)
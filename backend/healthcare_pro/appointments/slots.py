@@ -0,0 +1,287 @@
+import calendar
+import heapq
+from collections import defaultdict
+from itertools import islice
+from datetime import date, timedelta
+
+from django.utils import timezone
+from decouple import config
+
+from .models import Appointment, AppointmentSlot
+from .occupancy import DayOccupancy, load_occupancy
+from doctors.schedule import DAY_ORDER, get_schedules
+
+
+def time_to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def get_slot_duration_minutes():
+    """Slot length used by the booking endpoints (never shorter than an hour)."""
+    slot_duration_setting = config('APPOINTMENT_SLOT_DURATION_MINUTES', default=60, cast=int)
+    try:
+        return max(int(slot_duration_setting), 60)
+    except (TypeError, ValueError):
+        return 60
+
+
+def iter_dates(start_date, end_date):
+    current = start_date
+    while current <= end_date:
+        yield current
+        current += timedelta(days=1)
+
+
+class SlotPlanner:
+    """
+    Computes bookable slots for one or more doctors over a date range.
+
+    All inputs (appointment occupancy, configured ``AppointmentSlot`` rows and
+    the doctors' compiled weekly schedules) are loaded up front in a fixed
+    number of queries, after which every day is generated with integer minute
+    arithmetic. A slot counts every active appointment whose duration overlaps it,
+    plus any unexpired hold not owned by ``holder_user_id``.
+    """
+
+    def __init__(self, doctors, start_date, end_date, now=None, holder_user_id=None):
+        self.doctors = list(doctors)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.slot_duration = get_slot_duration_minutes()
+
+        now_local = now or timezone.localtime()
+        self.today = now_local.date()
+        self.now_minutes = now_local.hour * 60 + now_local.minute
+
+        doctor_ids = [doctor.id for doctor in self.doctors]
+
+        self.occupancy = load_occupancy(doctor_ids, start_date, end_date, holder_user_id=holder_user_id)
+
+        self.configured_slots = defaultdict(list)
+        configured_rows = (
+            AppointmentSlot.objects
+            .filter(doctor_id__in=doctor_ids, date__range=[start_date, end_date])
+            .order_by('start_time')
+        )
+        for slot in configured_rows:
+            self.configured_slots[(slot.doctor_id, slot.date)].append(slot)
+
+        self.schedules = get_schedules(self.doctors)
+
+    def day_slots(self, doctor, day):
+        """Return the slot dictionaries for ``doctor`` on ``day``, sorted by time."""
+        day_of_week = DAY_ORDER[day.weekday()]
+        occupancy = self.occupancy.get((doctor.id, day)) or DayOccupancy()
+        configured_slots = self.configured_slots.get((doctor.id, day), [])
+        configured_map = {
+            time_to_minutes(slot.start_time): slot
+            for slot in configured_slots
+        }
+        cutoff = self.now_minutes if day == self.today else None
+        duration = self.slot_duration
+
+        slot_data = []
+        processed_keys = set()
+
+        def build_slot(slot_id, start, end, configured_slot, default_flag):
+            base_capacity = max((configured_slot.max_appointments if configured_slot else 1) or 1, 1)
+            slot_available_flag = bool(configured_slot.is_available) if configured_slot else default_flag
+
+            booked_count = occupancy.count_overlapping(start, end)
+            remaining_capacity = max(base_capacity - booked_count, 0)
+
+            is_future_slot = cutoff is None or start > cutoff
+            is_available = slot_available_flag and remaining_capacity > 0 and is_future_slot
+            label = format_minutes(start)
+
+            return {
+                'id': slot_id,
+                'time': label,
+                'start_time': label,
+                'end_time': format_minutes(end),
+                'status': 'available' if is_available else 'booked',
+                'is_available': is_available,
+                'is_fully_booked': remaining_capacity <= 0 or not is_future_slot,
+                'current_appointments': booked_count,
+                'max_appointments': base_capacity,
+                'remaining_capacity': remaining_capacity,
+            }
+
+        schedule = self.schedules[doctor.id]
+
+        for window_start, window_end, availability_id in schedule.availability_windows.get(day_of_week, []):
+            current_start = window_start
+
+            while current_start + duration <= window_end:
+                configured_slot = configured_map.get(current_start)
+                slot_id = (
+                    str(configured_slot.id) if configured_slot
+                    else f"availability-{availability_id}-{format_minutes(current_start).replace(':', '')}"
+                )
+                slot_data.append(build_slot(
+                    slot_id, current_start, current_start + duration, configured_slot, True
+                ))
+                processed_keys.add(current_start)
+                current_start += duration
+
+        for window_start, window_end in schedule.working_windows.get(day_of_week, []):
+            current_start = window_start
+
+            while current_start + duration <= window_end:
+                if current_start in processed_keys:
+                    current_start += duration
+                    continue
+
+                configured_slot = configured_map.get(current_start)
+                slot_id = (
+                    str(configured_slot.id) if configured_slot
+                    else f"working-{day_of_week}-{format_minutes(current_start).replace(':', '')}"
+                )
+                slot_data.append(build_slot(
+                    slot_id, current_start, current_start + duration,
+                    configured_slot, bool(doctor.is_available)
+                ))
+                processed_keys.add(current_start)
+                current_start += duration
+
+        for slot in configured_slots:
+            start = time_to_minutes(slot.start_time)
+            if start in processed_keys:
+                continue
+            slot_data.append(build_slot(
+                str(slot.id), start, time_to_minutes(slot.end_time), slot, bool(slot.is_available)
+            ))
+
+        slot_data.sort(key=lambda item: item['time'])
+        return slot_data
+
+    def range_slots(self, doctor):
+        """Return a compact per-day listing for ``doctor`` across the planner's range."""
+        days = []
+        for day in iter_dates(self.start_date, self.end_date):
+            slots = self.day_slots(doctor, day)
+            days.append({
+                'date': day.isoformat(),
+                'day_of_week': DAY_ORDER[day.weekday()],
+                'available_count': sum(1 for slot in slots if slot['is_available']),
+                'slots': slots,
+            })
+        return days
+
+    def iter_open_slots(self, doctor, time_from=None, time_to=None, weekdays=None):
+        """Yield ``(date, slot)`` for every bookable slot of ``doctor``, earliest first."""
+        for day in iter_dates(self.start_date, self.end_date):
+            if weekdays and DAY_ORDER[day.weekday()] not in weekdays:
+                continue
+            for slot in self.day_slots(doctor, day):
+                if not slot['is_available']:
+                    continue
+                if time_from and slot['time'] < time_from:
+                    continue
+                if time_to and slot['time'] >= time_to:
+                    continue
+                yield day, slot
+
+
+def first_available_slots(planner, limit, time_from=None, time_to=None, weekdays=None):
+    """
+    Return the ``limit`` earliest open slots across all of the planner's doctors.
+
+    Each doctor contributes a lazy, time-ordered stream; the streams are merged
+    with a heap so only the days needed to fill ``limit`` are ever generated.
+    """
+    def stream(index, doctor):
+        for sequence, (day, slot) in enumerate(
+            planner.iter_open_slots(doctor, time_from=time_from, time_to=time_to, weekdays=weekdays)
+        ):
+            yield day, slot['time'], index, sequence, doctor, slot
+
+    merged = heapq.merge(*(stream(index, doctor) for index, doctor in enumerate(planner.doctors)))
+    return [(day, doctor, slot) for day, _, _, _, doctor, slot in islice(merged, limit)]
+
+
+def weekly_slot_starts(doctor, schedule, duration):
+    """
+    Slot start minutes per weekday generated from a compiled schedule, using the
+    same availability-then-working-hours precedence as ``SlotPlanner.day_slots``.
+    """
+    starts = {}
+    for day_of_week in DAY_ORDER:
+        day_starts = set()
+        for window_start, window_end, _ in schedule.availability_windows.get(day_of_week, []):
+            current_start = window_start
+            while current_start + duration <= window_end:
+                day_starts.add(current_start)
+                current_start += duration
+        if doctor.is_available:
+            for window_start, window_end in schedule.working_windows.get(day_of_week, []):
+                current_start = window_start
+                while current_start + duration <= window_end:
+                    day_starts.add(current_start)
+                    current_start += duration
+        starts[day_of_week] = sorted(day_starts)
+    return starts
+
+
+def availability_calendar(doctor, year, month, now=None, holder_user_id=None):
+    """
+    Per-day ``total``/``booked``/``open`` slot counts for one calendar month.
+
+    Totals come from the doctor's compiled weekly schedule. A slot counts as
+    booked when any active appointment or unexpired hold (other than
+    ``holder_user_id``'s) overlaps it, using the same occupancy the slot
+    listing uses, loaded for the whole month in one query. Configured slot
+    capacities are not applied, so counts are an estimate for calendar
+    shading; ``get_available_slots`` remains authoritative for a given day.
+    """
+    now_local = now or timezone.localtime()
+    today = now_local.date()
+    now_minutes = now_local.hour * 60 + now_local.minute
+
+    month_start = date(year, month, 1)
+    month_end = date(year, month, calendar.monthrange(year, month)[1])
+
+    occupancy_by_day = load_occupancy([doctor.id], month_start, month_end, holder_user_id=holder_user_id)
+
+    duration = get_slot_duration_minutes()
+    schedule = get_schedules([doctor])[doctor.id]
+    starts = weekly_slot_starts(doctor, schedule, duration)
+
+    days = []
+    for day in iter_dates(month_start, month_end):
+        day_of_week = DAY_ORDER[day.weekday()]
+        day_starts = starts[day_of_week]
+        total = len(day_starts)
+        occupancy = occupancy_by_day.get((doctor.id, day)) or DayOccupancy()
+        free_starts = [start for start in day_starts if occupancy.is_free(start, duration)]
+        booked = total - len(free_starts)
+
+        if day < today:
+            open_count = 0
+        elif day == today:
+            open_count = sum(1 for start in free_starts if start > now_minutes)
+        else:
+            open_count = len(free_starts)
+
+        if total == 0:
+            day_status = 'unavailable'
+        elif day < today:
+            day_status = 'past'
+        elif open_count <= 0:
+            day_status = 'full'
+        else:
+            day_status = 'available'
+
+        days.append({
+            'date': day.isoformat(),
+            'day_of_week': day_of_week,
+            'total': total,
+            'booked': booked,
+            'open': max(open_count, 0),
+            'status': day_status,
+        })
+    return days
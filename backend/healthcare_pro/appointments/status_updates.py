@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, TextField, Value, When
+from django.utils import timezone
+
+from .models import ALLOWED_STATUS_TRANSITIONS, Appointment
+from .rollups import refresh_daily_rollups
+from .waitlist import promote_freed_slots
+from doctors.schedule import bump_availability_version
+from doctors.today_board import update_today_board
+from patients.summary import invalidate_patient_summaries
+
+DEFAULT_CANCELLATION_REASON = 'No reason provided'
+
+
+def apply_status_updates(doctor_id, updates):
+    """
+    Apply many status changes for one doctor in a single transaction.
+
+    ``updates`` is a list of dicts with ``appointment_id``, ``status`` and
+    optional ``doctor_notes``, ``cancellation_reason`` and ``version``. Every item is checked against
+    ``ALLOWED_STATUS_TRANSITIONS`` and the valid ones are written with one
+    UPDATE per (current status, new status) pair. Each UPDATE is guarded on the
+    status it was validated from. Cancellations record ``cancelled_at`` and a
+    reason, as a single cancel does. Slots freed by cancellations are offered to
+    the waitlist after the commit. Returns one result dict per item, in order.
+    """
+    now = timezone.now()
+    results = [{'appointment_id': str(item['appointment_id'])} for item in updates]
+
+    with transaction.atomic():
+        # Lock the doctor's bookings first so the rows read below stay current
+        bump_availability_version(doctor_id)
+        current = {
+            row['id']: row
+            for row in Appointment.objects.filter(
+                doctor_id=doctor_id,
+                id__in=[item['appointment_id'] for item in updates]
+            ).values('id', 'status', 'version', 'appointment_date', 'appointment_time', 'duration', 'patient_id')
+        }
+
+        groups = defaultdict(list)
+        seen = set()
+        for index, item in enumerate(updates):
+            appointment_id = item['appointment_id']
+            row = current.get(appointment_id)
+            if appointment_id in seen:
+                results[index]['error'] = 'Appointment listed more than once.'
+            elif row is None:
+                results[index]['error'] = 'Appointment not found.'
+            elif item.get('version') is not None and item['version'] != row['version']:
+                results[index]['error'] = 'Appointment was changed by someone else.'
+                results[index]['current_version'] = row['version']
+            elif item['status'] not in ALLOWED_STATUS_TRANSITIONS.get(row['status'], []):
+                results[index]['error'] = f"Cannot change status from {row['status']} to {item['status']}."
+            else:
+                groups[(row['status'], item['status'])].append(index)
+            seen.add(appointment_id)
+
+        for (from_status, to_status), indexes in groups.items():
+            ids = [updates[index]['appointment_id'] for index in indexes]
+            notes = [
+                When(id=updates[index]['appointment_id'], then=Value(updates[index]['doctor_notes']))
+                for index in indexes if updates[index].get('doctor_notes')
+            ]
+            changes = {'status': to_status, 'version': F('version') + 1, 'updated_at': now}
+            if notes:
+                changes['doctor_notes'] = Case(*notes, default=F('doctor_notes'), output_field=TextField())
+            if to_status == 'cancelled':
+                reasons = [
+                    When(id=updates[index]['appointment_id'], then=Value(updates[index]['cancellation_reason']))
+                    for index in indexes if updates[index].get('cancellation_reason')
+                ]
+                changes['cancelled_at'] = now
+                changes['cancellation_reason'] = Case(
+                    *reasons, default=Value(DEFAULT_CANCELLATION_REASON), output_field=TextField()
+                )
+            updated = Appointment.objects.filter(id__in=ids, status=from_status).update(**changes)
+
+            # A row changed by a concurrent writer was skipped by the status guard
+            after = {}
+            if updated != len(ids):
+                after = dict(Appointment.objects.filter(id__in=ids).values_list('id', 'version'))
+            for index in indexes:
+                appointment_id = updates[index]['appointment_id']
+                version = current[appointment_id]['version'] + 1
+                if after and after.get(appointment_id) != version:
+                    results[index]['error'] = 'Appointment was changed by someone else.'
+                    results[index]['current_version'] = after.get(appointment_id)
+                else:
+                    results[index].update(status=to_status, version=version)
+
+        refresh_daily_rollups(
+            (doctor_id, current[updates[index]['appointment_id']]['appointment_date'])
+            for indexes in groups.values() for index in indexes
+        )
+        invalidate_patient_summaries(
+            current[updates[index]['appointment_id']]['patient_id']
+            for indexes in groups.values() for index in indexes
+        )
+        update_today_board(doctor_id, {
+            result['appointment_id']: result['status']
+            for result in results if 'status' in result
+        })
+
+    freed = []
+    for index, result in enumerate(results):
+        if result.get('status') == 'cancelled':
+            row = current[updates[index]['appointment_id']]
+            freed.append((row['appointment_date'], row['appointment_time'], row['duration'], row['patient_id']))
+    promote_freed_slots(doctor_id, freed)
+
+    for result in results:
+        result['updated'] = 'error' not in result
+    return results
@@ -0,0 +1,157 @@
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class AppointmentVersionTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=self.doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        self.patient = PatientProfile.objects.create(user=self.patient_user)
+        self.appointment = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=timezone.localdate() + timedelta(days=3),
+            appointment_time=time(10, 0),
+            chief_complaint="Checkup",
+        )
+
+    def test_doctor_status_update_bumps_version(self):
+        self.client.force_authenticate(self.doctor_user)
+        url = reverse("update-appointment-status", args=[self.appointment.id])
+
+        response = self.client.patch(url, {"status": "completed", "version": 0}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["appointment"]["version"], 1)
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.status, "completed")
+        self.assertEqual(self.appointment.version, 1)
+
+    def test_stale_version_is_rejected_with_409(self):
+        # The doctor confirms first; the patient's cancel was based on version 0
+        self.client.force_authenticate(self.doctor_user)
+        self.client.patch(
+            reverse("update-appointment-status", args=[self.appointment.id]),
+            {"status": "confirmed", "doctor_notes": "See you soon"},
+            format="json",
+        )
+
+        self.client.force_authenticate(self.patient_user)
+        response = self.client.patch(
+            reverse("cancel-appointment", args=[self.appointment.id]),
+            {"cancellation_reason": "Busy", "version": 0},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["current_version"], 1)
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.status, "confirmed")
+        self.assertEqual(self.appointment.doctor_notes, "See you soon")
+
+    def test_destroy_with_stale_version_conflicts(self):
+        Appointment.objects.filter(pk=self.appointment.pk).update(version=3)
+        self.client.force_authenticate(self.patient_user)
+        url = reverse("appointment-detail", args=[self.appointment.id])
+
+        self.assertEqual(self.client.delete(f"{url}?version=2").status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.status, "cancelled")
+        self.assertEqual(self.appointment.version, 4)
+
+    def test_bulk_status_update_reports_each_item(self):
+        confirmed = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.appointment.appointment_date,
+            appointment_time=time(11, 0),
+            chief_complaint="Follow-up",
+            status="confirmed",
+        )
+        second = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.appointment.appointment_date,
+            appointment_time=time(12, 0),
+            chief_complaint="Follow-up",
+            status="confirmed",
+        )
+        self.client.force_authenticate(self.doctor_user)
+
+        # Includes the daily rollup refresh (one delete, one aggregate and one
+        # insert) and the patient summary version bump
+        with self.assertNumQueries(10):
+            response = self.client.patch(reverse("bulk-update-appointment-status"), {"updates": [
+                {"appointment_id": str(confirmed.id), "status": "no-show", "doctor_notes": "Did not attend"},
+                {"appointment_id": str(second.id), "status": "no_show"},
+                {"appointment_id": str(self.appointment.id), "status": "completed"},
+            ]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        results = response.data["results"]
+        self.assertTrue(results[0]["updated"])
+        self.assertEqual(results[0]["version"], 1)
+        self.assertFalse(results[2]["updated"])
+        self.assertIn("Cannot change status from scheduled to completed", results[2]["error"])
+
+        confirmed.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((confirmed.status, confirmed.doctor_notes), ("no_show", "Did not attend"))
+        self.assertEqual((second.status, second.doctor_notes), ("no_show", None))
+        self.appointment.refresh_from_db()
+        self.assertEqual(self.appointment.status, "scheduled")
+
+    def test_bulk_cancel_records_when_and_why(self):
+        second = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.appointment.appointment_date,
+            appointment_time=time(11, 0),
+            chief_complaint="Follow-up",
+        )
+        self.client.force_authenticate(self.doctor_user)
+        before = timezone.now()
+        response = self.client.patch(reverse("bulk-update-appointment-status"), {"updates": [
+            {"appointment_id": str(self.appointment.id), "status": "cancelled", "cancellation_reason": "Clinic closed"},
+            {"appointment_id": str(second.id), "status": "cancelled"},
+        ]}, format="json")
+
+        self.assertEqual(response.data["updated"], 2)
+        self.appointment.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(self.appointment.cancellation_reason, "Clinic closed")
+        self.assertEqual(second.cancellation_reason, "No reason provided")
+        self.assertGreaterEqual(self.appointment.cancelled_at, before)
+        self.assertEqual(second.cancelled_at, self.appointment.cancelled_at)
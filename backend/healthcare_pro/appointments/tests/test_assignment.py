@@ -0,0 +1,115 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.assignment import load_doctor_loads
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class DoctorAssignmentTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.tomorrow = date.today() + timedelta(days=1)
+
+        self.busy, self.idle = [
+            Doctor.objects.create(
+                user=User.objects.create_user(
+                    email=f"doc{index}@example.com",
+                    password="DocPass123",
+                    first_name="Doc",
+                    last_name=str(index),
+                    role="doctor",
+                ),
+                specialization="cardiology",
+                department="Cardiology",
+                license_number=f"LIC{index}",
+                years_of_experience=5,
+                qualification="MBBS",
+                working_days=[self.tomorrow.strftime('%A').lower()],
+                start_time=time(9, 0),
+                end_time=time(12, 0),
+            )
+            for index in range(2)
+        ]
+        for hour in (9, 11):
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=self.busy,
+                appointment_date=self.tomorrow,
+                appointment_time=time(hour, 0),
+                chief_complaint="Checkup",
+            )
+        self.client.force_authenticate(user=patient_user)
+
+    def _schedule(self, preferred_time, **extra):
+        payload = {
+            "department": "Cardiology",
+            "appointment_date": self.tomorrow.isoformat(),
+            "preferred_time": preferred_time,
+            "appointment_type": "consultation",
+            "reason": "Checkup",
+        }
+        payload.update(extra)
+        return self.client.post(reverse("schedule-appointment"), payload, format="json")
+
+    def _assigned_doctor(self, response):
+        return Appointment.objects.get(id=response.data["id"]).doctor
+
+    def test_least_loaded_spreads_bookings(self):
+        response = self._schedule("10:00")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._assigned_doctor(response), self.idle)
+
+    def test_skips_doctors_outside_their_hours(self):
+        response = self._schedule("13:00")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data["alternative_slots"])
+
+    def test_soonest_free_moves_to_next_open_time(self):
+        for doctor in (self.busy, self.idle):
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=doctor,
+                appointment_date=self.tomorrow,
+                appointment_time=time(10, 0),
+                chief_complaint="Checkup",
+            )
+
+        self.assertEqual(self._schedule("10:00").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._schedule("10:00", assignment_policy="soonest_free")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["appointment"]["time"], "11:00:00")
+        self.assertEqual(self._assigned_doctor(response), self.idle)
+
+    def test_round_robin_only_looks_at_recent_bookings(self):
+        old_day = self.tomorrow + timedelta(days=14)
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.idle,
+            appointment_date=old_day,
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+        )
+        Appointment.objects.filter(doctor=self.busy).update(created_at=timezone.now() - timedelta(days=60))
+
+        loads = load_doctor_loads([self.busy.id, self.idle.id], self.tomorrow)
+        self.assertEqual(loads[self.busy.id]["day_load"], 2)
+        self.assertIsNone(loads[self.busy.id]["last_assigned"])
+        self.assertIsNotNone(loads[self.idle.id]["last_assigned"])
+
+        response = self._schedule("10:00", assignment_policy="round_robin")
+        self.assertEqual(self._assigned_doctor(response), self.busy)
@@ -0,0 +1,133 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment, SlotHold
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class AvailabilityCalendarAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+            working_days=["monday", "tuesday", "wednesday", "thursday", "friday"],
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+        )
+        self.client.force_authenticate(user=patient_user)
+        self.url = reverse("availability-calendar")
+
+        # First weekday of next month, so every day checked is in the future
+        today = date.today()
+        next_month = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+        self.weekday = next_month
+        while self.weekday.weekday() >= 5:
+            self.weekday += timedelta(days=1)
+        self.month = next_month.strftime("%Y-%m")
+
+    def test_counts_per_day(self):
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.weekday,
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+        )
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"doctor_id": str(self.doctor.id), "month": self.month})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        days = {day["date"]: day for day in response.data["days"]}
+        booked_day = days[self.weekday.isoformat()]
+        self.assertEqual((booked_day["total"], booked_day["booked"], booked_day["open"]), (2, 1, 1))
+        self.assertEqual(booked_day["status"], "available")
+
+        weekend = [day for day in response.data["days"] if day["day_of_week"] in ("saturday", "sunday")]
+        self.assertTrue(all(day["status"] == "unavailable" for day in weekend))
+
+    def test_full_day(self):
+        for hour in (9, 10):
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=self.doctor,
+                appointment_date=self.weekday,
+                appointment_time=time(hour, 0),
+                chief_complaint="Checkup",
+            )
+
+        response = self.client.get(self.url, {"doctor_id": str(self.doctor.id), "month": self.month})
+
+        day = next(day for day in response.data["days"] if day["date"] == self.weekday.isoformat())
+        self.assertEqual(day["open"], 0)
+        self.assertEqual(day["status"], "full")
+
+    def test_invalid_month(self):
+        response = self.client.get(self.url, {"doctor_id": str(self.doctor.id), "month": "2025-13"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_long_visits_and_holds_fill_slots(self):
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.weekday,
+            appointment_time=time(9, 0),
+            duration=120,
+            chief_complaint="Procedure",
+        )
+        other_user = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="PatPass123",
+            first_name="Other",
+            last_name="Patient",
+            role="patient",
+        )
+        held_day = self.weekday + timedelta(days=1)
+        while held_day.weekday() >= 5:
+            held_day += timedelta(days=1)
+        for hour in (9, 10):
+            SlotHold.objects.create(
+                patient=PatientProfile.objects.get_or_create(user=other_user)[0],
+                doctor=self.doctor,
+                appointment_date=held_day,
+                appointment_time=time(hour, 0),
+                duration=60,
+                expires_at=timezone.now() + timedelta(minutes=10),
+            )
+
+        response = self.client.get(self.url, {"doctor_id": str(self.doctor.id), "month": self.month})
+
+        days = {day["date"]: day for day in response.data["days"]}
+        for day in (self.weekday, held_day):
+            self.assertEqual((days[day.isoformat()]["booked"], days[day.isoformat()]["open"]), (2, 0))
+            self.assertEqual(days[day.isoformat()]["status"], "full")
+
+    def test_invalid_doctor_id(self):
+        response = self.client.get(self.url, {"doctor_id": "not-a-uuid", "month": self.month})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
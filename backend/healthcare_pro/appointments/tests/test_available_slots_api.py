@@ -6,7 +6,8 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from doctors.models import Doctor, Availability
-from appointments.models import AppointmentSlot
+from appointments.models import Appointment, AppointmentSlot
+from patients.models import PatientProfile
 
 
 class AvailableSlotsAPITestCase(APITestCase):
@@ -118,3 +119,185 @@ class AvailableSlotsAPITestCase(APITestCase):
         times = {slot["time"] for slot in slots}
         self.assertIn("08:00", times)
         self.assertIn("09:00", times)
+
+    def test_range_mode_matches_single_date_results(self):
+        target_day = self.target_date.strftime('%A').lower()
+        self.doctor.working_days = [target_day]
+        self.doctor.start_time = time(8, 0)
+        self.doctor.end_time = time(12, 0)
+        self.doctor.save(update_fields=["working_days", "start_time", "end_time"])
+        Availability.objects.create(
+            doctor=self.doctor,
+            day_of_week=(self.target_date + timedelta(days=1)).strftime('%A'),
+            start_time=time(14, 0),
+            end_time=time(16, 0),
+            is_available=True,
+        )
+        AppointmentSlot.objects.create(
+            doctor=self.doctor,
+            date=self.target_date,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            is_available=True,
+            max_appointments=3,
+        )
+        end_date = self.target_date + timedelta(days=6)
+
+        with self.assertNumQueries(6):
+            response = self.client.get(
+                self.url,
+                {
+                    "doctor_id": str(self.doctor.id),
+                    "start_date": self.target_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        days = response.data["days"]
+        self.assertEqual(len(days), 7)
+        for day in days:
+            single = self.client.get(
+                self.url,
+                {"doctor_id": str(self.doctor.id), "date": day["date"]},
+            )
+            self.assertEqual(day["slots"], single.data["available_slots"])
+            self.assertEqual(day["day_of_week"], single.data["day_of_week"])
+        self.assertEqual(days[0]["available_count"], 4)
+
+    def test_range_mode_rejects_oversized_range(self):
+        response = self.client.get(
+            self.url,
+            {
+                "doctor_id": str(self.doctor.id),
+                "start_date": self.target_date.isoformat(),
+                "end_date": (self.target_date + timedelta(days=90)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+    def test_conditional_get_returns_not_modified_until_booking(self):
+        Availability.objects.create(
+            doctor=self.doctor,
+            day_of_week=self.target_date.strftime('%A'),
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+        )
+        params = {"doctor_id": str(self.doctor.id), "date": self.target_date.isoformat()}
+        response = self.client.get(self.url, params)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(2):
+            cached = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        patient_user = get_user_model().objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        Appointment.objects.create(
+            patient=PatientProfile.objects.create(user=patient_user),
+            doctor=self.doctor,
+            appointment_date=self.target_date,
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+        )
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class AppointmentSlotCapacityTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123",
+            first_name="Admin",
+            last_name="User",
+            role="admin",
+        )
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        patient = PatientProfile.objects.create(user=patient_user)
+        self.start_date = date.today() + timedelta(days=1)
+        for offset in range(30):
+            AppointmentSlot.objects.create(
+                doctor=self.doctor,
+                date=self.start_date + timedelta(days=offset),
+                start_time=time(9, 0),
+                end_time=time(10, 0),
+                max_appointments=1,
+            )
+        Appointment.objects.create(
+            patient=patient,
+            doctor=self.doctor,
+            appointment_date=self.start_date,
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_open_slot_listing_uses_constant_queries(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("legacy-available-slots"),
+                {
+                    "doctor_id": str(self.doctor.id),
+                    "start_date": self.start_date.isoformat(),
+                    "end_date": (self.start_date + timedelta(days=29)).isoformat(),
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slots = response.data["available_slots"]
+        self.assertEqual(len(slots), 29)
+        self.assertNotIn(self.start_date.isoformat(), {slot["date"] for slot in slots})
+        self.assertTrue(all(slot["current_appointments"] == 0 for slot in slots))
+
+    def test_with_capacity_annotation(self):
+        slot = AppointmentSlot.objects.with_capacity().get(doctor=self.doctor, date=self.start_date)
+        self.assertEqual(slot.booked_count, 1)
+        self.assertEqual(slot.remaining_capacity, 0)
+        self.assertTrue(slot.is_fully_booked)
+
+    def test_with_capacity_counts_overlapping_appointments(self):
+        day = self.start_date + timedelta(days=1)
+        for start, end in [(time(10, 0), time(11, 0)), (time(11, 0), time(12, 0))]:
+            AppointmentSlot.objects.create(doctor=self.doctor, date=day, start_time=start, end_time=end)
+        Appointment.objects.create(
+            patient=PatientProfile.objects.get(),
+            doctor=self.doctor,
+            appointment_date=day,
+            appointment_time=time(8, 30),
+            duration=90,
+            chief_complaint="Procedure",
+        )
+
+        slots = AppointmentSlot.objects.with_capacity().filter(doctor=self.doctor, date=day).order_by("start_time")
+        # 08:30-10:00 ends as the 10:00 slot starts, but fills the 09:00 slot
+        self.assertEqual([slot.booked_count for slot in slots], [1, 0, 0])
@@ -0,0 +1,135 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+class DoctorLeaveAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123",
+            first_name="Admin",
+            last_name="User",
+            role="admin",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+
+        self.leave_start = date.today() + timedelta(days=7)
+        self.leave_end = self.leave_start + timedelta(days=2)
+        # The doctor only works one hour, on the second day after the leave
+        self.doctor_day = self.leave_end + timedelta(days=2)
+        self.doctor = self._doctor("doc", [self.doctor_day.strftime("%A").lower()], time(9, 0), time(10, 0))
+        self.colleague = self._doctor("colleague", DAYS, time(9, 0), time(17, 0))
+
+        self.appointments = [
+            Appointment.objects.create(
+                patient=self.patient,
+                doctor=self.doctor,
+                appointment_date=self.leave_start + timedelta(days=offset),
+                appointment_time=time(9, 0),
+                chief_complaint="Checkup",
+            )
+            for offset in range(2)
+        ]
+        self.client.force_authenticate(self.admin_user)
+
+    def _doctor(self, name, working_days, start_time, end_time):
+        user = get_user_model().objects.create_user(
+            email=f"{name}@example.com",
+            password="DocPass123",
+            first_name=name.title(),
+            last_name="Doctor",
+            role="doctor",
+        )
+        return Doctor.objects.create(
+            user=user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number=f"LIC-{name}",
+            years_of_experience=10,
+            qualification="MBBS",
+            working_days=working_days,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+    def _leave(self, **extra):
+        payload = {
+            "doctor_id": str(self.doctor.id),
+            "start_date": self.leave_start.isoformat(),
+            "end_date": self.leave_end.isoformat(),
+            "search_weeks": 1,
+        }
+        payload.update(extra)
+        return self.client.post(reverse("doctor-leave-reschedule"), payload, format="json")
+
+    def test_dry_run_previews_without_changes(self):
+        response = self._leave(dry_run=True)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["moved_count"], 2)
+        self.assertFalse(Appointment.objects.filter(status="rescheduled").exists())
+
+    def test_moves_to_own_doctor_first_then_colleague(self):
+        response = self._leave(reason="Conference")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["moved_count"], response.data["unplaced_count"]), (2, 0))
+
+        first, second = [Appointment.objects.get(id=appointment.id) for appointment in self.appointments]
+        self.assertEqual(
+            (first.doctor_id, first.appointment_date, first.appointment_time),
+            (self.doctor.id, self.doctor_day, time(9, 0)),
+        )
+        self.assertEqual(
+            (second.doctor_id, second.appointment_date, second.appointment_time),
+            (self.colleague.id, self.leave_end + timedelta(days=1), time(9, 0)),
+        )
+        self.assertEqual((second.status, second.reschedule_reason, second.version), ("rescheduled", "Conference", 1))
+
+    def test_moved_appointments_take_the_new_doctors_fee_and_lock(self):
+        Doctor.objects.filter(id=self.doctor.id).update(consultation_fee=Decimal("80.00"))
+        Doctor.objects.filter(id=self.colleague.id).update(consultation_fee=Decimal("120.00"))
+        Appointment.objects.update(consultation_fee=Decimal("80.00"))
+        version = Doctor.objects.get(id=self.colleague.id).availability_version
+
+        self._leave()
+
+        first, second = [Appointment.objects.get(id=appointment.id) for appointment in self.appointments]
+        self.assertEqual((first.consultation_fee, second.consultation_fee), (Decimal("80.00"), Decimal("120.00")))
+        self.assertGreater(Doctor.objects.get(id=self.colleague.id).availability_version, version)
+
+    def test_started_appointments_stay_put(self):
+        yesterday = Appointment(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=date.today() - timedelta(days=1),
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+            status="confirmed",
+        )
+        yesterday.save(validate=False)
+
+        response = self._leave(start_date=yesterday.appointment_date.isoformat())
+
+        self.assertEqual(response.data["moved_count"], 2)
+        yesterday.refresh_from_db()
+        self.assertEqual((yesterday.status, yesterday.appointment_date), ("confirmed", date.today() - timedelta(days=1)))
@@ -0,0 +1,88 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class FirstAvailableAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.tomorrow = date.today() + timedelta(days=1)
+        tomorrow_name = self.tomorrow.strftime('%A').lower()
+
+        self.doctors = []
+        for index, start_hour in enumerate([9, 10]):
+            user = User.objects.create_user(
+                email=f"doc{index}@example.com",
+                password="DocPass123",
+                first_name="Doc",
+                last_name=str(index),
+                role="doctor",
+            )
+            self.doctors.append(Doctor.objects.create(
+                user=user,
+                specialization="cardiology",
+                department="Cardiology",
+                license_number=f"LIC{index}",
+                years_of_experience=5,
+                qualification="MBBS",
+                working_days=[tomorrow_name],
+                start_time=time(start_hour, 0),
+                end_time=time(12, 0),
+            ))
+
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctors[0],
+            appointment_date=self.tomorrow,
+            appointment_time=time(9, 0),
+            duration=60,
+            chief_complaint="Checkup",
+        )
+        self.client.force_authenticate(user=patient_user)
+        self.url = reverse("first-available-appointments")
+
+    def test_merges_doctors_in_time_order(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {"specialization": "cardiology", "limit": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slots = response.data["slots"]
+        self.assertEqual(len(slots), 3)
+        self.assertEqual(
+            [(slot["date"], slot["time"]) for slot in slots],
+            [(self.tomorrow.isoformat(), "10:00")] * 2 + [(self.tomorrow.isoformat(), "11:00")],
+        )
+        self.assertEqual(response.data["doctors_considered"], 2)
+
+    def test_time_window_filter(self):
+        response = self.client.get(
+            self.url,
+            {"specialization": "cardiology", "time_from": "11:00", "limit": 10, "days": 2},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({slot["time"] for slot in response.data["slots"]}, {"11:00"})
+        self.assertEqual(len(response.data["slots"]), 2)
+
+    def test_requires_specialization(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_invalid_hospital_id(self):
+        response = self.client.get(self.url, {"specialization": "cardiology", "hospital_id": "not-a-uuid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from appointments.models import Appointment
+from appointments.no_shows import sweep_no_shows
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class NoShowSweepTestCase(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.now = timezone.make_aware(datetime(2026, 3, 10, 12, 0))
+
+    def make(self, day, start, status="scheduled"):
+        appointment = Appointment(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=day,
+            appointment_time=start,
+            chief_complaint="Checkup",
+            status=status,
+        )
+        appointment.save(validate=False)
+        return appointment
+
+    def test_sweeps_in_resumable_batches(self):
+        today = self.now.date()
+        stale = [
+            self.make(today - timedelta(days=30), time(9, 0)),
+            self.make(today - timedelta(days=2), time(9, 0), status="confirmed"),
+            self.make(today - timedelta(days=2), time(10, 0)),
+        ]
+        completed = self.make(today - timedelta(days=5), time(9, 0), status="completed")
+        within_grace = self.make(today - timedelta(days=1), time(15, 0))
+
+        first = sweep_no_shows(batch_size=2, max_batches=1, now=self.now)
+        self.assertEqual((first["batches"], first["marked"]), (1, 2))
+        self.assertIsNotNone(first["cursor"])
+
+        rest = sweep_no_shows(batch_size=2, cursor=first["cursor"], now=self.now)
+        self.assertEqual((rest["batches"], rest["marked"], rest["cursor"]), (1, 1, None))
+
+        for appointment in stale:
+            appointment.refresh_from_db()
+            self.assertEqual((appointment.status, appointment.version), ("no_show", 1))
+        completed.refresh_from_db()
+        within_grace.refresh_from_db()
+        self.assertEqual(completed.status, "completed")
+        self.assertEqual(within_grace.status, "scheduled")
@@ -0,0 +1,133 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from appointments.occupancy import DayOccupancy
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class DayOccupancyTestCase(SimpleTestCase):
+    def test_duration_blocks_following_minutes(self):
+        occupancy = DayOccupancy()
+        occupancy.add(10 * 60, 90)
+
+        self.assertFalse(occupancy.is_free(10 * 60 + 30, 30))
+        self.assertFalse(occupancy.is_free(9 * 60 + 45, 30))
+        self.assertTrue(occupancy.is_free(11 * 60 + 30, 30))
+        self.assertTrue(occupancy.is_free(9 * 60, 60))
+
+    def test_count_overlapping(self):
+        occupancy = DayOccupancy()
+        occupancy.add(9 * 60, 30)
+        occupancy.add(9 * 60 + 30, 30)
+        occupancy.add(8 * 60, 240)
+
+        self.assertEqual(occupancy.count_overlapping(9 * 60, 10 * 60), 3)
+        self.assertEqual(occupancy.count_overlapping(11 * 60, 12 * 60), 1)
+        self.assertEqual(occupancy.count_overlapping(12 * 60, 13 * 60), 0)
+
+
+class OverlapBookingTestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.admin_user = User.objects.create_user(
+            email="admin@example.com",
+            password="AdminPass123",
+            first_name="Admin",
+            last_name="User",
+            role="admin",
+        )
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.target_date = date.today() + timedelta(days=1)
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.target_date,
+            appointment_time=time(10, 0),
+            duration=90,
+            chief_complaint="Procedure",
+        )
+        self.client.force_authenticate(user=self.admin_user)
+
+    def _schedule(self, preferred_time):
+        return self.client.post(
+            reverse("schedule-appointment"),
+            {
+                "patient_id": self.patient.id,
+                "doctor_id": str(self.doctor.id),
+                "department": "Cardiology",
+                "appointment_date": self.target_date.isoformat(),
+                "preferred_time": preferred_time,
+                "appointment_type": "consultation",
+                "reason": "Checkup",
+            },
+            format="json",
+        )
+
+    def test_long_appointment_blocks_overlapping_start(self):
+        self.doctor.working_days = [self.target_date.strftime('%A').lower()]
+        self.doctor.start_time = time(9, 0)
+        self.doctor.end_time = time(13, 0)
+        self.doctor.save()
+
+        response = self._schedule("10:30")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [slot["time"] for slot in response.data["alternative_slots"]],
+            ["09:00", "12:00"],
+        )
+
+    def test_cancelled_appointment_frees_its_start_time(self):
+        Appointment.objects.update(status="cancelled")
+        response = self._schedule("10:00")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data["confirmation_code"].startswith("APT-"))
+
+    def test_booking_after_long_appointment_succeeds(self):
+        response = self._schedule("11:30")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_slot_listing_counts_overlapping_appointment(self):
+        self.doctor.working_days = [self.target_date.strftime('%A').lower()]
+        self.doctor.start_time = time(9, 0)
+        self.doctor.end_time = time(13, 0)
+        self.doctor.save(update_fields=["working_days", "start_time", "end_time"])
+
+        response = self.client.get(
+            reverse("get-available-slots"),
+            {"doctor_id": str(self.doctor.id), "date": self.target_date.isoformat()},
+        )
+
+        slots = {slot["time"]: slot for slot in response.data["available_slots"]}
+        self.assertTrue(slots["09:00"]["is_available"])
+        self.assertFalse(slots["10:00"]["is_available"])
+        self.assertFalse(slots["11:00"]["is_available"])
+        self.assertTrue(slots["12:00"]["is_available"])
@@ -0,0 +1,101 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from appointments.concurrency import compare_and_set
+from appointments.models import Appointment, AppointmentDailyRollup
+from appointments.no_shows import sweep_no_shows
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class DailyRollupTestCase(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+            consultation_fee=Decimal("500.00"),
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.day = date.today() + timedelta(days=3)
+
+    def make(self, day, start, status="scheduled"):
+        appointment = Appointment(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=day,
+            appointment_time=start,
+            chief_complaint="Checkup",
+            status=status,
+        )
+        appointment.save(validate=False)
+        return appointment
+
+    def rollups(self):
+        return sorted(
+            AppointmentDailyRollup.objects.values_list("date", "status", "appointment_count", "fee_total")
+        )
+
+    def test_writes_keep_rollups_in_step(self):
+        first = self.make(self.day, time(9, 0))
+        self.make(self.day, time(10, 0))
+        self.assertEqual(self.rollups(), [(self.day, "scheduled", 2, Decimal("1000.00"))])
+
+        # A compare-and-set move updates both the old and the new day
+        later = self.day + timedelta(days=1)
+        compare_and_set(first, first.version, appointment_date=later, status="rescheduled")
+        self.assertEqual(self.rollups(), [
+            (self.day, "scheduled", 1, Decimal("500.00")),
+            (later, "rescheduled", 1, Decimal("500.00")),
+        ])
+
+        # Loaded, moved back and saved: the day it was loaded on is refreshed too
+        first = Appointment.objects.get(pk=first.pk)
+        first.appointment_date = self.day
+        first.save(validate=False)
+        self.assertEqual(self.rollups(), [
+            (self.day, "rescheduled", 1, Decimal("500.00")),
+            (self.day, "scheduled", 1, Decimal("500.00")),
+        ])
+
+        first.delete()
+        self.assertEqual(self.rollups(), [(self.day, "scheduled", 1, Decimal("500.00"))])
+
+    def test_bulk_sweep_and_rebuild(self):
+        past = date.today() - timedelta(days=5)
+        self.make(past, time(9, 0))
+        self.make(past, time(10, 0), status="completed")
+        sweep_no_shows()
+        expected = [
+            (past, "completed", 1, Decimal("500.00")),
+            (past, "no_show", 1, Decimal("500.00")),
+        ]
+        self.assertEqual(self.rollups(), expected)
+
+        AppointmentDailyRollup.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_appointment_rollups", start=past.isoformat(), end=past.isoformat(), stdout=out)
+        self.assertIn("Rebuilt 1 days", out.getvalue())
+        self.assertEqual(self.rollups(), expected)
@@ -0,0 +1,114 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class AppointmentSeriesAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.patient = PatientProfile.objects.create(user=patient_user)
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+            working_days=["tuesday"],
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        )
+        self.client.force_authenticate(user=patient_user)
+        self.start = date.today() + timedelta(days=1)
+        self.first_tuesday = self.start + timedelta(days=(1 - self.start.weekday()) % 7)
+
+    def _book(self, **extra):
+        payload = {
+            "doctor_id": str(self.doctor.id),
+            "start_date": self.start.isoformat(),
+            "weekday": "tuesday",
+            "preferred_time": "10:00",
+            "occurrences": 4,
+            "appointment_type": "therapy",
+            "reason": "Weekly therapy",
+        }
+        payload.update(extra)
+        return self.client.post(reverse("book-appointment-series"), payload, format="json")
+
+    def test_malformed_doctor_id_is_not_found(self):
+        self.assertEqual(self._book(doctor_id="not-a-uuid").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_books_every_occurrence(self):
+        response = self._book()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        series = Appointment.objects.filter(series_id=response.data["series_id"])
+        self.assertEqual(
+            sorted(series.values_list("appointment_date", flat=True)),
+            [self.first_tuesday + timedelta(weeks=index) for index in range(4)],
+        )
+        self.assertEqual(len({appointment.confirmation_code for appointment in series}), 4)
+
+    def test_conflicting_occurrence_is_reported_with_alternatives(self):
+        Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=self.first_tuesday + timedelta(weeks=2),
+            appointment_time=time(10, 0),
+            chief_complaint="Existing",
+        )
+
+        response = self._book()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Appointment.objects.count(), 1)
+        conflict = response.data["conflicts"][0]
+        self.assertEqual(conflict["date"], (self.first_tuesday + timedelta(weeks=2)).isoformat())
+        self.assertEqual([slot["time"] for slot in conflict["alternative_slots"]], ["09:00", "11:00"])
+
+        response = self._book(allow_partial=True)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["appointments"]), 3)
+
+    def test_series_cancel_and_reschedule(self):
+        series_id = self._book().data["series_id"]
+
+        response = self.client.patch(
+            reverse("reschedule-appointment-series", args=[series_id]),
+            {"new_time": "11:00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rescheduled_count"], 4)
+        self.assertEqual(
+            set(Appointment.objects.filter(series_id=series_id).values_list("appointment_time", flat=True)),
+            {time(11, 0)},
+        )
+        self.assertEqual(set(Appointment.objects.filter(series_id=series_id).values_list("version", flat=True)), {1})
+
+        response = self.client.patch(reverse("cancel-appointment-series", args=[series_id]), {}, format="json")
+        self.assertEqual(response.data["cancelled_count"], 4)
+        self.assertFalse(
+            Appointment.objects.filter(series_id=series_id).exclude(status="cancelled").exists()
+        )
+        self.assertEqual(set(Appointment.objects.filter(series_id=series_id).values_list("version", flat=True)), {2})
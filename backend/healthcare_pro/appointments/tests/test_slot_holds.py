@@ -0,0 +1,110 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment, SlotHold
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class SlotHoldAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.patients = []
+        for index in range(2):
+            user = User.objects.create_user(
+                email=f"pat{index}@example.com",
+                password="PatPass123",
+                first_name="Pat",
+                last_name=str(index),
+                role="patient",
+            )
+            self.patients.append(PatientProfile.objects.create(user=user))
+
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.tomorrow = date.today() + timedelta(days=1)
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+            working_days=[self.tomorrow.strftime('%A').lower()],
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+        )
+
+    def _hold(self, patient, preferred_time="10:00"):
+        self.client.force_authenticate(user=patient.user)
+        return self.client.post(
+            reverse("create-slot-hold"),
+            {
+                "doctor_id": str(self.doctor.id),
+                "appointment_date": self.tomorrow.isoformat(),
+                "preferred_time": preferred_time,
+            },
+            format="json",
+        )
+
+    def _slot_status(self, patient, label):
+        self.client.force_authenticate(user=patient.user)
+        response = self.client.get(
+            reverse("get-available-slots"),
+            {"doctor_id": str(self.doctor.id), "date": self.tomorrow.isoformat()},
+        )
+        return next(slot["status"] for slot in response.data["available_slots"] if slot["time"] == label)
+
+    def test_hold_blocks_other_patients_and_converts_to_appointment(self):
+        response = self._hold(self.patients[0])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hold_id = response.data["id"]
+
+        self.assertEqual(self._slot_status(self.patients[0], "10:00"), "available")
+        self.assertEqual(self._slot_status(self.patients[1], "10:00"), "booked")
+        self.assertEqual(self._hold(self.patients[1]).status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.patients[0].user)
+        response = self.client.post(
+            reverse("schedule-appointment"),
+            {"hold_id": hold_id, "appointment_type": "consultation", "reason": "Checkup"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SlotHold.objects.exists())
+        appointment = Appointment.objects.get()
+        self.assertEqual((appointment.patient, appointment.appointment_time), (self.patients[0], time(10, 0)))
+
+    def test_expired_hold_is_ignored_and_swept(self):
+        self.assertEqual(self._hold(self.patients[0]).status_code, status.HTTP_201_CREATED)
+        SlotHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(self._slot_status(self.patients[1], "10:00"), "available")
+        self.assertFalse(SlotHold.objects.exists())
+        self.assertEqual(self._hold(self.patients[1]).status_code, status.HTTP_201_CREATED)
+
+    def test_malformed_ids_are_client_errors(self):
+        self.client.force_authenticate(user=self.patients[0].user)
+        response = self.client.post(
+            reverse("create-slot-hold"),
+            {"doctor_id": "not-a-uuid", "appointment_date": self.tomorrow.isoformat(), "preferred_time": "10:00"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.post(
+            reverse("schedule-appointment"),
+            {"hold_id": "not-a-uuid", "appointment_type": "consultation", "reason": "Checkup"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,179 @@
+import uuid
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.booking import cancel_series
+from appointments.holds import create_hold
+from appointments.models import Appointment, SlotHold, WaitlistEntry
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class WaitlistAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.patients = []
+        for index in range(3):
+            user = User.objects.create_user(
+                email=f"pat{index}@example.com",
+                password="PatPass123",
+                first_name="Pat",
+                last_name=str(index),
+                role="patient",
+            )
+            self.patients.append(PatientProfile.objects.create(user=user))
+
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.day = date.today() + timedelta(days=3)
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        self.appointment = Appointment.objects.create(
+            patient=self.patients[0],
+            doctor=self.doctor,
+            appointment_date=self.day,
+            appointment_time=time(10, 0),
+            chief_complaint="Checkup",
+        )
+
+    def _join(self, patient, **extra):
+        self.client.force_authenticate(user=patient.user)
+        payload = {
+            "earliest_date": date.today().isoformat(),
+            "latest_date": (self.day + timedelta(days=1)).isoformat(),
+        }
+        payload.update(extra)
+        response = self.client.post(reverse("waitlist"), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def _cancel(self):
+        self.client.force_authenticate(user=self.patients[0].user)
+        response = self.client.patch(reverse("cancel-appointment", args=[self.appointment.id]), {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cancellation_offers_hold_to_first_matching_entry(self):
+        # Time window that excludes 10:00 is skipped; the specialization entry matches
+        self._join(self.patients[1], doctor_id=str(self.doctor.id), earliest_time="13:00")
+        entry_id = self._join(self.patients[2], specialization="cardiology", earliest_time="09:00", latest_time="11:00")
+
+        self._cancel()
+
+        entry = WaitlistEntry.objects.get(id=entry_id)
+        self.assertEqual(entry.status, "offered")
+        self.assertEqual((entry.hold.patient, entry.hold.appointment_time), (self.patients[2], time(10, 0)))
+        self.assertGreater(entry.hold.expires_at, timezone.now() + timedelta(minutes=10))
+
+        self.client.force_authenticate(user=self.patients[2].user)
+        response = self.client.post(
+            reverse("schedule-appointment"),
+            {"hold_id": str(entry.hold_id), "appointment_type": "consultation", "reason": "Earlier please"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, str(entry.appointment_id)), ("booked", str(response.data["appointment"]["id"])))
+
+    def test_declined_offer_passes_to_next_patient_and_auto_books(self):
+        first = self._join(self.patients[1], doctor_id=str(self.doctor.id))
+        second = self._join(self.patients[2], doctor_id=str(self.doctor.id), auto_book=True, reason="Any slot")
+
+        self._cancel()
+        self.client.force_authenticate(user=self.patients[1].user)
+        response = self.client.delete(reverse("leave-waitlist", args=[first]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertEqual(WaitlistEntry.objects.get(id=first).status, "cancelled")
+        entry = WaitlistEntry.objects.select_related("appointment").get(id=second)
+        self.assertEqual(entry.status, "booked")
+        self.assertEqual(
+            (entry.appointment.patient, entry.appointment.appointment_time, entry.appointment.reason),
+            (self.patients[2], time(10, 0), "Any slot"),
+        )
+        self.assertFalse(SlotHold.objects.exists())
+
+    def test_offer_keeps_the_patients_other_hold(self):
+        own_hold = create_hold(self.patients[1], self.doctor, self.day, time(14, 0))
+        entry_id = self._join(self.patients[1], doctor_id=str(self.doctor.id))
+
+        self._cancel()
+
+        entry = WaitlistEntry.objects.get(id=entry_id)
+        self.assertEqual(entry.status, "offered")
+        self.assertTrue(SlotHold.objects.filter(id=own_hold.id).exists())
+
+        # A new hold replaces the patient's own hold but not the offer
+        create_hold(self.patients[1], self.doctor, self.day, time(15, 0))
+        self.assertFalse(SlotHold.objects.filter(id=own_hold.id).exists())
+        self.assertTrue(SlotHold.objects.filter(id=entry.hold_id).exists())
+
+    def test_bulk_and_series_cancellations_promote(self):
+        bulk_entry = self._join(self.patients[1], doctor_id=str(self.doctor.id))
+        self.client.force_authenticate(user=self.doctor.user)
+        response = self.client.patch(reverse("bulk-update-appointment-status"), {"updates": [
+            {"appointment_id": str(self.appointment.id), "status": "cancelled"},
+        ]}, format="json")
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(WaitlistEntry.objects.get(id=bulk_entry).status, "offered")
+
+        series_entry = self._join(self.patients[2], doctor_id=str(self.doctor.id), auto_book=True)
+        series_id = uuid.uuid4()
+        Appointment.objects.create(
+            patient=self.patients[0],
+            doctor=self.doctor,
+            appointment_date=self.day,
+            appointment_time=time(11, 0),
+            chief_complaint="Checkup",
+            series_id=series_id,
+        )
+        self.assertEqual(cancel_series(series_id, self.doctor.id, "Moving away"), 1)
+        entry = WaitlistEntry.objects.select_related("appointment").get(id=series_entry)
+        self.assertEqual((entry.status, entry.appointment.appointment_time), ("booked", time(11, 0)))
+
+    def test_entry_that_cannot_take_the_slot_is_skipped(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@example.com",
+            password="DocPass123",
+            first_name="Other",
+            last_name="Doc",
+            role="doctor",
+        )
+        other_doctor = Doctor.objects.create(
+            user=other_user,
+            specialization="dermatology",
+            license_number="LIC654321",
+            years_of_experience=5,
+            qualification="MBBS",
+        )
+        # The first patient in line is with another doctor at that time
+        Appointment.objects.create(
+            patient=self.patients[1],
+            doctor=other_doctor,
+            appointment_date=self.day,
+            appointment_time=time(9, 45),
+            chief_complaint="Skin check",
+        )
+        first = self._join(self.patients[1], doctor_id=str(self.doctor.id), auto_book=True)
+        second = self._join(self.patients[2], doctor_id=str(self.doctor.id))
+
+        self._cancel()
+
+        self.assertEqual(WaitlistEntry.objects.get(id=first).status, "waiting")
+        entry = WaitlistEntry.objects.get(id=second)
+        self.assertEqual((entry.status, entry.hold.patient), ("offered", self.patients[2]))
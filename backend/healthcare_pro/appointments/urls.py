@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import appointment_views, schedule_views, reminder_views, booking_views
+from .views import appointment_views, schedule_views, reminder_views, booking_views, series_views, waitlist_views, leave_views
 
 urlpatterns = [
     # Appointment management
@@ -9,11 +9,27 @@ urlpatterns = [
     # New appointment booking system
     path('schedule/', booking_views.schedule_appointment, name='schedule-appointment'),
     path('available-slots/', booking_views.get_available_slots, name='get-available-slots'),
+    path('availability-calendar/', booking_views.get_availability_calendar, name='availability-calendar'),
+    path('holds/', booking_views.create_slot_hold, name='create-slot-hold'),
+    path('holds/<uuid:hold_id>/', booking_views.release_slot_hold, name='release-slot-hold'),
+    path('first-available/', booking_views.first_available_appointments, name='first-available-appointments'),
     path('departments/', booking_views.get_departments, name='get-departments'),
     path('doctors-by-department/', booking_views.get_doctors_by_department, name='get-doctors-by-department'),
     path('<uuid:appointment_id>/cancel/', booking_views.cancel_appointment, name='cancel-appointment'),
     path('<uuid:appointment_id>/reschedule/', booking_views.reschedule_appointment, name='reschedule-appointment'),
     
+    # Recurring series
+    path('series/', series_views.book_appointment_series, name='book-appointment-series'),
+    path('series/<uuid:series_id>/cancel/', series_views.cancel_appointment_series, name='cancel-appointment-series'),
+    path('series/<uuid:series_id>/reschedule/', series_views.reschedule_appointment_series, name='reschedule-appointment-series'),
+    
+    # Doctor leave
+    path('doctor-leave/', leave_views.doctor_leave_reschedule, name='doctor-leave-reschedule'),
+    
+    # Waitlist for earlier openings
+    path('waitlist/', waitlist_views.waitlist, name='waitlist'),
+    path('waitlist/<uuid:entry_id>/', waitlist_views.leave_waitlist, name='leave-waitlist'),
+    
     # Appointment slots and scheduling (legacy)
     path('slots/', schedule_views.AppointmentSlotListCreateView.as_view(), name='appointment-slots'),
     path('legacy-available-slots/', schedule_views.available_slots, name='legacy-available-slots'),
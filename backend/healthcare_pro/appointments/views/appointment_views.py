@@ -1,9 +1,12 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
+from django.utils import timezone
 
+from ..concurrency import StaleVersion, compare_and_set, expected_version
 from ..models import Appointment, AppointmentSlot, AppointmentReminder
+from ..waitlist import promote_appointment_slot
 from ..serializers import (
     AppointmentSerializer, AppointmentCreateSerializer, 
     AppointmentUpdateSerializer, AppointmentListSerializer,
@@ -14,6 +17,12 @@ from ..serializers import (
 
 
 
+class AppointmentVersionConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'This appointment was changed by someone else. Reload it and try again.'
+    default_code = 'version_conflict'
+
+
 class AppointmentListCreateView(generics.ListCreateAPIView):
     """
     List all appointments or create a new appointment.
@@ -110,11 +119,31 @@ class AppointmentDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         return obj
     
+    def _expected_version(self, instance):
+        try:
+            return expected_version(self.request, instance)
+        except (TypeError, ValueError):
+            raise ValidationError({'version': 'version must be an integer'})
+    
+    def perform_update(self, serializer):
+        appointment_date = serializer.validated_data.get('appointment_date')
+        if appointment_date and appointment_date < timezone.localdate():
+            raise ValidationError({'appointment_date': 'Appointment cannot be scheduled for a past date.'})
+        
+        # Write only the submitted fields, and only if nobody else changed the row
+        try:
+            compare_and_set(serializer.instance, self._expected_version(serializer.instance), **serializer.validated_data)
+        except StaleVersion:
+            raise AppointmentVersionConflict()
+    
     def perform_destroy(self, instance):
         # Only allow cancellation, not deletion
         if instance.can_be_cancelled:
-            instance.status = 'cancelled'
-            instance.save()
+            try:
+                compare_and_set(instance, self._expected_version(instance), status='cancelled')
+            except StaleVersion:
+                raise AppointmentVersionConflict()
+            promote_appointment_slot(instance)
         else:
             raise permissions.PermissionDenied("This appointment cannot be cancelled.")
 
@@ -2,120 +2,33 @@ from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Count
 from datetime import datetime, timedelta, time as dt_time
 from django.utils import timezone
+from django.views.decorators.http import condition
 from decouple import config
-
-from ..models import Appointment, AppointmentSlot
+import uuid
+
+from ..assignment import ASSIGNMENT_POLICIES, DoctorAssigner
+from ..booking import SlotConflict, book_appointment, suggest_alternatives
+from ..concurrency import StaleVersion, compare_and_set, expected_version, stale_version_response
+from ..models import Appointment, AppointmentSlot, SlotHold
+from ..holds import create_hold, release_hold, sweep_expired_holds
+from ..occupancy import load_day_occupancy
+from ..slots import SlotPlanner, availability_calendar, first_available_slots, get_slot_duration_minutes
 from ..serializers import AppointmentCreateSerializer, AppointmentSerializer
+from ..waitlist import promote_appointment_slot
+from accounts.idempotency import idempotent
 from doctors.models import Doctor
+from doctors.schedule import DAY_ORDER, availability_etag, bump_availability_version
 from patients.models import PatientProfile
 
 
-def _parse_time_value(value):
-    if value is None:
-        return None
-    if isinstance(value, dt_time):
-        return value
-    if isinstance(value, (int, float)):
-        # Assume integer hours represented (e.g., 9 -> 09:00)
-        try:
-            hours = int(value)
-            if 0 <= hours < 24:
-                return dt_time(hour=hours)
-        except (TypeError, ValueError):
-            return None
-    if isinstance(value, str):
-        cleaned = value.strip()
-        if not cleaned:
-            return None
-        time_formats = ['%H:%M', '%H:%M:%S', '%I:%M %p', '%I %p']
-        for fmt in time_formats:
-            try:
-                return datetime.strptime(cleaned, fmt).time()
-            except ValueError:
-                continue
-    return None
-
-
-def _normalize_day_value(value):
-    if value is None:
-        return None
-    if isinstance(value, (list, tuple)) and value:
-        value = value[0]
-    return str(value).strip().lower() if str(value).strip() else None
-
-
-def _collect_working_day_windows(doctor, day_of_week):
-    working_days = doctor.working_days or []
-    if isinstance(working_days, dict):
-        working_days = [working_days]
-
-    windows = []
-    matched_day = False
-
-    def resolve_start_default():
-        return doctor.start_time or dt_time(9, 0)
-
-    def resolve_end_default():
-        return doctor.end_time or dt_time(19, 0)
-
-    for entry in working_days:
-        entry_day = None
-        start = None
-        end = None
-
-        if isinstance(entry, str):
-            entry_day = entry.strip().lower()
-        elif isinstance(entry, (list, tuple)) and entry:
-            entry_day = _normalize_day_value(entry[0])
-            if len(entry) > 1:
-                start = _parse_time_value(entry[1])
-            if len(entry) > 2:
-                end = _parse_time_value(entry[2])
-        elif isinstance(entry, dict):
-            entry_day = _normalize_day_value(
-                entry.get('day')
-                or entry.get('day_of_week')
-                or entry.get('weekday')
-                or entry.get('name')
-                or entry.get('value')
-            )
-            start = _parse_time_value(
-                entry.get('start_time')
-                or entry.get('start')
-                or entry.get('from')
-                or entry.get('opens_at')
-            )
-            end = _parse_time_value(
-                entry.get('end_time')
-                or entry.get('end')
-                or entry.get('to')
-                or entry.get('closes_at')
-            )
-
-        if entry_day == day_of_week:
-            matched_day = True
-            start = start or resolve_start_default()
-            end = end or resolve_end_default()
-            if start and end and start < end:
-                windows.append((start, end))
-
-    if matched_day and windows:
-        return windows
-
-    if matched_day and not windows:
-        start = resolve_start_default()
-        end = resolve_end_default()
-        if start and end and start < end:
-            return [(start, end)]
-
-    return []
-
-
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
+@idempotent
 def schedule_appointment(request):
     """
     Schedule a new appointment with enhanced booking functionality
@@ -160,8 +73,12 @@ def schedule_appointment(request):
                 status=status.HTTP_404_NOT_FOUND
             )
     
-    # Validate required fields
-    required_fields = ['department', 'appointment_date', 'preferred_time', 'appointment_type', 'reason']
+    # Validate required fields (a slot hold already fixes the doctor, date and time)
+    hold_id = data.get('hold_id')
+    if hold_id:
+        required_fields = ['appointment_type', 'reason']
+    else:
+        required_fields = ['department', 'appointment_date', 'preferred_time', 'appointment_type', 'reason']
     for field in required_fields:
         if field not in data:
             return Response(
@@ -170,92 +87,131 @@ def schedule_appointment(request):
             )
     
     try:
-        # Find available doctor in the department
-        department = data['department']
-        preferred_doctor_id = data.get('doctor_id') or data.get('preferred_doctor')
-        appointment_date = datetime.strptime(data['appointment_date'], '%Y-%m-%d').date()
-        preferred_time = datetime.strptime(data['preferred_time'], '%H:%M').time()
-        
-        # If preferred doctor is specified, use them
-        if preferred_doctor_id:
+        if hold_id:
             try:
-                # First try getting by ID only
-                doctor = Doctor.objects.get(id=preferred_doctor_id)
-                # Optional: Validate department match if needed, but for now allow ID to be the source of truth
-                # ensuring the doctor exists is enough. 
-                # If strict department matching is required, we need to handle "Dermatology" vs "Dermatology Dept" vs "Dermatology Department"
-                
-            except Doctor.DoesNotExist:
-                return Response(
-                    {'error': 'Preferred doctor not found'}, 
-                    status=status.HTTP_404_NOT_FOUND
+                hold = (
+                    SlotHold.objects
+                    .select_related('doctor__user')
+                    .active()
+                    .filter(id=hold_id, patient=patient)
+                    .first()
                 )
-        else:
-            # Find any available doctor in the department
-            doctors = Doctor.objects.filter(department=department, is_available=True)
-            if not doctors.exists():
+            except (ValueError, DjangoValidationError):
+                hold = None
+            if hold is None:
                 return Response(
-                    {'error': 'No doctors available in the specified department'}, 
-                    status=status.HTTP_404_NOT_FOUND
+                    {'error': 'Slot hold not found or expired'}, 
+                    status=status.HTTP_400_BAD_REQUEST
                 )
-            doctor = doctors.first()  # For now, take the first available doctor
-        
-        # Check if the time slot is available
-        existing_appointment = Appointment.objects.filter(
-            doctor=doctor,
-            appointment_date=appointment_date,
-            appointment_time=preferred_time,
-            status__in=['scheduled', 'confirmed']
-        ).exists()
+            doctor = hold.doctor
+            appointment_date = hold.appointment_date
+            preferred_time = hold.appointment_time
+            duration = hold.duration
+        else:
+            hold = None
+            # Use the preferred doctor, or assign one from the department
+            department = data['department']
+            preferred_doctor_id = data.get('doctor_id') or data.get('preferred_doctor')
+            appointment_date = datetime.strptime(data['appointment_date'], '%Y-%m-%d').date()
+            preferred_time = datetime.strptime(data['preferred_time'], '%H:%M').time()
+            
+            # If preferred doctor is specified, use them
+            if preferred_doctor_id:
+                try:
+                    # First try getting by ID only
+                    doctor = Doctor.objects.select_related('user').get(id=preferred_doctor_id)
+                    # Optional: Validate department match if needed, but for now allow ID to be the source of truth
+                    # ensuring the doctor exists is enough. 
+                    # If strict department matching is required, we need to handle "Dermatology" vs "Dermatology Dept" vs "Dermatology Department"
+                    
+                except (Doctor.DoesNotExist, ValueError, DjangoValidationError):
+                    return Response(
+                        {'error': 'Preferred doctor not found'}, 
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+            
+            duration = Appointment._meta.get_field('duration').default
+            
+            if not preferred_doctor_id:
+                # Assign the department doctor with free time and the lightest load
+                policy = data.get('assignment_policy') or config('DOCTOR_ASSIGNMENT_POLICY', default='least_loaded')
+                if policy not in ASSIGNMENT_POLICIES:
+                    return Response(
+                        {'error': f"Invalid assignment_policy '{policy}'"}, 
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                
+                assigner = DoctorAssigner(department, appointment_date, duration, holder_user_id=patient.user_id)
+                if not assigner.doctors:
+                    return Response(
+                        {'error': 'No doctors available in the specified department'}, 
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                
+                assignment = assigner.assign(preferred_time, policy)
+                if assignment is None:
+                    planner = SlotPlanner(
+                        assigner.doctors, appointment_date, appointment_date + timedelta(days=6),
+                        holder_user_id=patient.user_id
+                    )
+                    return Response({
+                        'error': 'The selected time slot is not available',
+                        'alternative_slots': [
+                            {
+                                'doctor_id': slot_doctor.id,
+                                'date': day.isoformat(),
+                                'time': slot['time'],
+                                'end_time': slot['end_time']
+                            }
+                            for day, slot_doctor, slot in first_available_slots(planner, 3)
+                        ]
+                    }, status=status.HTTP_400_BAD_REQUEST)
+                doctor, preferred_time = assignment
         
-        if existing_appointment:
+        if appointment_date < timezone.localdate():
             return Response(
-                {'error': 'The selected time slot is not available'}, 
+                {'error': 'Appointment cannot be scheduled for a past date.'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if data['appointment_type'] not in dict(Appointment.APPOINTMENT_TYPE_CHOICES):
+            return Response(
+                {'error': f"Invalid appointment_type '{data['appointment_type']}'"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create the appointment
+        # Overlap check, insert and hold conversion happen in one transaction
         reason_text = data.get('reason') or data.get('reason_for_visit', '')
-        appointment_data = {
-            'patient': patient.id,
-            'doctor': doctor.id,
-            'appointment_date': appointment_date,
-            'appointment_time': preferred_time,
-            'appointment_type': data['appointment_type'],
-            'chief_complaint': reason_text,
-            'reason': reason_text,
-            'status': 'scheduled'
-        }
-        
-        serializer = AppointmentCreateSerializer(data=appointment_data)
-        if serializer.is_valid():
-            appointment = serializer.save()
-            
-            # Generate confirmation code
-            confirmation_code = f"APT-{appointment_date.year}-{str(appointment.id)[-6:].zfill(6)}"
-            appointment.confirmation_code = confirmation_code
-            appointment.save()
-            
+        try:
+            appointment = book_appointment(
+                patient, doctor, appointment_date, preferred_time, duration,
+                data['appointment_type'], reason_text, hold=hold
+            )
+        except SlotConflict:
             return Response({
+                'error': 'The selected time slot is not available',
+                'alternative_slots': suggest_alternatives(
+                    doctor, appointment_date, holder_user_id=patient.user_id
+                )
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'id': appointment.id,
+            'message': 'Appointment scheduled successfully',
+            'appointment': {
                 'id': appointment.id,
-                'message': 'Appointment scheduled successfully',
-                'appointment': {
-                    'id': appointment.id,
-                    'doctor': {
-                        'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
-                        'specialization': doctor.specialization,
-                        'department': doctor.department
-                    },
-                    'date': appointment.appointment_date.strftime('%Y-%m-%d'),
-                    'time': appointment.appointment_time.strftime('%H:%M:%S'),
-                    'status': appointment.status,
-                    'appointment_type': appointment.appointment_type,
-                    'reason': appointment.reason
+                'doctor': {
+                    'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
+                    'specialization': doctor.specialization,
+                    'department': doctor.department
                 },
-                'confirmation_code': confirmation_code
-            }, status=status.HTTP_201_CREATED)
-        else:
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                'date': appointment.appointment_date.strftime('%Y-%m-%d'),
+                'time': appointment.appointment_time.strftime('%H:%M:%S'),
+                'status': appointment.status,
+                'appointment_type': appointment.appointment_type,
+                'reason': appointment.reason
+            },
+            'confirmation_code': appointment.confirmation_code
+        }, status=status.HTTP_201_CREATED)
             
     except ValueError as e:
         return Response(
@@ -269,174 +225,181 @@ def schedule_appointment(request):
         )
 
 
-@api_view(['GET'])
+@api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def get_available_slots(request):
+def create_slot_hold(request):
     """
-    Get available time slots for a specific doctor and date
+    Hold a doctor's time for a few minutes while the patient completes booking.
+    Pass the returned hold id as hold_id to schedule/.
     """
-    doctor_id = request.GET.get('doctor_id')
-    date_str = request.GET.get('date')
+    if request.user.role != 'patient':
+        return Response(
+            {'error': 'Only patients can hold appointment slots'}, 
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    data = request.data
+    for field in ['doctor_id', 'appointment_date', 'preferred_time']:
+        if field not in data:
+            return Response(
+                {'error': f'{field} is required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
     
-    if not doctor_id or not date_str:
+    try:
+        patient = PatientProfile.objects.get(user=request.user)
+    except PatientProfile.DoesNotExist:
         return Response(
-            {'error': 'doctor_id and date parameters are required'}, 
-            status=status.HTTP_400_BAD_REQUEST
+            {'error': 'Patient profile not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    try:
+        doctor = Doctor.objects.get(id=data['doctor_id'])
+    except (Doctor.DoesNotExist, ValueError, DjangoValidationError):
+        return Response(
+            {'error': 'Doctor not found'}, 
+            status=status.HTTP_404_NOT_FOUND
         )
     
     try:
-        doctor = Doctor.objects.get(id=doctor_id)
-        appointment_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-        day_of_week = appointment_date.strftime('%A').lower()
-
-        booked_counts = {
-            item['appointment_time'].strftime('%H:%M'): item['count']
-            for item in Appointment.objects.filter(
-                doctor=doctor,
-                appointment_date=appointment_date,
-                status__in=['scheduled', 'confirmed', 'in_progress']
-            )
-            .values('appointment_time')
-            .annotate(count=Count('id'))
-        }
+        appointment_date = datetime.strptime(data['appointment_date'], '%Y-%m-%d').date()
+        preferred_time = datetime.strptime(data['preferred_time'], '%H:%M').time()
+    except ValueError:
+        return Response(
+            {'error': 'Invalid date or time format'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if appointment_date < timezone.localdate():
+        return Response(
+            {'error': 'Appointment cannot be scheduled for a past date.'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    hold = create_hold(patient, doctor, appointment_date, preferred_time)
+    if hold is None:
+        return Response(
+            {'error': 'The selected time slot is not available'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response({
+        'id': hold.id,
+        'doctor_id': doctor.id,
+        'appointment_date': hold.appointment_date.strftime('%Y-%m-%d'),
+        'appointment_time': hold.appointment_time.strftime('%H:%M'),
+        'expires_at': hold.expires_at.isoformat()
+    }, status=status.HTTP_201_CREATED)
 
-        configured_slots = list(
-            AppointmentSlot.objects.filter(
-                doctor=doctor,
-                date=appointment_date
-            ).order_by('start_time')
+
+@api_view(['DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def release_slot_hold(request, hold_id):
+    """
+    Release a slot hold before it expires
+    """
+    hold = SlotHold.objects.filter(id=hold_id, patient__user=request.user).first()
+    if hold is None:
+        return Response(
+            {'error': 'Slot hold not found'}, 
+            status=status.HTTP_404_NOT_FOUND
         )
-        configured_map = {
-            slot.start_time.strftime('%H:%M'): slot
-            for slot in configured_slots
-        }
+    
+    release_hold(hold)
+    return Response(status=status.HTTP_204_NO_CONTENT)
 
-        slot_duration_setting = config('APPOINTMENT_SLOT_DURATION_MINUTES', default=60, cast=int)
-        try:
-            slot_duration = timedelta(minutes=max(int(slot_duration_setting), 60))
-        except (TypeError, ValueError):
-            slot_duration = timedelta(minutes=60)
 
-        now_local = timezone.localtime()
-        current_time_today = now_local.time() if now_local.date() == appointment_date else None
+def _available_slots_etag(request):
+    doctor_id = request.GET.get('doctor_id')
+    if not doctor_id:
+        return None
 
-        slot_data = []
-        processed_keys = set()
+    # Slots earlier today close as the clock moves, so include the minute when
+    # the requested range covers today.
+    now_local = timezone.localtime()
+    today = now_local.date().isoformat()
+    requested = [
+        request.GET.get(key) or ''
+        for key in ('date', 'start_date', 'end_date')
+    ]
+    covers_today = (
+        requested[0] == today
+        or not requested[0] and requested[1] <= today and (not requested[2] or today <= requested[2])
+    )
+    clock = now_local.strftime('%Y-%m-%dT%H:%M') if covers_today else today
+    # A patient's own holds show as available to them only
+    holder = request.user.id if request.user.role == 'patient' else ''
+
+    etag = availability_etag(
+        {'id': doctor_id}, *requested, get_slot_duration_minutes(), clock, holder
+    )
+    # Lazily drop expired holds; that bumps the version, so rebuild the tag
+    if etag is not None and sweep_expired_holds(doctor_id):
+        etag = availability_etag(
+            {'id': doctor_id}, *requested, get_slot_duration_minutes(), clock, holder
+        )
+    return etag
 
-        availabilities = list(
-            doctor.availabilities.filter(
-                day_of_week__iexact=day_of_week,
-                is_available=True
-            ).order_by('start_time')
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@condition(etag_func=_available_slots_etag)
+def get_available_slots(request):
+    """
+    Get available time slots for a specific doctor and date.
+    Pass start_date/end_date instead of date to fetch a whole range in one call.
+    """
+    doctor_id = request.GET.get('doctor_id')
+    date_str = request.GET.get('date')
+    start_date_str = request.GET.get('start_date')
+    end_date_str = request.GET.get('end_date')
+    
+    if not doctor_id or not (date_str or start_date_str):
+        return Response(
+            {'error': 'doctor_id and date (or start_date) parameters are required'}, 
+            status=status.HTTP_400_BAD_REQUEST
         )
+    
+    holder_user_id = request.user.id if request.user.role == 'patient' else None
+
+    try:
+        doctor = Doctor.objects.select_related('user').get(id=doctor_id)
 
-        for availability in availabilities:
-            current_start = datetime.combine(appointment_date, availability.start_time)
-            availability_end = datetime.combine(appointment_date, availability.end_time)
-
-            while current_start + slot_duration <= availability_end:
-                slot_time_str = current_start.strftime('%H:%M')
-                next_end = current_start + slot_duration
-                slot_end_str = next_end.strftime('%H:%M')
-
-                configured_slot = configured_map.get(slot_time_str)
-                base_capacity = max((configured_slot.max_appointments if configured_slot else 1) or 1, 1)
-                slot_available_flag = bool(configured_slot.is_available) if configured_slot else True
-
-                booked_count = booked_counts.get(slot_time_str, 0)
-                remaining_capacity = max(base_capacity - booked_count, 0)
-
-                is_future_slot = not current_time_today or current_start.time() > current_time_today
-                is_available = slot_available_flag and remaining_capacity > 0 and is_future_slot
-
-                status_label = 'available' if is_available else 'booked'
-
-                slot_data.append({
-                    'id': str(configured_slot.id) if configured_slot else f"availability-{availability.id}-{slot_time_str.replace(':', '')}",
-                    'time': slot_time_str,
-                    'start_time': slot_time_str,
-                    'end_time': slot_end_str,
-                    'status': status_label,
-                    'is_available': is_available,
-                    'is_fully_booked': remaining_capacity <= 0 or not is_future_slot,
-                    'current_appointments': booked_count,
-                    'max_appointments': base_capacity,
-                    'remaining_capacity': remaining_capacity,
-                })
-
-                processed_keys.add(slot_time_str)
-                current_start = next_end
-
-        working_windows = _collect_working_day_windows(doctor, day_of_week)
-
-        for start_time_value, end_time_value in working_windows:
-            current_start = datetime.combine(appointment_date, start_time_value)
-            window_end = datetime.combine(appointment_date, end_time_value)
-
-            while current_start + slot_duration <= window_end:
-                slot_time_str = current_start.strftime('%H:%M')
-                if slot_time_str in processed_keys:
-                    current_start += slot_duration
-                    continue
-
-                next_end = current_start + slot_duration
-                slot_end_str = next_end.strftime('%H:%M')
-
-                configured_slot = configured_map.get(slot_time_str)
-                base_capacity = max((configured_slot.max_appointments if configured_slot else 1) or 1, 1)
-                slot_available_flag = bool(configured_slot.is_available) if configured_slot else bool(doctor.is_available)
-
-                booked_count = booked_counts.get(slot_time_str, 0)
-                remaining_capacity = max(base_capacity - booked_count, 0)
-
-                is_future_slot = not current_time_today or current_start.time() > current_time_today
-                is_available = slot_available_flag and remaining_capacity > 0 and is_future_slot
-
-                status_label = 'available' if is_available else 'booked'
-
-                slot_data.append({
-                    'id': str(configured_slot.id) if configured_slot else f"working-{day_of_week}-{slot_time_str.replace(':', '')}",
-                    'time': slot_time_str,
-                    'start_time': slot_time_str,
-                    'end_time': slot_end_str,
-                    'status': status_label,
-                    'is_available': is_available,
-                    'is_fully_booked': remaining_capacity <= 0 or not is_future_slot,
-                    'current_appointments': booked_count,
-                    'max_appointments': base_capacity,
-                    'remaining_capacity': remaining_capacity,
-                })
-
-                processed_keys.add(slot_time_str)
-                current_start = next_end
-
-        for slot in configured_slots:
-            key = slot.start_time.strftime('%H:%M')
-            if key in processed_keys:
-                continue
-
-            booked_count = booked_counts.get(key, 0)
-            base_capacity = max(slot.max_appointments or 1, 1)
-            remaining_capacity = max(base_capacity - booked_count, 0)
-            is_future_slot = not current_time_today or slot.start_time > current_time_today
-            slot_available_flag = bool(slot.is_available)
-            is_available = slot_available_flag and remaining_capacity > 0 and is_future_slot
-            status_label = 'available' if is_available else 'booked'
-
-            slot_data.append({
-                'id': str(slot.id),
-                'time': key,
-                'start_time': key,
-                'end_time': slot.end_time.strftime('%H:%M'),
-                'status': status_label,
-                'is_available': is_available,
-                'is_fully_booked': remaining_capacity <= 0 or not is_future_slot,
-                'current_appointments': booked_count,
-                'max_appointments': base_capacity,
-                'remaining_capacity': remaining_capacity,
+        if date_str:
+            appointment_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            planner = SlotPlanner([doctor], appointment_date, appointment_date, holder_user_id=holder_user_id)
+
+            return Response({
+                'doctor': {
+                    'id': doctor.id,
+                    'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
+                    'department': doctor.department
+                },
+                'date': date_str,
+                'day_of_week': appointment_date.strftime('%A').lower(),
+                'available_slots': planner.day_slots(doctor, appointment_date)
             })
 
-        slot_data.sort(key=lambda item: item['time'])
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+        if end_date_str:
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        else:
+            default_schedule_days = config('DEFAULT_SCHEDULE_DAYS', default=7, cast=int)
+            end_date = start_date + timedelta(days=default_schedule_days)
+
+        max_range_days = config('MAX_SLOT_RANGE_DAYS', default=60, cast=int)
+        if end_date < start_date:
+            return Response(
+                {'error': 'end_date must be on or after start_date'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end_date - start_date).days + 1 > max_range_days:
+            return Response(
+                {'error': f'Date range cannot exceed {max_range_days} days'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        planner = SlotPlanner([doctor], start_date, end_date, holder_user_id=holder_user_id)
 
         return Response({
             'doctor': {
@@ -444,9 +407,10 @@ def get_available_slots(request):
                 'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
                 'department': doctor.department
             },
-            'date': date_str,
-            'day_of_week': day_of_week,
-            'available_slots': slot_data
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'slot_duration_minutes': planner.slot_duration,
+            'days': planner.range_slots(doctor)
         })
 
     except Doctor.DoesNotExist:
@@ -461,6 +425,143 @@ def get_available_slots(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def get_availability_calendar(request):
+    """
+    Get per-day open/booked/total slot counts for a doctor over a month (YYYY-MM).
+    """
+    doctor_id = request.GET.get('doctor_id')
+    month_str = request.GET.get('month')
+
+    if not doctor_id or not month_str:
+        return Response(
+            {'error': 'doctor_id and month parameters are required'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        month_start = datetime.strptime(month_str, '%Y-%m').date()
+    except ValueError:
+        return Response(
+            {'error': 'Invalid month format. Use YYYY-MM'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        doctor = Doctor.objects.select_related('user').get(id=uuid.UUID(doctor_id))
+    except (ValueError, Doctor.DoesNotExist):
+        return Response(
+            {'error': 'Doctor not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    holder_user_id = request.user.id if request.user.role == 'patient' else None
+    return Response({
+        'doctor': {
+            'id': doctor.id,
+            'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
+            'department': doctor.department
+        },
+        'month': month_start.strftime('%Y-%m'),
+        'days': availability_calendar(
+            doctor, month_start.year, month_start.month, holder_user_id=holder_user_id
+        )
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def first_available_appointments(request):
+    """
+    Find the earliest open slots across every doctor with a given specialization.
+    Optional filters: hospital_id, time_from/time_to (HH:MM), weekdays (comma separated).
+    """
+    specialization = request.GET.get('specialization')
+    if not specialization:
+        return Response(
+            {'error': 'specialization parameter is required'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    max_range_days = config('MAX_SLOT_RANGE_DAYS', default=60, cast=int)
+    try:
+        days = min(max(int(request.GET.get('days', 14)), 1), max_range_days)
+        limit = min(max(int(request.GET.get('limit', 5)), 1), 50)
+        time_from = request.GET.get('time_from')
+        time_to = request.GET.get('time_to')
+        if time_from:
+            time_from = datetime.strptime(time_from, '%H:%M').strftime('%H:%M')
+        if time_to:
+            time_to = datetime.strptime(time_to, '%H:%M').strftime('%H:%M')
+    except ValueError:
+        return Response(
+            {'error': 'days and limit must be integers and times must use HH:MM'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    weekdays = None
+    if request.GET.get('weekdays'):
+        weekdays = set()
+        for value in request.GET['weekdays'].split(','):
+            value = value.strip().lower()
+            matches = [day for day in DAY_ORDER if len(value) >= 3 and day.startswith(value)]
+            if not matches:
+                return Response(
+                    {'error': f'Unknown weekday: {value}'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            weekdays.update(matches)
+
+    doctors = Doctor.objects.filter(
+        specialization=specialization,
+        is_available=True
+    ).select_related('user').order_by('id')
+    hospital_id = request.GET.get('hospital_id')
+    if hospital_id:
+        try:
+            hospital_id = uuid.UUID(hospital_id)
+        except ValueError:
+            return Response(
+                {'error': 'hospital_id must be a hospital id'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        doctors = doctors.filter(hospitals__id=hospital_id)
+
+    start_date = timezone.localdate()
+    end_date = start_date + timedelta(days=days - 1)
+    planner = SlotPlanner(
+        doctors, start_date, end_date,
+        holder_user_id=request.user.id if request.user.role == 'patient' else None
+    )
+    results = first_available_slots(
+        planner, limit, time_from=time_from, time_to=time_to, weekdays=weekdays
+    )
+
+    return Response({
+        'specialization': specialization,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'doctors_considered': len(planner.doctors),
+        'slots': [
+            {
+                'doctor': {
+                    'id': str(doctor.id),
+                    'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
+                    'department': doctor.department
+                },
+                'date': day.isoformat(),
+                'day_of_week': DAY_ORDER[day.weekday()],
+                'time': slot['time'],
+                'end_time': slot['end_time'],
+                'slot_id': slot['id'],
+                'remaining_capacity': slot['remaining_capacity'],
+            }
+            for day, doctor, slot in results
+        ]
+    })
+
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def get_departments(request):
@@ -573,12 +674,27 @@ def cancel_appointment(request, appointment_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        try:
+            version = expected_version(request, appointment)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'version must be an integer'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         # Update appointment status
         cancellation_reason = request.data.get('cancellation_reason', 'No reason provided')
-        appointment.status = 'cancelled'
-        appointment.cancellation_reason = cancellation_reason
-        appointment.cancelled_at = timezone.now()
-        appointment.save()
+        try:
+            compare_and_set(
+                appointment, version,
+                status='cancelled',
+                cancellation_reason=cancellation_reason,
+                cancelled_at=timezone.now()
+            )
+        except StaleVersion:
+            return stale_version_response(appointment.id)
+        
+        promote_appointment_slot(appointment)
         
         return Response({
             'message': 'Appointment cancelled successfully',
@@ -586,7 +702,8 @@ def cancel_appointment(request, appointment_id):
                 'id': appointment.id,
                 'status': appointment.status,
                 'cancellation_reason': appointment.cancellation_reason,
-                'cancelled_at': appointment.cancelled_at.isoformat()
+                'cancelled_at': appointment.cancelled_at.isoformat(),
+                'version': appointment.version
             }
         })
         
@@ -653,27 +770,49 @@ def reschedule_appointment(request, appointment_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if new time slot is available
-        existing_appointment = Appointment.objects.filter(
-            doctor=appointment.doctor,
-            appointment_date=new_date,
-            appointment_time=new_time,
-            status__in=['scheduled', 'confirmed']
-        ).exclude(id=appointment.id).exists()
+        if new_date < timezone.localdate():
+            return Response(
+                {'error': 'Appointment cannot be scheduled for a past date.'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if existing_appointment:
+        try:
+            version = expected_version(request, appointment)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'version must be an integer'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        freed_date, freed_time = appointment.appointment_date, appointment.appointment_time
+        try:
+            with transaction.atomic():
+                # Take the doctor's lock before the overlap check, as booking does
+                bump_availability_version(appointment.doctor_id)
+                occupancy = load_day_occupancy(
+                    appointment.doctor, new_date,
+                    exclude_ids=[appointment.id], holder_user_id=request.user.id
+                )
+                if not occupancy.is_time_free(new_time, appointment.duration):
+                    raise SlotConflict()
+                
+                compare_and_set(
+                    appointment, version,
+                    appointment_date=new_date,
+                    appointment_time=new_time,
+                    status='rescheduled',
+                    reschedule_reason=reschedule_reason,
+                    rescheduled_at=timezone.now()
+                )
+        except StaleVersion:
+            return stale_version_response(appointment.id)
+        except (SlotConflict, IntegrityError):
             return Response(
                 {'error': 'The selected time slot is not available'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Update appointment
-        appointment.appointment_date = new_date
-        appointment.appointment_time = new_time
-        appointment.status = 'rescheduled'
-        appointment.reschedule_reason = reschedule_reason
-        appointment.rescheduled_at = timezone.now()
-        appointment.save()
+        promote_appointment_slot(appointment, freed_date, freed_time)
         
         return Response({
             'message': 'Appointment rescheduled successfully',
@@ -683,7 +822,8 @@ def reschedule_appointment(request, appointment_id):
                 'time': appointment.appointment_time.strftime('%H:%M:%S'),
                 'status': appointment.status,
                 'reschedule_reason': appointment.reschedule_reason,
-                'rescheduled_at': appointment.rescheduled_at.isoformat()
+                'rescheduled_at': appointment.rescheduled_at.isoformat(),
+                'version': appointment.version
             }
         })
         
@@ -0,0 +1,103 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from datetime import datetime
+from decouple import config
+
+from ..leave import reschedule_for_leave
+from doctors.models import Doctor
+
+
+def _truthy(value):
+    return str(value).lower() in ['true', '1', 'yes']
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def doctor_leave_reschedule(request):
+    """
+    Move every active appointment of a doctor on leave to the next free
+    slots, with the same doctor or a colleague from the same department.
+    Send dry_run=true to preview the plan without changing anything.
+    """
+    if request.user.role != 'admin':
+        return Response(
+            {'error': 'Only admins can reschedule a doctor\'s leave'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    data = request.data
+    for field in ['doctor_id', 'start_date', 'end_date']:
+        if field not in data:
+            return Response(
+                {'error': f'{field} is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    try:
+        doctor = Doctor.objects.select_related('user').get(id=data['doctor_id'])
+    except (Doctor.DoesNotExist, ValueError):
+        return Response(
+            {'error': 'Doctor not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    max_weeks = config('LEAVE_MAX_SEARCH_WEEKS', default=12, cast=int)
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date()
+        search_weeks = int(data['search_weeks']) if data.get('search_weeks') else None
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'Invalid date or number format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if end_date < start_date:
+        return Response(
+            {'error': 'end_date must not be before start_date'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if search_weeks is not None and not 1 <= search_weeks <= max_weeks:
+        return Response(
+            {'error': f'search_weeks must be between 1 and {max_weeks}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    dry_run = _truthy(data.get('dry_run', False))
+    moves, unplaced = reschedule_for_leave(
+        doctor, start_date, end_date,
+        reason=data.get('reason') or 'Doctor on leave',
+        search_weeks=search_weeks,
+        include_colleagues=_truthy(data.get('allow_colleagues', True)),
+        dry_run=dry_run,
+    )
+
+    return Response({
+        'message': (
+            f'{len(moves)} appointments would be moved' if dry_run
+            else f'{len(moves)} appointments rescheduled'
+        ),
+        'dry_run': dry_run,
+        'moved_count': len(moves),
+        'unplaced_count': len(unplaced),
+        'moves': [
+            {
+                'appointment_id': appointment.id,
+                'patient_name': appointment.patient.user.get_full_name(),
+                'doctor_id': new_doctor.id,
+                'doctor_name': f"Dr. {new_doctor.user.get_full_name()}",
+                'date': new_date.isoformat(),
+                'time': new_time.strftime('%H:%M'),
+            }
+            for appointment, new_doctor, new_date, new_time in moves
+        ],
+        'unplaced': [
+            {
+                'appointment_id': appointment.id,
+                'patient_name': appointment.patient.user.get_full_name(),
+                'date': appointment.appointment_date.isoformat(),
+                'time': appointment.appointment_time.strftime('%H:%M'),
+            }
+            for appointment in unplaced
+        ]
+    })
@@ -24,12 +24,12 @@ class AppointmentSlotListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return AppointmentSlot.objects.all().select_related('doctor__user').order_by('date', 'start_time')
+            return AppointmentSlot.objects.with_capacity().select_related('doctor__user').order_by('date', 'start_time')
         elif user.role == 'doctor':
             from doctors.models import Doctor
             try:
                 doctor = Doctor.objects.get(user=user)
-                return AppointmentSlot.objects.filter(doctor=doctor).order_by('date', 'start_time')
+                return AppointmentSlot.objects.filter(doctor=doctor).with_capacity().select_related('doctor__user').order_by('date', 'start_time')
             except Doctor.DoesNotExist:
                 return AppointmentSlot.objects.none()
         
@@ -118,7 +118,7 @@ def available_slots(request):
     
     try:
         from doctors.models import Doctor
-        doctor = Doctor.objects.get(id=doctor_id)
+        doctor = Doctor.objects.select_related('user').get(id=doctor_id)
     except Doctor.DoesNotExist:
         return Response(
             {"error": "Doctor not found."},
@@ -148,9 +148,7 @@ def available_slots(request):
         doctor=doctor,
         date__range=[start_date, end_date],
         is_available=True
-    ).exclude(
-        is_fully_booked=True
-    ).order_by('date', 'start_time')
+    ).with_open_capacity().select_related('doctor__user').order_by('date', 'start_time')
     
     serializer = AppointmentSlotSerializer(slots, many=True)
     return Response({
@@ -0,0 +1,271 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.core.exceptions import ValidationError
+from datetime import datetime
+from django.utils import timezone
+from decouple import config
+
+from ..booking import (
+    SlotConflict, book_series, cancel_series, reschedule_series, series_dates,
+    suggest_series_alternatives,
+)
+from ..models import Appointment
+from accounts.idempotency import idempotent
+from doctors.models import Doctor
+from doctors.schedule import DAY_ORDER
+from patients.models import PatientProfile
+
+
+def _conflict_report(doctor, conflict_dates, appointment_time, holder_user_id):
+    alternatives = suggest_series_alternatives(
+        doctor, conflict_dates, appointment_time, holder_user_id=holder_user_id
+    )
+    return [
+        {
+            'date': day.isoformat(),
+            'alternative_slots': alternatives.get(day, [])
+        }
+        for day in conflict_dates
+    ]
+
+
+def _series_access_error(request, appointment, action):
+    """Same ownership rules as the single-appointment cancel/reschedule views."""
+    if request.user.role == 'admin':
+        return None
+    if request.user.role == 'patient' and appointment.patient.user_id == request.user.id:
+        return None
+    if action == 'cancel' and request.user.role == 'doctor' and appointment.doctor.user_id == request.user.id:
+        return None
+    return Response(
+        {'error': f'You do not have permission to {action} this series'},
+        status=status.HTTP_403_FORBIDDEN
+    )
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@idempotent
+def book_appointment_series(request):
+    """
+    Book a recurring weekly series, e.g. 12 weeks of Tuesdays at 10:00.
+    All occurrences are checked and inserted in one transaction.
+    """
+    if request.user.role not in ['patient', 'doctor', 'admin']:
+        return Response(
+            {'error': 'Only patients, doctors, and admins can schedule appointments'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+
+    data = request.data
+    required_fields = ['doctor_id', 'start_date', 'preferred_time', 'occurrences', 'appointment_type', 'reason']
+    for field in required_fields:
+        if field not in data:
+            return Response(
+                {'error': f'{field} is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    try:
+        if request.user.role == 'patient':
+            patient = PatientProfile.objects.get(user=request.user)
+        elif 'patient_id' in data:
+            patient = PatientProfile.objects.get(id=data['patient_id'])
+        else:
+            return Response(
+                {'error': 'Patient ID is required when scheduling for another patient'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    except (PatientProfile.DoesNotExist, ValueError):
+        return Response(
+            {'error': 'Patient not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    try:
+        doctor = Doctor.objects.select_related('user').get(id=data['doctor_id'])
+    except (Doctor.DoesNotExist, ValueError, ValidationError):
+        return Response(
+            {'error': 'Doctor not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    max_occurrences = config('MAX_SERIES_OCCURRENCES', default=26, cast=int)
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date()
+        preferred_time = datetime.strptime(data['preferred_time'], '%H:%M').time()
+        occurrences = int(data['occurrences'])
+        interval_weeks = int(data.get('interval_weeks', 1))
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'Invalid date, time or number format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    weekday = data.get('weekday')
+    if weekday:
+        weekday = str(weekday).strip().lower()
+        if weekday not in DAY_ORDER:
+            return Response(
+                {'error': f"Invalid weekday '{data['weekday']}'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        weekday = DAY_ORDER.index(weekday)
+    else:
+        weekday = None
+
+    if not 1 <= occurrences <= max_occurrences:
+        return Response(
+            {'error': f'occurrences must be between 1 and {max_occurrences}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not 1 <= interval_weeks <= 4:
+        return Response(
+            {'error': 'interval_weeks must be between 1 and 4'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if start_date < timezone.localdate():
+        return Response(
+            {'error': 'Appointment cannot be scheduled for a past date.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if data['appointment_type'] not in dict(Appointment.APPOINTMENT_TYPE_CHOICES):
+        return Response(
+            {'error': f"Invalid appointment_type '{data['appointment_type']}'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    dates = series_dates(start_date, occurrences, interval_weeks, weekday)
+    allow_partial = str(data.get('allow_partial', '')).lower() in ['true', '1', 'yes']
+    duration = Appointment._meta.get_field('duration').default
+
+    try:
+        series_id, appointments, conflict_dates = book_series(
+            patient, doctor, dates, preferred_time, duration,
+            data['appointment_type'], data['reason'], allow_partial=allow_partial
+        )
+    except SlotConflict:
+        return Response(
+            {'error': 'The series conflicts with a booking made at the same time, please retry'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    conflicts = _conflict_report(doctor, conflict_dates, preferred_time, patient.user_id)
+    if not appointments:
+        return Response({
+            'error': 'Some occurrences of the series are not available',
+            'conflicts': conflicts
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'series_id': series_id,
+        'message': f'{len(appointments)} appointments scheduled successfully',
+        'doctor': {
+            'id': doctor.id,
+            'name': f"Dr. {doctor.user.first_name} {doctor.user.last_name}",
+            'department': doctor.department
+        },
+        'time': preferred_time.strftime('%H:%M'),
+        'appointments': [
+            {
+                'id': appointment.id,
+                'date': appointment.appointment_date.strftime('%Y-%m-%d'),
+                'confirmation_code': appointment.confirmation_code
+            }
+            for appointment in appointments
+        ],
+        'conflicts': conflicts
+    }, status=status.HTTP_201_CREATED)
+
+
+@api_view(['PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def cancel_appointment_series(request, series_id):
+    """
+    Cancel every upcoming appointment in a series
+    """
+    appointment = (
+        Appointment.objects
+        .select_related('patient', 'doctor')
+        .filter(series_id=series_id)
+        .first()
+    )
+    if appointment is None:
+        return Response(
+            {'error': 'Appointment series not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    error = _series_access_error(request, appointment, 'cancel')
+    if error:
+        return error
+
+    cancellation_reason = request.data.get('cancellation_reason', 'No reason provided')
+    cancelled = cancel_series(series_id, appointment.doctor_id, cancellation_reason)
+
+    return Response({
+        'message': f'{cancelled} appointments cancelled successfully',
+        'series_id': series_id,
+        'cancelled_count': cancelled
+    })
+
+
+@api_view(['PATCH'])
+@permission_classes([permissions.IsAuthenticated])
+def reschedule_appointment_series(request, series_id):
+    """
+    Move every upcoming appointment in a series to a new time of day
+    """
+    appointment = (
+        Appointment.objects
+        .select_related('patient', 'doctor')
+        .filter(series_id=series_id)
+        .first()
+    )
+    if appointment is None:
+        return Response(
+            {'error': 'Appointment series not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    error = _series_access_error(request, appointment, 'reschedule')
+    if error:
+        return error
+
+    new_time_str = request.data.get('new_time')
+    if not new_time_str:
+        return Response(
+            {'error': 'new_time is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        new_time = datetime.strptime(new_time_str, '%H:%M').time()
+    except ValueError:
+        return Response(
+            {'error': 'Invalid time format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    reschedule_reason = request.data.get('reschedule_reason', 'No reason provided')
+    try:
+        updated, conflict_dates = reschedule_series(
+            series_id, appointment.doctor, new_time, reschedule_reason,
+            holder_user_id=appointment.patient.user_id
+        )
+    except SlotConflict:
+        conflict_dates = None
+
+    if conflict_dates is None or conflict_dates:
+        return Response({
+            'error': 'The new time is not available for every appointment in the series',
+            'conflicts': _conflict_report(
+                appointment.doctor, conflict_dates or [], new_time, appointment.patient.user_id
+            )
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'message': f'{updated} appointments rescheduled successfully',
+        'series_id': series_id,
+        'time': new_time.strftime('%H:%M'),
+        'rescheduled_count': updated
+    })
@@ -0,0 +1,169 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from datetime import datetime
+from django.utils import timezone
+from decouple import config
+
+from ..holds import release_hold
+from ..models import Appointment, WaitlistEntry
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+def _serialize_entry(entry):
+    hold = entry.hold
+    return {
+        'id': entry.id,
+        'doctor_id': entry.doctor_id,
+        'specialization': entry.specialization or None,
+        'earliest_date': entry.earliest_date.isoformat(),
+        'latest_date': entry.latest_date.isoformat(),
+        'earliest_time': entry.earliest_time.strftime('%H:%M') if entry.earliest_time else None,
+        'latest_time': entry.latest_time.strftime('%H:%M') if entry.latest_time else None,
+        'auto_book': entry.auto_book,
+        'status': entry.status,
+        'appointment_id': entry.appointment_id,
+        'offer': {
+            'hold_id': hold.id,
+            'doctor_id': hold.doctor_id,
+            'appointment_date': hold.appointment_date.isoformat(),
+            'appointment_time': hold.appointment_time.strftime('%H:%M'),
+            'expires_at': hold.expires_at.isoformat()
+        } if hold else None
+    }
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([permissions.IsAuthenticated])
+def waitlist(request):
+    """
+    List the patient's waitlist entries, or join the waitlist for an earlier
+    opening with a doctor or in a specialization
+    """
+    if request.user.role != 'patient':
+        return Response(
+            {'error': 'Only patients can use the waitlist'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    try:
+        patient = PatientProfile.objects.get(user=request.user)
+    except PatientProfile.DoesNotExist:
+        return Response(
+            {'error': 'Patient profile not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    if request.method == 'GET':
+        entries = (
+            WaitlistEntry.objects
+            .filter(patient=patient, status__in=['waiting', 'offered', 'booked'])
+            .select_related('hold')
+        )
+        return Response({'entries': [_serialize_entry(entry) for entry in entries]})
+
+    data = request.data
+    for field in ['earliest_date', 'latest_date']:
+        if field not in data:
+            return Response(
+                {'error': f'{field} is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    if not data.get('doctor_id') and not data.get('specialization'):
+        return Response(
+            {'error': 'doctor_id or specialization is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        earliest_date = datetime.strptime(data['earliest_date'], '%Y-%m-%d').date()
+        latest_date = datetime.strptime(data['latest_date'], '%Y-%m-%d').date()
+        earliest_time = datetime.strptime(data['earliest_time'], '%H:%M').time() if data.get('earliest_time') else None
+        latest_time = datetime.strptime(data['latest_time'], '%H:%M').time() if data.get('latest_time') else None
+    except (TypeError, ValueError):
+        return Response(
+            {'error': 'Invalid date or time format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    max_days = config('MAX_SLOT_RANGE_DAYS', default=60, cast=int)
+    if earliest_date < timezone.localdate() or latest_date < earliest_date:
+        return Response(
+            {'error': 'The date range must start today or later and end after it starts'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if (latest_date - earliest_date).days >= max_days:
+        return Response(
+            {'error': f'The date range cannot exceed {max_days} days'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if earliest_time and latest_time and latest_time <= earliest_time:
+        return Response(
+            {'error': 'latest_time must be after earliest_time'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    appointment_type = data.get('appointment_type', 'consultation')
+    if appointment_type not in dict(Appointment.APPOINTMENT_TYPE_CHOICES):
+        return Response(
+            {'error': f"Invalid appointment_type '{appointment_type}'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    doctor = None
+    specialization = ''
+    if data.get('doctor_id'):
+        try:
+            doctor = Doctor.objects.get(id=data['doctor_id'])
+        except (Doctor.DoesNotExist, ValueError):
+            return Response(
+                {'error': 'Doctor not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+    else:
+        specialization = str(data['specialization']).strip().lower()
+        if specialization not in dict(Doctor.SPECIALIZATION_CHOICES):
+            return Response(
+                {'error': f"Invalid specialization '{data['specialization']}'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+    entry = WaitlistEntry.objects.create(
+        patient=patient,
+        doctor=doctor,
+        specialization=specialization,
+        earliest_date=earliest_date,
+        latest_date=latest_date,
+        earliest_time=earliest_time,
+        latest_time=latest_time,
+        appointment_type=appointment_type,
+        reason=data.get('reason', ''),
+        auto_book=str(data.get('auto_book', '')).lower() in ['true', '1', 'yes'],
+    )
+    return Response(_serialize_entry(entry), status=status.HTTP_201_CREATED)
+
+
+@api_view(['DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def leave_waitlist(request, entry_id):
+    """
+    Leave the waitlist; a pending offer is released to the next patient
+    """
+    entry = (
+        WaitlistEntry.objects
+        .select_related('hold')
+        .filter(id=entry_id, patient__user=request.user, status__in=['waiting', 'offered'])
+        .first()
+    )
+    if entry is None:
+        return Response(
+            {'error': 'Waitlist entry not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    hold = entry.hold
+    entry.status = 'cancelled'
+    entry.save(update_fields=['status', 'updated_at'])
+    if hold is not None:
+        release_hold(hold)
+    return Response(status=status.HTTP_204_NO_CONTENT)
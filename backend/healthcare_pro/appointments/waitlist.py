@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta, time as dt_time
+
+from django.db.models import Q
+from django.utils import timezone
+from decouple import config
+
+from .booking import SlotConflict, book_appointment
+from .holds import create_hold
+from .models import Appointment, WaitlistEntry
+from .occupancy import DayOccupancy
+from doctors.models import Doctor
+
+
+def get_offer_ttl():
+    return timedelta(minutes=config('WAITLIST_OFFER_MINUTES', default=30, cast=int))
+
+
+def matching_entries(doctor, appointment_date, appointment_time, duration, exclude_patient_id=None, limit=5):
+    """
+    Waiting entries that accept this slot, oldest first, from one query on
+    the doctor/specialization match indexes.
+    """
+    end = datetime.combine(appointment_date, appointment_time) + timedelta(minutes=duration)
+    end_time = end.time() if end.date() == appointment_date else dt_time.max
+    entries = (
+        WaitlistEntry.objects
+        .select_related('patient')
+        .filter(
+            Q(doctor_id=doctor.id) | Q(doctor__isnull=True, specialization=doctor.specialization),
+            status='waiting',
+            earliest_date__lte=appointment_date,
+            latest_date__gte=appointment_date,
+        )
+        .filter(
+            Q(earliest_time__isnull=True) | Q(earliest_time__lte=appointment_time),
+            Q(latest_time__isnull=True) | Q(latest_time__gte=end_time),
+        )
+        .order_by('created_at')
+    )
+    if exclude_patient_id is not None:
+        entries = entries.exclude(patient_id=exclude_patient_id)
+    return list(entries[:limit])
+
+
+def _busy_patient_ids(patient_ids, appointment_date, appointment_time, duration):
+    """Patients among ``patient_ids`` who already have an active appointment overlapping the slot."""
+    booked = {}
+    rows = Appointment.objects.filter(
+        patient_id__in=patient_ids,
+        appointment_date=appointment_date,
+        status__in=Appointment.ACTIVE_STATUSES,
+    ).values_list('patient_id', 'appointment_time', 'duration')
+    for patient_id, booked_time, booked_duration in rows:
+        booked.setdefault(patient_id, DayOccupancy()).add_time(booked_time, booked_duration)
+    return {
+        patient_id for patient_id, occupancy in booked.items()
+        if not occupancy.is_time_free(appointment_time, duration)
+    }
+
+
+def promote_waitlist(doctor, appointment_date, appointment_time, duration, exclude_patient_id=None):
+    """
+    Hand a freed slot to the first matching waitlist entry: book it directly
+    for ``auto_book`` entries, otherwise offer it as a hold that lasts
+    ``WAITLIST_OFFER_MINUTES``. An entry that cannot take the slot, because
+    its patient is busy then or the booking or hold fails, stays waiting and
+    the next entry is tried. Returns the promoted entry or None.
+    """
+    if appointment_date < timezone.localdate():
+        return None
+
+    entries = matching_entries(doctor, appointment_date, appointment_time, duration, exclude_patient_id)
+    busy = _busy_patient_ids(
+        {entry.patient_id for entry in entries}, appointment_date, appointment_time, duration
+    ) if entries else set()
+    for entry in entries:
+        if entry.patient_id in busy:
+            continue
+        if entry.auto_book:
+            try:
+                entry.appointment = book_appointment(
+                    entry.patient, doctor, appointment_date, appointment_time, duration,
+                    entry.appointment_type, entry.reason or 'Booked from waitlist'
+                )
+            except SlotConflict:
+                continue
+            entry.status = 'booked'
+            entry.save(update_fields=['status', 'appointment', 'updated_at'])
+            return entry
+
+        hold = create_hold(
+            entry.patient, doctor, appointment_date, appointment_time, duration,
+            ttl=get_offer_ttl(), replace=False
+        )
+        if hold is None:
+            continue
+        entry.status = 'offered'
+        entry.hold = hold
+        entry.offered_at = timezone.now()
+        entry.save(update_fields=['status', 'hold', 'offered_at', 'updated_at'])
+        return entry
+
+    return None
+
+
+def promote_appointment_slot(appointment, appointment_date=None, appointment_time=None):
+    """Promote the waitlist into the slot ``appointment`` held before it was cancelled or moved."""
+    return promote_waitlist(
+        appointment.doctor,
+        appointment_date or appointment.appointment_date,
+        appointment_time or appointment.appointment_time,
+        appointment.duration,
+        exclude_patient_id=appointment.patient_id,
+    )
+
+
+def promote_freed_slots(doctor_id, slots):
+    """
+    Promote the waitlist into each freed ``(date, time, duration, patient_id)``
+    of one doctor, earliest first. Skips everything after a single query when
+    nobody is waiting for the doctor or specialization in that date range.
+    """
+    slots = sorted(slot for slot in slots if slot[0] >= timezone.localdate())
+    if not slots:
+        return []
+    doctor = Doctor.objects.filter(pk=doctor_id).first()
+    if doctor is None:
+        return []
+    waiting = WaitlistEntry.objects.filter(
+        Q(doctor_id=doctor.id) | Q(doctor__isnull=True, specialization=doctor.specialization),
+        status='waiting',
+        earliest_date__lte=slots[-1][0],
+        latest_date__gte=slots[0][0],
+    )
+    if not waiting.exists():
+        return []
+
+    promoted = []
+    for appointment_date, appointment_time, duration, patient_id in slots:
+        entry = promote_waitlist(doctor, appointment_date, appointment_time, duration, exclude_patient_id=patient_id)
+        if entry is not None:
+            promoted.append(entry)
+    return promoted
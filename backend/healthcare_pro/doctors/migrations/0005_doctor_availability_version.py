@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0004_doctor_department_category_doctor_performance_rating_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='doctor',
+            name='availability_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bumped whenever schedule or bookings change'),
+        ),
+    ]
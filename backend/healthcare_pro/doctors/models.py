@@ -2,6 +2,33 @@ from django.db import models
 from django.conf import settings
 import uuid
 
+from accounts.sequences import next_values
+
+
+def _first_doctor_number():
+    """Seed for the ``doctor_id`` sequence: one past the highest existing DOCxxx id."""
+    numbers = [
+        int(doctor_id[3:])
+        for doctor_id in Doctor.objects.filter(doctor_id__startswith='DOC').values_list('doctor_id', flat=True)
+        if doctor_id[3:].isdigit()
+    ]
+    return max(numbers, default=0) + 1
+
+
+def assign_doctor_ids(doctors):
+    """Give every doctor without a ``doctor_id`` one from the sequence, e.g. "DOC001"."""
+    pending = [doctor for doctor in doctors if not doctor.doctor_id]
+    for doctor, number in zip(pending, next_values('doctor_id', len(pending), initial=_first_doctor_number)):
+        doctor.doctor_id = f"DOC{str(number).zfill(3)}"
+
+
+class DoctorManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        assign_doctor_ids(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Doctor(models.Model):
     GENDER_CHOICES = (
         ('M', 'Male'),
@@ -70,6 +97,7 @@ class Doctor(models.Model):
     
     # Status
     is_available = models.BooleanField(default=True)
+    availability_version = models.PositiveIntegerField(default=0, editable=False, help_text="Bumped whenever schedule or bookings change")
     
     # Analytics & Performance Tracking
     salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, help_text="Annual salary")
@@ -80,19 +108,14 @@ class Doctor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = DoctorManager()
+    
     class Meta:
         db_table = 'doctors'
         ordering = ['-created_at']
     
     def save(self, *args, **kwargs):
-        if not self.doctor_id:
-            # Generate doctor ID like "DOC001", "DOC002", etc.
-            last_doctor = Doctor.objects.all().order_by('created_at').last()
-            if last_doctor and last_doctor.doctor_id:
-                last_id = int(last_doctor.doctor_id[3:])
-                self.doctor_id = f"DOC{str(last_id + 1).zfill(3)}"
-            else:
-                self.doctor_id = "DOC001"
+        assign_doctor_ids([self])
         super().save(*args, **kwargs)
     
     def __str__(self):
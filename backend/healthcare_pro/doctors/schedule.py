@@ -0,0 +1,344 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time
+
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from decouple import config
+
+from .models import Availability, Doctor
+
+
+DAY_ORDER = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+DEFAULT_START = dt_time(9, 0)
+DEFAULT_END = dt_time(19, 0)
+
+_TIME_FORMATS = ('%H:%M', '%H:%M:%S', '%I:%M %p', '%I %p')
+
+
+def _parse_time_value(value, allow_hours=True):
+    if value is None:
+        return None
+    if isinstance(value, dt_time):
+        return value
+    if allow_hours and isinstance(value, (int, float)):
+        # Assume integer hours represented (e.g., 9 -> 09:00)
+        try:
+            hours = int(value)
+            if 0 <= hours < 24:
+                return dt_time(hour=hours)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, str):
+        cleaned = value.strip()
+        if not cleaned:
+            return None
+        for fmt in _TIME_FORMATS:
+            try:
+                return datetime.strptime(cleaned, fmt).time()
+            except ValueError:
+                continue
+    return None
+
+
+def _normalize_day_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, tuple)) and value:
+        value = value[0]
+    return str(value).strip().lower() if str(value).strip() else None
+
+
+def _entry_day(entry):
+    return (
+        entry.get('day')
+        or entry.get('day_of_week')
+        or entry.get('weekday')
+        or entry.get('name')
+        or entry.get('value')
+    )
+
+
+def _entry_start(entry):
+    return (
+        entry.get('start_time')
+        or entry.get('start')
+        or entry.get('from')
+        or entry.get('opens_at')
+    )
+
+
+def _entry_end(entry):
+    return (
+        entry.get('end_time')
+        or entry.get('end')
+        or entry.get('to')
+        or entry.get('closes_at')
+    )
+
+
+def _working_days_entries(raw_value):
+    if not raw_value:
+        return []
+    if isinstance(raw_value, dict):
+        return [raw_value]
+    return list(raw_value)
+
+
+def _to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _merge_windows(windows):
+    merged = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compile_working_windows(doctor):
+    """
+    Interpret ``doctor.working_days`` once for the whole week.
+
+    Entries may be day names, ``[day, start, end]`` sequences or dicts using any
+    of the supported alias keys. Days listed without usable hours fall back to
+    the doctor's default start/end time.
+    """
+    default_start = doctor.start_time or DEFAULT_START
+    default_end = doctor.end_time or DEFAULT_END
+
+    matched_days = set()
+    windows = defaultdict(list)
+
+    for entry in _working_days_entries(doctor.working_days):
+        day = None
+        start = None
+        end = None
+
+        if isinstance(entry, str):
+            day = entry.strip().lower()
+        elif isinstance(entry, (list, tuple)) and entry:
+            day = _normalize_day_value(entry[0])
+            if len(entry) > 1:
+                start = _parse_time_value(entry[1])
+            if len(entry) > 2:
+                end = _parse_time_value(entry[2])
+        elif isinstance(entry, dict):
+            day = _normalize_day_value(_entry_day(entry))
+            start = _parse_time_value(_entry_start(entry))
+            end = _parse_time_value(_entry_end(entry))
+
+        if day not in DAY_ORDER:
+            continue
+
+        matched_days.add(day)
+        start = start or default_start
+        end = end or default_end
+        if start < end:
+            windows[day].append((_to_minutes(start), _to_minutes(end)))
+
+    compiled = {}
+    for day in DAY_ORDER:
+        if windows.get(day):
+            compiled[day] = windows[day]
+        elif day in matched_days and default_start < default_end:
+            compiled[day] = [(_to_minutes(default_start), _to_minutes(default_end))]
+        else:
+            compiled[day] = []
+    return compiled
+
+
+def normalize_working_days_payload(raw_value):
+    """Normalized ``working_days`` entries as returned by the availability API."""
+    def format_time(value):
+        parsed = _parse_time_value(value, allow_hours=False)
+        return parsed.strftime('%H:%M') if parsed else None
+
+    normalized = []
+    for entry in _working_days_entries(raw_value):
+        if isinstance(entry, str):
+            day = _normalize_day_value(entry)
+            if day:
+                normalized.append({
+                    'day': day,
+                    'start_time': None,
+                    'end_time': None,
+                    'available': True,
+                    'active': True
+                })
+            continue
+
+        if isinstance(entry, dict):
+            day = _normalize_day_value(_entry_day(entry))
+            if not day:
+                continue
+
+            normalized.append({
+                'day': day,
+                'start_time': format_time(_entry_start(entry)),
+                'end_time': format_time(_entry_end(entry)),
+                'available': entry.get('available', entry.get('is_available', True)),
+                'active': entry.get('active', True)
+            })
+
+    return normalized
+
+
+class CompiledSchedule:
+    """
+    A doctor's weekly hours reduced to integer minutes.
+
+    ``availability_windows`` holds the active ``Availability`` rows per weekday
+    as ``(start_minute, end_minute, availability_id)`` and ``working_windows``
+    holds the windows derived from ``Doctor.working_days``, both sorted by start.
+    """
+
+    __slots__ = ('availability_windows', 'working_windows', 'working_days_payload', '_merged')
+
+    def __init__(self, availability_windows, working_windows, working_days_payload):
+        self.availability_windows = availability_windows
+        self.working_windows = working_windows
+        self.working_days_payload = working_days_payload
+        self._merged = {
+            day: _merge_windows(
+                [(start, end) for start, end, _ in availability_windows.get(day, [])]
+                + list(working_windows.get(day, []))
+            )
+            for day in DAY_ORDER
+        }
+
+    def windows(self, day_of_week):
+        """Merged, sorted (start_minute, end_minute) windows for a weekday."""
+        return self._merged.get(day_of_week, [])
+
+    def works_on(self, day_of_week):
+        return bool(self._merged.get(day_of_week))
+
+
+def compile_schedule(doctor, availabilities):
+    availability_windows = {day: [] for day in DAY_ORDER}
+    for availability in availabilities:
+        day = availability.day_of_week.lower()
+        if day in availability_windows and availability.is_available:
+            availability_windows[day].append((
+                _to_minutes(availability.start_time),
+                _to_minutes(availability.end_time),
+                availability.id,
+            ))
+    for windows in availability_windows.values():
+        windows.sort(key=lambda window: window[0])
+
+    return CompiledSchedule(
+        availability_windows,
+        compile_working_windows(doctor),
+        normalize_working_days_payload(doctor.working_days),
+    )
+
+
+# doctor_id -> (schedule, (availability_version, updated_at), compiled_at)
+_cache = {}
+_generations = defaultdict(int)
+_lock = threading.Lock()
+
+
+def get_schedule_ttl():
+    return config('SCHEDULE_CACHE_SECONDS', default=300, cast=int)
+
+
+def _schedule_key(doctor):
+    # Every schedule write bumps the version and a full save changes
+    # updated_at, so other processes notice changes they did not make
+    return doctor.availability_version, doctor.updated_at
+
+
+def invalidate_schedule(doctor_id):
+    with _lock:
+        _cache.pop(doctor_id, None)
+        _generations[doctor_id] += 1
+
+
+def get_schedules(doctors):
+    """
+    Return ``{doctor_id: CompiledSchedule}`` for ``doctors``, compiling any
+    that are not cached with a single ``Availability`` query.
+
+    The cache is per process. An entry is only used while the doctor's
+    ``availability_version`` and ``updated_at`` match the ones it was
+    compiled for, and for at most ``SCHEDULE_CACHE_SECONDS``, so pass
+    doctors loaded by the current request.
+    """
+    doctors = list(doctors)
+    now = time.monotonic()
+    ttl = get_schedule_ttl()
+    result = {}
+    missing = []
+    with _lock:
+        for doctor in doctors:
+            entry = _cache.get(doctor.id)
+            if entry is not None and entry[1] == _schedule_key(doctor) and now - entry[2] < ttl:
+                result[doctor.id] = entry[0]
+            else:
+                _cache.pop(doctor.id, None)
+                missing.append((doctor, _generations[doctor.id]))
+
+    if not missing:
+        return result
+
+    rows = defaultdict(list)
+    for availability in (
+        Availability.objects
+        .filter(doctor_id__in=[doctor.id for doctor, _ in missing])
+        .order_by('start_time')
+    ):
+        rows[availability.doctor_id].append(availability)
+
+    compiled = {
+        doctor.id: (compile_schedule(doctor, rows.get(doctor.id, [])), _schedule_key(doctor), generation)
+        for doctor, generation in missing
+    }
+    with _lock:
+        for doctor_id, (schedule, key, generation) in compiled.items():
+            # Skip caching if the doctor was invalidated while we were compiling
+            if _generations[doctor_id] == generation:
+                _cache[doctor_id] = (schedule, key, now)
+            result[doctor_id] = schedule
+    return result
+
+
+def get_schedule(doctor):
+    return get_schedules([doctor])[doctor.id]
+
+
+def bump_availability_version(doctor_id):
+    """Mark everything derived from a doctor's schedule or bookings as stale."""
+    Doctor.objects.filter(pk=doctor_id).update(availability_version=F('availability_version') + 1)
+
+
+def availability_etag(doctor_filter, *parts):
+    """
+    Build an ETag from the matching doctor's ``availability_version`` plus any
+    request-specific ``parts``. Returns None when no doctor matches so the view
+    can produce its usual error response.
+    """
+    # updated_at guards against a full Doctor.save() writing back a stale version
+    try:
+        row = (
+            Doctor.objects
+            .filter(**doctor_filter)
+            .order_by()
+            .values_list('id', 'availability_version', 'updated_at')
+            .first()
+        )
+    except (ValidationError, ValueError):
+        return None
+    if row is None:
+        return None
+    key = '|'.join(str(part) for part in (*row, *parts))
+    return hashlib.md5(key.encode()).hexdigest()
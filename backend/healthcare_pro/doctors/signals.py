@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Availability, Doctor
+from .schedule import bump_availability_version, invalidate_schedule
+
+
+@receiver([post_save, post_delete], sender=Doctor)
+def invalidate_doctor_schedule(sender, instance, **kwargs):
+    invalidate_schedule(instance.id)
+    if kwargs.get('signal') is post_save:
+        bump_availability_version(instance.id)
+
+
+@receiver([post_save, post_delete], sender=Availability)
+def invalidate_availability_schedule(sender, instance, **kwargs):
+    invalidate_schedule(instance.doctor_id)
+    bump_availability_version(instance.doctor_id)
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+
+from accounts import sequences
+from accounts.models import Sequence
+from doctors.models import Doctor
+
+
+def make_doctor(index, **extra):
+    user = get_user_model().objects.create_user(
+        email=f"doc{index}@example.com",
+        password="DocPass123",
+        first_name="Doc",
+        last_name=f"Tor{index}",
+        role="doctor",
+    )
+    return Doctor(
+        user=user,
+        specialization="cardiology",
+        department="Cardiology",
+        license_number=f"LIC{index:06d}",
+        years_of_experience=5,
+        qualification="MBBS",
+        **extra,
+    )
+
+
+class DoctorIdSequenceTestCase(TestCase):
+    def test_sequence_continues_after_existing_ids(self):
+        make_doctor(1, doctor_id="DOC041").save()
+
+        doctor = make_doctor(2)
+        doctor.save()
+
+        self.assertEqual(doctor.doctor_id, "DOC042")
+
+    def test_bulk_create_assigns_ids(self):
+        doctors = Doctor.objects.bulk_create([make_doctor(index) for index in range(3)])
+
+        self.assertEqual([doctor.doctor_id for doctor in doctors], ["DOC001", "DOC002", "DOC003"])
+        self.assertEqual(Sequence.objects.get(name="doctor_id").next_value, 4)
+
+
+class SequenceBlockTestCase(TransactionTestCase):
+    def setUp(self):
+        sequences._blocks.clear()
+
+    def tearDown(self):
+        sequences._blocks.clear()
+
+    def test_values_come_from_a_cached_block(self):
+        first = sequences.next_value("test_block")
+        with self.assertNumQueries(0):
+            rest = sequences.next_values("test_block", sequences.get_block_size() - 1)
+
+        self.assertEqual([first] + rest, list(range(1, sequences.get_block_size() + 1)))
+        self.assertEqual(Sequence.objects.get(name="test_block").next_value, sequences.get_block_size() + 1)
+
+        # The next call reserves a fresh block
+        self.assertEqual(sequences.next_value("test_block"), sequences.get_block_size() + 1)
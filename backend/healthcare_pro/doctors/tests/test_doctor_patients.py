@@ -0,0 +1,97 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import PatientProfile
+
+
+class DoctorPatientsAPITestCase(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.doctor = self._doctor("doc")
+        other_doctor = self._doctor("other")
+
+        # 12 patients with visits on distinct days, 2 patients never seen
+        self.patients = []
+        for index in range(14):
+            user = User.objects.create_user(
+                email=f"patient{index}@example.com",
+                password="PatPass123",
+                first_name=f"Patient{index}",
+                last_name="Test",
+                role="patient",
+            )
+            patient = PatientProfile.objects.create(user=user)
+            self.patients.append(patient)
+            if index < 12:
+                self._appointment(patient, self.doctor, date(2024, 1, index + 1), "completed")
+            self._appointment(patient, self.doctor, date.today() + timedelta(days=7 + index), "scheduled")
+
+        # A second completed visit, and one with another doctor that must not count
+        self._appointment(self.patients[0], self.doctor, date(2023, 6, 1), "completed")
+        self._appointment(self.patients[0], other_doctor, date(2024, 6, 1), "completed")
+
+        self.url = reverse("doctor-patients")
+        self.client.force_authenticate(self.doctor.user)
+
+    def _doctor(self, name):
+        user = get_user_model().objects.create_user(
+            email=f"{name}@example.com",
+            password="DocPass123",
+            first_name=name.title(),
+            last_name="Doctor",
+            role="doctor",
+        )
+        return Doctor.objects.create(
+            user=user,
+            specialization="cardiology",
+            license_number=f"LIC-{name}",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+
+    def _appointment(self, patient, doctor, appointment_date, status_value):
+        Appointment(
+            patient=patient,
+            doctor=doctor,
+            appointment_date=appointment_date,
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+            status=status_value,
+        ).save(validate=False)
+
+    def test_pages_are_annotated_and_walk_every_patient_once(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 14)
+
+        first = response.data["patients"]
+        self.assertEqual(len(first), 10)
+        self.assertEqual(first[0]["id"], str(self.patients[11].id))
+        self.assertEqual(first[0]["last_visit_iso"], "2024-01-12")
+        self.assertEqual(first[-1]["id"], str(self.patients[2].id))
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"cursor": response.data["next_cursor"]})
+        second = response.data["patients"]
+        self.assertIsNone(response.data["next_cursor"])
+        self.assertEqual(
+            [row["id"] for row in second],
+            [str(self.patients[i].id) for i in (1, 0, 13, 12)],
+        )
+
+        patient_0 = second[1]
+        self.assertEqual(patient_0["last_visit_iso"], "2024-01-01")
+        self.assertEqual(patient_0["total_completed_visits"], 2)
+        self.assertEqual(second[2]["last_visit"], "No visits")
+        self.assertEqual(second[2]["total_completed_visits"], 0)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"cursor": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
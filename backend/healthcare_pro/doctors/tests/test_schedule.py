@@ -0,0 +1,78 @@
+from datetime import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from doctors.models import Doctor, Availability
+from doctors.schedule import bump_availability_version, get_schedule
+
+
+class CompiledScheduleTestCase(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.doctor = Doctor.objects.create(
+            user=user,
+            specialization="cardiology",
+            department="Cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+            working_days=[
+                "Monday",
+                ["tuesday", "8 AM", "12:00"],
+                {"weekday": "friday", "from": "14:00", "to": "10:00"},
+            ],
+            start_time=time(9, 0),
+            end_time=time(17, 0),
+        )
+
+    def test_compiles_working_days_to_minutes(self):
+        schedule = get_schedule(self.doctor)
+
+        self.assertEqual(schedule.working_windows["monday"], [(540, 1020)])
+        self.assertEqual(schedule.working_windows["tuesday"], [(480, 720)])
+        # Invalid hours fall back to the doctor's defaults
+        self.assertEqual(schedule.working_windows["friday"], [(540, 1020)])
+        self.assertEqual(schedule.working_windows["sunday"], [])
+
+    def test_cached_until_availability_or_doctor_changes(self):
+        schedule = get_schedule(self.doctor)
+        with self.assertNumQueries(0):
+            self.assertIs(get_schedule(self.doctor), schedule)
+
+        Availability.objects.create(
+            doctor=self.doctor,
+            day_of_week="Sunday",
+            start_time=time(10, 0),
+            end_time=time(12, 0),
+        )
+        schedule = get_schedule(self.doctor)
+        self.assertEqual(schedule.windows("sunday"), [(600, 720)])
+
+        self.doctor.working_days = []
+        self.doctor.save(update_fields=["working_days"])
+        self.assertEqual(get_schedule(self.doctor).windows("monday"), [])
+
+    def test_changes_from_other_processes_are_noticed(self):
+        get_schedule(self.doctor)
+
+        # A write that never reached this process's signal handlers
+        Availability.objects.bulk_create([Availability(
+            doctor=self.doctor, day_of_week="Sunday", start_time=time(10, 0), end_time=time(12, 0)
+        )])
+        bump_availability_version(self.doctor.id)
+
+        doctor = Doctor.objects.get(pk=self.doctor.pk)
+        self.assertEqual(get_schedule(doctor).windows("sunday"), [(600, 720)])
+
+    def test_entries_expire(self):
+        schedule = get_schedule(self.doctor)
+        with mock.patch("doctors.schedule.get_schedule_ttl", return_value=0):
+            self.assertIsNot(get_schedule(self.doctor), schedule)
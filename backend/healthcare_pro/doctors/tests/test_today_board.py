@@ -0,0 +1,111 @@
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.concurrency import compare_and_set
+from appointments.models import Appointment
+from doctors.models import Doctor
+from doctors.today_board import _boards
+from patients.models import PatientProfile
+
+
+class DoctorTodayBoardTestCase(APITestCase):
+    def setUp(self):
+        _boards.clear()
+        User = get_user_model()
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Board",
+            role="doctor",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            license_number="LIC-BOARD",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        patient_user = User.objects.create_user(
+            email="patient@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        patient = PatientProfile.objects.create(user=patient_user)
+        self.appointments = [
+            Appointment.objects.create(
+                patient=patient,
+                doctor=self.doctor,
+                appointment_date=timezone.localdate(),
+                appointment_time=time(hour, 0),
+                chief_complaint="Checkup",
+                status=status_value,
+            )
+            for hour, status_value in [(9, "scheduled"), (10, "confirmed"), (11, "scheduled")]
+        ]
+        self.url = reverse("doctor-dashboard")
+        self.client.force_authenticate(doctor_user)
+
+    def test_board_is_cached_and_updated_in_place(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["today_stats"], {
+            "scheduled_appointments": 2,
+            "completed_appointments": 0,
+            "pending_appointments": 3,
+        })
+        self.assertEqual([row["time_24"] for row in response.data["today_schedule"]], ["09:00", "10:00", "11:00"])
+
+        # Unchanged: only the doctor is read
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        first = self.appointments[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            compare_and_set(first, first.version, status="confirmed")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse("bulk-update-appointment-status"), {"updates": [
+                {"appointment_id": str(self.appointments[1].id), "status": "no_show"},
+            ]}, format="json")
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["today_stats"], {
+            "scheduled_appointments": 1,
+            "completed_appointments": 0,
+            "pending_appointments": 2,
+        })
+        schedule = response.data["today_schedule"]
+        self.assertEqual([row["status"] for row in schedule], ["confirmed", "no_show", "scheduled"])
+        self.assertEqual(schedule[1]["status_label"], dict(Appointment.STATUS_CHOICES)["no_show"])
+
+    def test_other_writes_rebuild_the_board(self):
+        self.client.get(self.url)
+        self.appointments[2].delete()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["today_schedule"]), 2)
+        self.assertEqual(response.data["today_stats"]["pending_appointments"], 2)
+
+    def test_stale_doctor_save_does_not_revive_the_board(self):
+        stale_doctor = Doctor.objects.get(pk=self.doctor.pk)
+        self.appointments[0].delete()
+        self.client.get(self.url)
+
+        # Another write makes the board stale; a full save of an older copy
+        # then writes back the old version, and its own bump lands on the
+        # version the board was built for
+        self.appointments[2].delete()
+        stale_doctor.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["today_schedule"]), 1)
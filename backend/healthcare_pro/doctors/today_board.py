@@ -0,0 +1,114 @@
+import threading
+import time
+
+from django.db import transaction
+from django.utils import timezone
+from decouple import config
+
+from .models import Doctor
+from appointments.models import Appointment
+
+
+# Today's schedule and counters per doctor, valid for one availability_version
+_boards = {}
+_lock = threading.Lock()
+
+STATUS_LABELS = dict(Appointment.STATUS_CHOICES)
+
+
+def get_board_ttl():
+    return config('DOCTOR_TODAY_BOARD_CACHE_SECONDS', default=300, cast=int)
+
+
+def count_statuses(rows):
+    """The dashboard counters, computed from the board's rows."""
+    statuses = [row['status'] for row in rows]
+    return {
+        'scheduled_appointments': statuses.count('scheduled'),
+        'completed_appointments': statuses.count('completed'),
+        'pending_appointments': statuses.count('scheduled') + statuses.count('confirmed'),
+    }
+
+
+def get_today_board(doctor, serialize):
+    """
+    ``{'schedule': [...], 'stats': {...}}`` for the doctor's appointments
+    today.
+
+    The board is kept in memory for the doctor's current
+    ``availability_version``, which every appointment write bumps, and
+    ``updated_at``, which catches a full ``Doctor.save()`` writing back a
+    stale version (as in ``availability_etag``), so a cached board is only
+    served while nothing changed. Otherwise today's
+    appointments are fetched once, each row is built with ``serialize``
+    (it must include ``id``, ``status`` and ``status_label``) and the
+    counters are computed from the same rows. Patient details do not bump
+    the version, so a board is also rebuilt once it is older than
+    ``DOCTOR_TODAY_BOARD_CACHE_SECONDS``.
+    """
+    today = timezone.localdate()
+    with _lock:
+        board = _boards.get(doctor.id)
+    if (
+        board
+        and board['date'] == today
+        and board['version'] == doctor.availability_version
+        and board['updated_at'] == doctor.updated_at
+        and time.monotonic() - board['built_at'] < get_board_ttl()
+    ):
+        return board
+
+    appointments = Appointment.objects.filter(
+        doctor=doctor,
+        appointment_date=today
+    ).select_related('patient__user').order_by('appointment_time')
+    rows = [serialize(appointment) for appointment in appointments]
+    # Stamped with the version the caller read; a write since then makes it
+    # mismatch on the next read and the board is simply rebuilt
+    board = {
+        'date': today,
+        'version': doctor.availability_version,
+        'updated_at': doctor.updated_at,
+        'built_at': time.monotonic(),
+        'schedule': rows,
+        'stats': count_statuses(rows),
+    }
+    with _lock:
+        _boards[doctor.id] = board
+    return board
+
+
+def update_today_board(doctor_id, statuses):
+    """
+    Apply ``{appointment_id: status}`` to the doctor's cached board in place.
+
+    Call inside the transaction that changed the statuses, after its single
+    ``bump_availability_version``. The doctor row is locked by that bump, so
+    the version read here is the one this change produced; the board is
+    updated when the transaction commits, and only if it was current just
+    before the change. Otherwise it is left to be rebuilt on the next read.
+    """
+    with _lock:
+        board = _boards.get(doctor_id)
+    if not board or board['date'] != timezone.localdate():
+        return
+
+    row = Doctor.objects.filter(pk=doctor_id).values_list('availability_version', 'updated_at').first()
+    if row is None:
+        return
+    version, updated_at = row
+    statuses = {str(appointment_id): status for appointment_id, status in statuses.items()}
+
+    def apply():
+        with _lock:
+            current = _boards.get(doctor_id)
+            if current is None or (current['version'], current['updated_at']) != (version - 1, updated_at):
+                return
+            rows = [
+                dict(row, status=statuses[row['id']], status_label=STATUS_LABELS[statuses[row['id']]])
+                if row['id'] in statuses else row
+                for row in current['schedule']
+            ]
+            _boards[doctor_id] = dict(current, version=version, schedule=rows, stats=count_statuses(rows))
+
+    transaction.on_commit(apply)
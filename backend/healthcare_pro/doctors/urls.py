@@ -10,6 +10,7 @@ urlpatterns = [
     
     # Appointments Management (matches Appointments UI)
     path('my/appointments/', simplified_views.doctor_appointments, name='doctor-appointments'),
+    path('my/appointments/bulk-status/', simplified_views.bulk_update_appointment_status, name='bulk-update-appointment-status'),
     path('my/appointments/<uuid:appointment_id>/', simplified_views.update_appointment_status, name='update-appointment-status'),
     
     # Patient Management (matches My Patients UI)
@@ -3,16 +3,20 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from django.views.decorators.http import condition
 from datetime import datetime, timedelta, date, time as dt_time
-from django.db.models import Q, Count
+from django.db.models import Q, Count, F, Max
 from decouple import config
+import uuid
 
 from doctors.models import Doctor, Availability
 from patients.models import PatientProfile, MedicalHistory, Allergy, Medication
 from appointments.models import Appointment
-
-
-DAY_ORDER = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+from appointments.concurrency import StaleVersion, compare_and_set, expected_version, stale_version_response
+from appointments.status_updates import apply_status_updates
+from appointments.waitlist import promote_appointment_slot
+from doctors.schedule import DAY_ORDER, availability_etag, get_schedule
+from doctors.today_board import get_today_board
 
 
 def _normalize_day(value):
@@ -59,6 +63,21 @@ def _format_initials(name):
     return ''.join(parts)[:3]
 
 
+def _format_patient_cursor(patient):
+    last_visit = patient.last_visit.isoformat() if patient.last_visit else 'none'
+    return f"{last_visit},{patient.id}"
+
+
+def _parse_patient_cursor(value):
+    """``"YYYY-MM-DD,<id>"`` or ``"none,<id>"`` as written by ``_format_patient_cursor``. Raises ValueError."""
+    if not value:
+        return None
+    last_visit, patient_id = value.split(',')
+    if last_visit == 'none':
+        return None, int(patient_id)
+    return datetime.strptime(last_visit, '%Y-%m-%d').date(), int(patient_id)
+
+
 def _get_slot_duration_minutes():
     try:
         duration = int(config('APPOINTMENT_SLOT_DURATION_MINUTES', default=60))
@@ -81,61 +100,6 @@ def _coerce_bool(value, default=True):
     return default
 
 
-def _normalize_working_days_payload(raw_value):
-    if not raw_value:
-        return []
-
-    if isinstance(raw_value, dict):
-        entries = [raw_value]
-    else:
-        entries = list(raw_value)
-
-    normalized = []
-    for entry in entries:
-        if isinstance(entry, str):
-            day = _normalize_day(entry)
-            if day:
-                normalized.append({
-                    'day': day,
-                    'start_time': None,
-                    'end_time': None,
-                    'available': True,
-                    'active': True
-                })
-            continue
-
-        if isinstance(entry, dict):
-            day = _normalize_day(
-                entry.get('day')
-                or entry.get('day_of_week')
-                or entry.get('weekday')
-                or entry.get('name')
-                or entry.get('value')
-            )
-            if not day:
-                continue
-
-            normalized.append({
-                'day': day,
-                'start_time': _format_time_value(
-                    entry.get('start_time')
-                    or entry.get('start')
-                    or entry.get('from')
-                    or entry.get('opens_at')
-                ),
-                'end_time': _format_time_value(
-                    entry.get('end_time')
-                    or entry.get('end')
-                    or entry.get('to')
-                    or entry.get('closes_at')
-                ),
-                'available': entry.get('available', entry.get('is_available', True)),
-                'active': entry.get('active', True)
-            })
-
-    return normalized
-
-
 def _sync_doctor_working_hours(doctor):
     """
     Sync doctor's start_time and end_time fields based on their availability records.
@@ -198,7 +162,7 @@ def _build_weekly_schedule_payload(doctor):
 
     return {
         'weekly_schedule': weekly_schedule,
-        'working_days': _normalize_working_days_payload(doctor.working_days),
+        'working_days': [dict(entry) for entry in get_schedule(doctor).working_days_payload],
         'config': {
             'slot_duration_minutes': _get_slot_duration_minutes(),
             'default_hours': {
@@ -317,6 +281,29 @@ def _save_weekly_schedule(doctor, weekly_schedule):
     return _build_weekly_schedule_payload(doctor)
 
 
+def _serialize_today_appointment(appointment):
+    time_24 = appointment.appointment_time.strftime('%H:%M')
+    patient_name = appointment.patient.user.get_full_name()
+    return {
+        'id': str(appointment.id),
+        'time': appointment.appointment_time.strftime('%I:%M %p'),
+        'time_24': time_24,
+        'patient': {
+            'id': str(appointment.patient.id),
+            'name': patient_name,
+            'initials': _format_initials(patient_name),
+            'email': appointment.patient.user.email,
+            'phone': appointment.patient.phone_number or ''
+        },
+        'type': appointment.get_appointment_type_display() or 'Consultation',
+        'type_code': appointment.appointment_type,
+        'status': appointment.status,
+        'status_label': appointment.get_status_display(),
+        'reason': appointment.reason or appointment.chief_complaint or '',
+        'notes': appointment.notes or ''
+    }
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def doctor_dashboard(request):
@@ -331,49 +318,15 @@ def doctor_dashboard(request):
         )
     
     try:
-        doctor = Doctor.objects.get(user=request.user)
+        doctor = Doctor.objects.select_related('user').get(user=request.user)
     except Doctor.DoesNotExist:
         return Response(
             {"error": "Doctor profile not found."},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    today = timezone.now().date()
-    
-    # Get today's appointments
-    today_appointments = Appointment.objects.filter(
-        doctor=doctor,
-        appointment_date=today
-    ).select_related('patient__user').order_by('appointment_time')
-    
-    # Count different statuses
-    scheduled_count = today_appointments.filter(status='scheduled').count()
-    completed_count = today_appointments.filter(status='completed').count()
-    pending_count = today_appointments.filter(status__in=['scheduled', 'confirmed']).count()
-    
-    # Serialize today's schedule
-    schedule_data = []
-    for appointment in today_appointments:
-        time_24 = appointment.appointment_time.strftime('%H:%M')
-        patient_name = appointment.patient.user.get_full_name()
-        schedule_data.append({
-            'id': str(appointment.id),
-            'time': appointment.appointment_time.strftime('%I:%M %p'),
-            'time_24': time_24,
-            'patient': {
-                'id': str(appointment.patient.id),
-                'name': patient_name,
-                'initials': _format_initials(patient_name),
-                'email': appointment.patient.user.email,
-                'phone': appointment.patient.phone_number or ''
-            },
-            'type': appointment.get_appointment_type_display() or 'Consultation',
-            'type_code': appointment.appointment_type,
-            'status': appointment.status,
-            'status_label': appointment.get_status_display(),
-            'reason': appointment.reason or appointment.chief_complaint or '',
-            'notes': appointment.notes or ''
-        })
+    # Today's schedule and counters, served from memory while unchanged
+    board = get_today_board(doctor, _serialize_today_appointment)
     
     return Response({
         'doctor_info': {
@@ -392,12 +345,8 @@ def doctor_dashboard(request):
                 'end': _format_time_value(doctor.end_time) or '19:00'
             }
         },
-        'today_stats': {
-            'scheduled_appointments': scheduled_count,
-            'completed_appointments': completed_count,
-            'pending_appointments': pending_count
-        },
-        'today_schedule': schedule_data,
+        'today_stats': board['stats'],
+        'today_schedule': board['schedule'],
         'config': {
             'slot_duration_minutes': _get_slot_duration_minutes()
         }
@@ -558,23 +507,27 @@ def update_appointment_status(request, appointment_id):
             {"error": "Invalid status. Must be one of: scheduled, completed, cancelled, no-show"},
             status=status.HTTP_400_BAD_REQUEST
         )
+    if new_status == 'no-show':
+        new_status = 'no_show'
     
-    # Update appointment
-    appointment.status = new_status
+    try:
+        version = expected_version(request, appointment)
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "version must be an integer"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Update only the changed columns, guarded by the row version
+    changes = {'status': new_status}
     if doctor_notes:
-        appointment.doctor_notes = doctor_notes
-        
-    # Auto-update treatment times for working hours sync
-    now = timezone.now()
-    if new_status == 'in_progress' and not appointment.treatment_start_time:
-        appointment.treatment_start_time = now
-    elif new_status == 'completed' and appointment.treatment_start_time:
-        appointment.treatment_end_time = now
-        # Calculate actual duration in minutes
-        delta = now - appointment.treatment_start_time
-        appointment.actual_duration = int(delta.total_seconds() / 60)
-        
-    appointment.save()
+        changes['doctor_notes'] = doctor_notes
+    try:
+        compare_and_set(appointment, version, **changes)
+    except StaleVersion:
+        return stale_version_response(appointment.id)
+    if new_status == 'cancelled':
+        promote_appointment_slot(appointment)
     
     return Response({
         'message': 'Appointment status updated successfully',
@@ -582,11 +535,74 @@ def update_appointment_status(request, appointment_id):
             'id': str(appointment.id),
             'status': appointment.status,
             'status_label': appointment.get_status_display(),
-            'doctor_notes': appointment.doctor_notes
+            'doctor_notes': appointment.doctor_notes,
+            'version': appointment.version
         }
     })
 
 
+@api_view(['PATCH'])
+@permission_classes([IsAuthenticated])
+def bulk_update_appointment_status(request):
+    """
+    End-of-day status update: apply many (appointment, status, notes) changes
+    in one transaction and report the outcome of each
+    """
+    if request.user.role != 'doctor':
+        return Response(
+            {"error": "Access denied. Doctor role required."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    try:
+        doctor_id = Doctor.objects.values_list('id', flat=True).get(user=request.user)
+    except Doctor.DoesNotExist:
+        return Response(
+            {"error": "Doctor profile not found."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    items = request.data.get('updates')
+    max_items = config('BULK_STATUS_MAX_ITEMS', default=200, cast=int)
+    if not isinstance(items, list) or not items:
+        return Response(
+            {"error": "updates must be a non-empty list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > max_items:
+        return Response(
+            {"error": f"At most {max_items} updates can be sent at once"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    updates = []
+    for position, item in enumerate(items):
+        try:
+            new_status = item['status']
+            updates.append({
+                'appointment_id': uuid.UUID(str(item['appointment_id'])),
+                'status': 'no_show' if new_status == 'no-show' else new_status,
+                'doctor_notes': item.get('doctor_notes') or '',
+                'cancellation_reason': item.get('cancellation_reason') or '',
+                'version': int(item['version']) if item.get('version') is not None else None,
+            })
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return Response(
+                {"error": f"updates[{position}] needs a valid appointment_id and status"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    results = apply_status_updates(doctor_id, updates)
+    updated = sum(1 for result in results if result['updated'])
+    
+    return Response({
+        'message': f'{updated} of {len(results)} appointments updated',
+        'updated': updated,
+        'failed': len(results) - updated,
+        'results': results
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def doctor_patients(request):
@@ -611,13 +627,24 @@ def doctor_patients(request):
     # Get search parameters
     search = request.GET.get('search', '')
     blood_group = request.GET.get('blood_group', '')
-    page = int(request.GET.get('page', 1))
     per_page = 10
-    
-    # Get patients who have appointments with this doctor
+    try:
+        cursor = _parse_patient_cursor(request.GET.get('cursor'))
+    except ValueError:
+        return Response(
+            {"error": "Invalid cursor. Use the next_cursor value from the previous page."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # One row per patient of this doctor; the aggregates only see this
+    # doctor's appointments because they reuse the join from the filter
+    completed = Q(appointments__status='completed')
     patients_query = PatientProfile.objects.filter(
         appointments__doctor=doctor
-    ).select_related('user').distinct()
+    ).select_related('user').annotate(
+        last_visit=Max('appointments__appointment_date', filter=completed),
+        completed_visits=Count('appointments', filter=completed),
+    )
     
     # Apply search filter
     if search:
@@ -632,27 +659,29 @@ def doctor_patients(request):
     if blood_group:
         patients_query = patients_query.filter(blood_group=blood_group)
     
-    # Pagination
     total_patients = patients_query.count()
-    start_index = (page - 1) * per_page
-    end_index = start_index + per_page
-    patients = patients_query[start_index:end_index]
+
+    # Keyset pagination: most recent visit first, never-seen patients last
+    page_query = patients_query
+    if cursor:
+        last_visit, patient_id = cursor
+        if last_visit is None:
+            page_query = page_query.filter(last_visit__isnull=True, id__lt=patient_id)
+        else:
+            page_query = page_query.filter(
+                Q(last_visit__lt=last_visit)
+                | Q(last_visit=last_visit, id__lt=patient_id)
+                | Q(last_visit__isnull=True)
+            )
+    patients = list(
+        page_query.order_by(F('last_visit').desc(nulls_last=True), '-id')[:per_page + 1]
+    )
+    has_more = len(patients) > per_page
+    patients = patients[:per_page]
     
     # Serialize patients
     patients_data = []
     for patient in patients:
-        last_appointment = Appointment.objects.filter(
-            patient=patient,
-            doctor=doctor,
-            status='completed'
-        ).order_by('-appointment_date', '-appointment_time').first()
-
-        last_visit_iso = last_appointment.appointment_date.isoformat() if last_appointment else None
-        last_visit_display = (
-            last_appointment.appointment_date.strftime('%b %d, %Y')
-            if last_appointment else 'No visits'
-        )
-
         full_name = patient.user.get_full_name()
         patients_data.append({
             'id': str(patient.id),
@@ -666,22 +695,16 @@ def doctor_patients(request):
                 'phone': patient.phone_number or 'Not provided',
                 'email': patient.user.email
             },
-            'last_visit': last_visit_display,
-            'last_visit_iso': last_visit_iso,
-            'total_completed_visits': Appointment.objects.filter(
-                patient=patient,
-                doctor=doctor,
-                status='completed'
-            ).count()
+            'last_visit': patient.last_visit.strftime('%b %d, %Y') if patient.last_visit else 'No visits',
+            'last_visit_iso': patient.last_visit.isoformat() if patient.last_visit else None,
+            'total_completed_visits': patient.completed_visits
         })
     
-    total_pages = (total_patients + per_page - 1) // per_page
-    
     return Response({
         'patients': patients_data,
         'total': total_patients,
-        'page': page,
-        'total_pages': total_pages
+        'per_page': per_page,
+        'next_cursor': _format_patient_cursor(patients[-1]) if has_more else None
     })
 
 
@@ -804,8 +827,15 @@ def patient_details(request, patient_id):
     })
 
 
+def _weekly_schedule_etag(request):
+    if request.method != 'GET' or request.user.role != 'doctor':
+        return None
+    return availability_etag({'user': request.user}, _get_slot_duration_minutes())
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=_weekly_schedule_etag)
 def doctor_availability(request):
     """
     Availability Management - Weekly schedule configuration
@@ -955,6 +985,7 @@ def remove_time_slot(request, slot_id):
 
 @api_view(['GET', 'PUT', 'POST'])
 @permission_classes([IsAuthenticated])
+@condition(etag_func=_weekly_schedule_etag)
 def combined_availability(request):
     """
     Combined availability view: GET to fetch schedule, PUT/POST to update schedule
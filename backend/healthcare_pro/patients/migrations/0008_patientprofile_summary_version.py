@@ -0,0 +1,18 @@
+# Generated by Django 4.2.9 on 2026-10-17 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patients', '0007_alter_medication_dosage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='patientprofile',
+            name='summary_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bumped whenever the dashboard summary changes'),
+        ),
+    ]
@@ -63,6 +63,8 @@ class PatientProfile(models.Model):
     insurance_provider = models.CharField(max_length=100, blank=True, null=True)
     policy_number = models.CharField(max_length=50, blank=True, null=True)
     
+    summary_version = models.PositiveIntegerField(default=0, editable=False, help_text="Bumped whenever the dashboard summary changes")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Allergy, MedicalHistory, Medication, PatientProfile
+from .summary import invalidate_patient_summaries
+from appointments.models import Appointment
+
+
+@receiver([post_save, post_delete], sender=PatientProfile)
+def invalidate_profile_summary(sender, instance, **kwargs):
+    invalidate_patient_summaries([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+@receiver([post_save, post_delete], sender=MedicalHistory)
+@receiver([post_save, post_delete], sender=Allergy)
+@receiver([post_save, post_delete], sender=Medication)
+def invalidate_record_summary(sender, instance, **kwargs):
+    invalidate_patient_summaries([instance.patient_id])
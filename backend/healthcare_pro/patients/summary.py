@@ -0,0 +1,136 @@
+from django.core.cache import cache
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from decouple import config
+
+from .models import Allergy, MedicalHistory, Medication, PatientProfile
+from appointments.models import Appointment
+
+
+def get_summary_ttl():
+    return config('PATIENT_SUMMARY_CACHE_SECONDS', default=300, cast=int)
+
+
+def summary_cache_key(patient, kind='summary'):
+    # The version and updated_at come from the profile row, so every process
+    # sees a change, whatever cache backend it uses. updated_at covers a full
+    # save of a stale profile writing back an old version. Upcoming
+    # appointments depend on the day, so each day gets its own entry.
+    return (
+        f"patient-{kind}:{patient.pk}:{patient.summary_version}:"
+        f"{patient.updated_at.timestamp()}:{timezone.localdate().isoformat()}"
+    )
+
+
+def split_list(value):
+    """Items of a comma-separated text field, stripped, without empties."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _count(queryset):
+    counted = queryset.order_by().values('patient').annotate(count=Count('pk')).values('count')
+    return Coalesce(Subquery(counted), 0)
+
+
+def build_summary_counts(patient):
+    """
+    Appointment and record counts: appointments from one conditional
+    aggregate, records from one query.
+    """
+    appointment_counts = Appointment.objects.filter(patient=patient).aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status='completed')),
+    )
+    record_counts = PatientProfile.objects.filter(pk=patient.pk).annotate(
+        medical_records=_count(MedicalHistory.objects.filter(patient=OuterRef('pk'))),
+        allergy_records=_count(Allergy.objects.filter(patient=OuterRef('pk'))),
+        active_medications=_count(Medication.objects.filter(patient=OuterRef('pk'), is_active=True)),
+    ).values('medical_records', 'allergy_records', 'active_medications').get()
+    return {
+        'total_appointments': appointment_counts['total'],
+        'completed_appointments': appointment_counts['completed'],
+        **record_counts,
+    }
+
+
+def build_patient_summary(patient):
+    """
+    Counts, parsed health lists, upcoming appointments and recent history
+    for the dashboards. The text fields are split once here.
+    """
+    today = timezone.localdate()
+
+    upcoming_appointments = []
+    for appointment in Appointment.objects.filter(
+        patient=patient,
+        appointment_date__gte=today,
+        status__in=['scheduled', 'confirmed']
+    ).select_related('doctor__user').order_by('appointment_date', 'appointment_time')[:5]:
+        upcoming_appointments.append({
+            'id': str(appointment.id),
+            'doctor': {
+                'name': f"Dr. {appointment.doctor.user.first_name} {appointment.doctor.user.last_name}",
+                'specialization': appointment.doctor.get_specialization_display(),
+                'department': appointment.doctor.department or appointment.doctor.get_specialization_display() + " Department"
+            },
+            'date': appointment.appointment_date.strftime('%b %d, %Y'),
+            'time': appointment.appointment_time.strftime('%I:%M %p'),
+            'appointment_type': appointment.appointment_type,
+            'status': appointment.status,
+            'reason': appointment.reason or 'Consultation'
+        })
+
+    recent_medical_history = []
+    for history in MedicalHistory.objects.filter(
+        patient=patient
+    ).select_related('doctor__user').order_by('-date')[:5]:
+        recent_medical_history.append({
+            'id': str(history.id),
+            'condition': history.condition,
+            'date': history.date.strftime('%b %d, %Y'),
+            'doctor': f"Dr. {history.doctor.user.first_name} {history.doctor.user.last_name}" if history.doctor else "Unknown",
+            'treatment': history.treatment,
+            'description': history.description
+        })
+
+    return {
+        'counts': build_summary_counts(patient),
+        'allergies': split_list(patient.allergies),
+        'current_medications': split_list(patient.current_medications),
+        'chronic_conditions': split_list(patient.chronic_conditions),
+        'upcoming_appointments': upcoming_appointments,
+        'recent_medical_history': recent_medical_history,
+    }
+
+
+def _cached(patient, kind, build):
+    key = summary_cache_key(patient, kind)
+    value = cache.get(key)
+    if value is None:
+        value = build(patient)
+        cache.set(key, value, get_summary_ttl())
+    return value
+
+
+def get_patient_summary(patient):
+    """The patient's summary from the cache, building and caching it on a miss."""
+    return _cached(patient, 'summary', build_patient_summary)
+
+
+def get_patient_summary_counts(patient):
+    """Only the summary counts, cached on their own for views that need nothing else."""
+    return _cached(patient, 'summary-counts', build_summary_counts)
+
+
+def invalidate_patient_summaries(patient_ids):
+    """
+    Bump the ``summary_version`` of ``patient_ids`` so their cached summaries
+    are no longer read. Called in the transaction that changed the records:
+    other requests keep the old version, and cache under it, until it commits.
+    """
+    patient_ids = {patient_id for patient_id in patient_ids if patient_id is not None}
+    if patient_ids:
+        PatientProfile.objects.filter(pk__in=patient_ids).update(summary_version=F('summary_version') + 1)
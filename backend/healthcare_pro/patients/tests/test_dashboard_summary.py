@@ -0,0 +1,96 @@
+from datetime import date, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from appointments.concurrency import compare_and_set
+from appointments.models import Appointment
+from doctors.models import Doctor
+from patients.models import Allergy, PatientProfile
+from patients.summary import invalidate_patient_summaries
+from patients.views.dashboard_views import patient_dashboard
+
+
+class PatientDashboardSummaryTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        doctor_user = User.objects.create_user(
+            email="doc@example.com",
+            password="DocPass123",
+            first_name="Doc",
+            last_name="Tor",
+            role="doctor",
+        )
+        self.patient_user = User.objects.create_user(
+            email="pat@example.com",
+            password="PatPass123",
+            first_name="Pat",
+            last_name="Ient",
+            role="patient",
+        )
+        self.doctor = Doctor.objects.create(
+            user=doctor_user,
+            specialization="cardiology",
+            license_number="LIC123456",
+            years_of_experience=10,
+            qualification="MBBS",
+        )
+        self.patient = PatientProfile.objects.create(
+            user=self.patient_user,
+            allergies="Penicillin, , Peanuts",
+            current_medications="Metformin",
+        )
+        self.appointment = Appointment.objects.create(
+            patient=self.patient,
+            doctor=self.doctor,
+            appointment_date=date.today() + timedelta(days=2),
+            appointment_time=time(9, 0),
+            chief_complaint="Checkup",
+        )
+        self.client.force_authenticate(self.patient_user)
+        self.url = reverse("patient-dashboard")
+
+    def test_summary_is_cached_until_records_change(self):
+        # Profile, appointment counts and record counts; the simple dashboard
+        # never builds the upcoming and history lists
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["health_summary"]["known_allergies"], 0)
+
+        # Only the profile is read while the summary is cached
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Allergy.objects.create(patient=self.patient, allergen="Dust", severity="Mild", reaction="Sneezing")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["health_summary"]["known_allergies"], 1)
+
+    def test_full_dashboard_parses_lists_and_sees_status_changes(self):
+        request = self.client.get(self.url).wsgi_request
+        data = patient_dashboard(request).data
+        self.assertEqual(data["health_summary"]["allergies"], ["Penicillin", "Peanuts"])
+        self.assertEqual(data["health_summary"]["stats"]["known_allergies"], 2)
+        self.assertEqual(data["quick_stats"]["total_appointments"], 1)
+        self.assertEqual(len(data["upcoming_appointments"]), 1)
+
+        # Queryset updates bypass signals but still drop the cached summary
+        with self.captureOnCommitCallbacks(execute=True):
+            compare_and_set(self.appointment, self.appointment.version, status="cancelled")
+        data = patient_dashboard(request).data
+        self.assertEqual(data["upcoming_appointments"], [])
+
+    def test_version_bump_is_seen_without_touching_the_cache(self):
+        self.client.get(self.url)
+
+        # As if another worker, with its own cache, recorded the allergy
+        Allergy.objects.bulk_create([Allergy(patient=self.patient, allergen="Dust", severity="Mild", reaction="Sneezing")])
+        invalidate_patient_summaries([self.patient.pk])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["health_summary"]["known_allergies"], 1)
@@ -7,6 +7,7 @@ from datetime import date, datetime, timedelta
 
 from ..models import PatientProfile, MedicalHistory
 from ..serializers import PatientProfileSerializer, MedicalHistorySerializer
+from ..summary import get_patient_summary
 from appointments.models import Appointment
 from doctors.models import Doctor
 
@@ -27,63 +28,9 @@ def patient_dashboard(request):
     try:
         patient = PatientProfile.objects.select_related('user').get(user=request.user)
         
-        # Get upcoming appointments
-        upcoming_appointments = Appointment.objects.filter(
-            patient=patient,
-            appointment_date__gte=date.today(),
-            status__in=['scheduled', 'confirmed']
-        ).select_related('doctor__user').order_by('appointment_date', 'appointment_time')[:5]
-        
-        # Get recent medical history
-        recent_medical_history = MedicalHistory.objects.filter(
-            patient=patient
-        ).select_related('doctor__user').order_by('-date')[:5]
-        
-        # Health summary statistics
-        health_stats = {
-            'known_allergies': len(patient.allergies.split(',')) if patient.allergies else 0,
-            'current_medications': len(patient.current_medications.split(',')) if patient.current_medications else 0,
-            'medical_conditions': len(patient.chronic_conditions.split(',')) if patient.chronic_conditions else 0,
-        }
-        
-        # Serialize appointments
-        appointments_data = []
-        for appointment in upcoming_appointments:
-            appointments_data.append({
-                'id': str(appointment.id),
-                'doctor': {
-                    'name': f"Dr. {appointment.doctor.user.first_name} {appointment.doctor.user.last_name}",
-                    'specialization': appointment.doctor.get_specialization_display(),
-                    'department': appointment.doctor.department or appointment.doctor.get_specialization_display() + " Department"
-                },
-                'date': appointment.appointment_date.strftime('%b %d, %Y'),
-                'time': appointment.appointment_time.strftime('%I:%M %p'),
-                'appointment_type': appointment.appointment_type,
-                'status': appointment.status,
-                'reason': appointment.reason or 'Consultation'
-            })
-        
-        # Serialize medical history
-        medical_history_data = []
-        for history in recent_medical_history:
-            medical_history_data.append({
-                'id': str(history.id),
-                'condition': history.condition,
-                'date': history.date.strftime('%b %d, %Y'),
-                'doctor': f"Dr. {history.doctor.user.first_name} {history.doctor.user.last_name}" if history.doctor else "Unknown",
-                'treatment': history.treatment,
-                'description': history.description
-            })
-        
-        # Get allergies list
-        allergies_list = []
-        if patient.allergies:
-            allergies_list = [allergy.strip() for allergy in patient.allergies.split(',') if allergy.strip()]
-        
-        # Get current medications list
-        medications_list = []
-        if patient.current_medications:
-            medications_list = [medication.strip() for medication in patient.current_medications.split(',') if medication.strip()]
+        # Counts, parsed health lists and recent activity, cached per patient
+        summary = get_patient_summary(patient)
+        counts = summary['counts']
         
         dashboard_data = {
             'patient_info': {
@@ -112,21 +59,25 @@ def patient_dashboard(request):
                 }
             },
             'health_summary': {
-                'stats': health_stats,
-                'allergies': allergies_list,
-                'current_medications': medications_list,
-                'chronic_conditions': patient.chronic_conditions.split(',') if patient.chronic_conditions else [],
+                'stats': {
+                    'known_allergies': len(summary['allergies']),
+                    'current_medications': len(summary['current_medications']),
+                    'medical_conditions': len(summary['chronic_conditions']),
+                },
+                'allergies': summary['allergies'],
+                'current_medications': summary['current_medications'],
+                'chronic_conditions': summary['chronic_conditions'],
                 'height': patient.height,
                 'weight': patient.weight,
                 'bmi': patient.bmi
             },
-            'upcoming_appointments': appointments_data,
-            'recent_medical_history': medical_history_data,
+            'upcoming_appointments': summary['upcoming_appointments'],
+            'recent_medical_history': summary['recent_medical_history'],
             'quick_stats': {
-                'total_appointments': Appointment.objects.filter(patient=patient).count(),
-                'completed_appointments': Appointment.objects.filter(patient=patient, status='completed').count(),
-                'upcoming_appointments': len(appointments_data),
-                'medical_records': MedicalHistory.objects.filter(patient=patient).count()
+                'total_appointments': counts['total_appointments'],
+                'completed_appointments': counts['completed_appointments'],
+                'upcoming_appointments': len(summary['upcoming_appointments']),
+                'medical_records': counts['medical_records']
             }
         }
         
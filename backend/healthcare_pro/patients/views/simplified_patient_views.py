@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404
 from datetime import date
 
 from patients.models import PatientProfile, MedicalHistory, Allergy, Medication
+from patients.summary import get_patient_summary_counts
 from appointments.models import Appointment
 from doctors.models import Doctor
 from patients.serializers import (
@@ -36,10 +37,8 @@ def patient_dashboard(request):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Get health summary counts
-    medical_history_count = MedicalHistory.objects.filter(patient=patient).count()
-    allergies_count = Allergy.objects.filter(patient=patient).count()
-    medications_count = Medication.objects.filter(patient=patient, is_active=True).count()
+    # Health summary counts, cached per patient
+    counts = get_patient_summary_counts(patient)
     
     return Response({
         'patient_info': {
@@ -55,9 +54,9 @@ def patient_dashboard(request):
             'note': 'To update personal information, please contact the administration office.'
         },
         'health_summary': {
-            'known_allergies': allergies_count,
-            'current_medications': medications_count,
-            'medical_history': medical_history_count
+            'known_allergies': counts['allergy_records'],
+            'current_medications': counts['active_medications'],
+            'medical_history': counts['medical_records']
         }
     })
 
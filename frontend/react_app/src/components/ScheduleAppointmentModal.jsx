@@ -425,6 +425,8 @@ const ScheduleAppointmentModal = ({
   const [doctorsLoading, setDoctorsLoading] = useState(false);
   const [patients, setPatients] = useState([]);
   const [patientsLoading, setPatientsLoading] = useState(false);
+  const [patientsCursor, setPatientsCursor] = useState(null);
+  const [patientSearch, setPatientSearch] = useState('');
   const [availableSlots, setAvailableSlots] = useState([]);
   const [slotsLoading, setSlotsLoading] = useState(false);
   const [loading, setLoading] = useState(false);
@@ -441,6 +443,7 @@ const ScheduleAppointmentModal = ({
     setError('');
     setSuccess('');
     setAvailableSlots([]);
+    setPatientSearch('');
   }, [createInitialForm]);
 
   const loadDepartments = useCallback(async () => {
@@ -530,19 +533,23 @@ const ScheduleAppointmentModal = ({
     }
   }, []);
 
-  const loadPatientsForRole = useCallback(async () => {
+  // Admins get the patient list a page at a time; `cursor` appends the next page
+  const loadPatientsForRole = useCallback(async ({ search = '', cursor = null } = {}) => {
     if (userRole !== 'admin' && userRole !== 'doctor') {
       return;
     }
     setPatientsLoading(true);
     try {
       if (userRole === 'admin') {
-        const response = await adminAPI.getPatientsList();
+        const response = await adminAPI.getPatientsList({ search: search.trim(), cursor });
         if (response?.success) {
           const list = response.data?.patients ?? response.data ?? [];
-          setPatients(Array.isArray(list) ? sanitizePatients(list) : []);
+          const page = Array.isArray(list) ? sanitizePatients(list) : [];
+          setPatients((prev) => (cursor ? [...prev, ...page] : page));
+          setPatientsCursor(response.data?.next_cursor ?? null);
         } else {
           setPatients([]);
+          setPatientsCursor(null);
           if (response?.error) {
             setError(response.error);
           }
@@ -649,9 +656,19 @@ const ScheduleAppointmentModal = ({
     }
     resetForm();
     loadDepartments();
-    loadPatientsForRole();
     loadAppointmentTypes();
-  }, [isOpen, loadDepartments, loadPatientsForRole, loadAppointmentTypes, resetForm]);
+  }, [isOpen, loadDepartments, loadAppointmentTypes, resetForm]);
+
+  // Loads the first page on open, and again as the admin types a search
+  useEffect(() => {
+    if (!isOpen) {
+      return undefined;
+    }
+    const timer = setTimeout(() => {
+      loadPatientsForRole({ search: patientSearch });
+    }, patientSearch ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [isOpen, patientSearch, loadPatientsForRole]);
 
   useEffect(() => {
     if (!isOpen) {
@@ -853,6 +870,15 @@ const ScheduleAppointmentModal = ({
             {(userRole === 'admin' || userRole === 'doctor') && (
               <div className="form-group">
                 <label htmlFor="patient">Patient *</label>
+                {userRole === 'admin' && (
+                  <input
+                    type="search"
+                    className="form-input"
+                    placeholder="Search patients by name, email, or patient ID..."
+                    value={patientSearch}
+                    onChange={(e) => setPatientSearch(e.target.value)}
+                  />
+                )}
                 <select
                   id="patient"
                   name="patient"
@@ -869,6 +895,16 @@ const ScheduleAppointmentModal = ({
                     </option>
                   ))}
                 </select>
+                {userRole === 'admin' && patientsCursor && (
+                  <button
+                    type="button"
+                    className="cancel-button"
+                    onClick={() => loadPatientsForRole({ search: patientSearch, cursor: patientsCursor })}
+                    disabled={patientsLoading}
+                  >
+                    Load more patients
+                  </button>
+                )}
               </div>
             )}
 
@@ -49,7 +49,7 @@ const parseAppointmentDate = (value) => {
 
 export default function AdminDashboard({ setAdminLoggedIn }) {
   const [showModal, setShowModal] = useState(false);
-  const { patients, doctors, appointments, addAppointment } = useAdminData();
+  const { patientsTotal, doctors, appointments, addAppointment } = useAdminData();
   const today = useMemo(() => {
     const current = new Date();
     current.setHours(0, 0, 0, 0);
@@ -94,7 +94,7 @@ export default function AdminDashboard({ setAdminLoggedIn }) {
       <div className="admin-cards-row">
         <div className="admin-card">
           <div className="admin-card-title">Total Patients</div>
-          <div className="admin-card-value">{patients.length}</div>
+          <div className="admin-card-value">{patientsTotal}</div>
           <div className="admin-card-desc">Registered patients</div>
         </div>
         <div className="admin-card">
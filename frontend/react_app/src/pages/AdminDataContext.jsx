@@ -10,6 +10,9 @@ const defaultAdminContextValue = {
   editDoctor: noop,
   deleteDoctor: noop,
   patients: [],
+  patientsTotal: 0,
+  hasMorePatients: false,
+  loadMorePatients: noop,
   addPatient: noop,
   editPatient: noop,
   deletePatient: noop,
@@ -209,6 +212,8 @@ const normalizeSingleAppointment = (appt, idx = 0) => {
 export function AdminDataProvider({ children }) {
   const [doctors, setDoctors] = useState([]);
   const [patients, setPatients] = useState([]);
+  const [patientsTotal, setPatientsTotal] = useState(0);
+  const [patientsCursor, setPatientsCursor] = useState(null);
   const [appointments, setAppointments] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -261,6 +266,38 @@ export function AdminDataProvider({ children }) {
     []
   );
 
+  const fetchPatientsPage = useCallback(async (params = {}) => {
+    const response = await adminAPI.getPatientsList(params);
+    if (response?.success) {
+      return {
+        success: true,
+        patients: normalizePatients(response.data?.patients ?? []),
+        total: response.data?.total ?? 0,
+        nextCursor: response.data?.next_cursor ?? null,
+      };
+    }
+    return { success: false, error: response?.error || 'Unable to load patients.' };
+  }, [normalizePatients]);
+
+  // Server-side search over every patient, one page at a time like the list
+  const searchPatients = useCallback(
+    (query, cursor = null) => fetchPatientsPage({ search: query, cursor }),
+    [fetchPatientsPage]
+  );
+
+  const loadMorePatients = useCallback(async () => {
+    if (!patientsCursor) {
+      return { success: true, patients: [] };
+    }
+    const result = await fetchPatientsPage({ cursor: patientsCursor });
+    if (result.success) {
+      setPatients(pats => [...pats, ...result.patients]);
+      setPatientsTotal(result.total);
+      setPatientsCursor(result.nextCursor);
+    }
+    return result;
+  }, [fetchPatientsPage, patientsCursor]);
+
   const fetchAdminData = useCallback(async () => {
     const role = (getUserRole() || localStorage.getItem('userRole') || '').toLowerCase();
     if (!isAuthenticated() || role !== 'admin') {
@@ -299,6 +336,8 @@ export function AdminDataProvider({ children }) {
           ?? patientsResponse.data
           ?? [];
         result.patients = normalizePatients(Array.isArray(patientPayload) ? patientPayload : []);
+        result.patientsTotal = patientsResponse.data?.total ?? result.patients.length;
+        result.patientsCursor = patientsResponse.data?.next_cursor ?? null;
       } else if (patientsResponse?.error) {
         console.error('Failed to load patients:', patientsResponse.error);
         result.error = result.error || patientsResponse.error;
@@ -343,6 +382,8 @@ export function AdminDataProvider({ children }) {
   const applyAdminData = useCallback((data) => {
     setDoctors(data.doctors ?? []);
     setPatients(data.patients ?? []);
+    setPatientsTotal(data.patientsTotal ?? 0);
+    setPatientsCursor(data.patientsCursor ?? null);
     setAppointments(data.appointments ?? []);
     setError(data.error ?? null);
   }, []);
@@ -391,13 +432,17 @@ export function AdminDataProvider({ children }) {
     }
   };
 
-  const addPatient = patient => setPatients(pats => [...pats, patient]);
+  const addPatient = patient => {
+    setPatients(pats => [...pats, patient]);
+    setPatientsTotal(total => total + 1);
+  };
   const editPatient = updated => setPatients(pats => pats.map(p => p.id === updated.id ? updated : p));
   const deletePatient = async (id) => {
     try {
       const response = await adminAPI.deletePatient(id);
       if (response.success) {
         setPatients(pats => pats.filter(p => p.id !== id));
+        setPatientsTotal(total => Math.max(total - 1, 0));
         return { success: true };
       }
       console.error('Failed to delete patient:', response.error);
@@ -478,7 +523,8 @@ export function AdminDataProvider({ children }) {
   return (
     <AdminDataContext.Provider value={{
       doctors, addDoctor, editDoctor, deleteDoctor,
-      patients, addPatient, editPatient, deletePatient,
+      patients, patientsTotal, hasMorePatients: Boolean(patientsCursor), loadMorePatients,
+      addPatient, editPatient, deletePatient, searchPatients,
       appointments, addAppointment, editAppointment, deleteAppointment, cancelAppointment,
       refreshData,
       loading,
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import DeletePatientModal from './DeletePatientModal';
 import { useNavigate } from 'react-router-dom';
 import './PatientManagement.css';
@@ -16,17 +16,66 @@ const bloodColors = {
 
 
 export default function PatientManagement({ setAdminLoggedIn }) {
-  const { patients, deletePatient, loading, refreshData, error } = useAdminData();
+  const {
+    patients, hasMorePatients, loadMorePatients, deletePatient, searchPatients, loading, refreshData, error,
+  } = useAdminData();
   const [search, setSearch] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
+  const [searchCursor, setSearchCursor] = useState(null);
+  const [searching, setSearching] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [deleteModalOpen, setDeleteModalOpen] = useState(false);
   const [selectedPatient, setSelectedPatient] = useState(null);
   const [actionError, setActionError] = useState('');
   const navigate = useNavigate();
-  const filtered = patients.filter(p =>
-    p.name.toLowerCase().includes(search.toLowerCase()) ||
-    p.email.toLowerCase().includes(search.toLowerCase()) ||
-    String(p.id).includes(search)
-  );
+
+  // Search runs on the server so it covers every patient, not only loaded pages
+  useEffect(() => {
+    const query = search.trim();
+    if (!query) {
+      setSearchResults(null);
+      setSearchCursor(null);
+      setSearching(false);
+      return undefined;
+    }
+    let cancelled = false;
+    setSearching(true);
+    const timer = setTimeout(async () => {
+      const result = await searchPatients(query);
+      if (cancelled) return;
+      setSearching(false);
+      if (result.success) {
+        setSearchResults(result.patients);
+        setSearchCursor(result.nextCursor);
+      } else {
+        setSearchResults([]);
+        setSearchCursor(null);
+        setActionError(result.error);
+      }
+    }, 300);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [search, searchPatients, patients]);
+
+  const filtered = searchResults ?? patients;
+  const hasMore = searchResults ? Boolean(searchCursor) : hasMorePatients;
+
+  // Fetch the next page of whichever list is showing
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    const result = searchResults
+      ? await searchPatients(search.trim(), searchCursor)
+      : await loadMorePatients();
+    setLoadingMore(false);
+    if (!result.success) {
+      setActionError(result.error);
+    } else if (searchResults) {
+      setSearchResults(prev => [...(prev ?? []), ...result.patients]);
+      setSearchCursor(result.nextCursor);
+    }
+  };
 
   const handleDeleteClick = (patient) => {
     setActionError('');
@@ -87,8 +136,8 @@ export default function PatientManagement({ setAdminLoggedIn }) {
             <div className="patient-error-banner">{actionError || error}</div>
           )}
           <div className="patient-table-wrap">
-            {loading ? (
-              <div className="patient-loading">Loading patients…</div>
+            {loading || (searching && searchResults === null) ? (
+              <div className="patient-loading">{loading ? 'Loading patients…' : 'Searching patients…'}</div>
             ) : (
               <table className="patient-table">
                 <thead>
@@ -136,6 +185,13 @@ export default function PatientManagement({ setAdminLoggedIn }) {
               </table>
             )}
           </div>
+          {hasMore && !loading && !searching && (
+            <div className="patient-load-more-row">
+              <button className="patient-refresh-btn" type="button" onClick={handleLoadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading…' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </AdminLayout>
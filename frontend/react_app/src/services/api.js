@@ -318,6 +318,9 @@ export const authAPI = {
     ),
 };
 
+// Patients fetched per page of the admin list
+const ADMIN_PATIENTS_PAGE_LIMIT = 50;
+
 export const adminAPI = {
   getDashboardStats: () => wrapRequest(() => apiRequest(API_ENDPOINTS.ADMIN_DASHBOARD_STATS)),
 
@@ -351,7 +354,13 @@ export const adminAPI = {
       })
     ),
 
-  getPatientsList: () => wrapRequest(() => apiRequest(API_ENDPOINTS.ADMIN_PATIENTS_LIST)),
+  // One cursor page; pass the returned next_cursor as `cursor` to get the next one
+  getPatientsList: (params = {}) =>
+    wrapRequest(() =>
+      apiRequest(
+        `${API_ENDPOINTS.ADMIN_PATIENTS_LIST}${buildQueryString({ limit: ADMIN_PATIENTS_PAGE_LIMIT, ...params })}`
+      )
+    ),
 
   getPatient: (patientId) =>
     wrapRequest(() => apiRequest(API_ENDPOINTS.ADMIN_PATIENT_DETAIL(patientId))),